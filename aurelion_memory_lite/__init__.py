@@ -6,7 +6,16 @@ A 5-floor library-based knowledge management system.
 __version__ = "0.1.0"
 __author__ = "chase-key"
 
-from .library_system import LibrarySystem
-from .architecture import Architecture
-
 __all__ = ["LibrarySystem", "Architecture"]
+
+
+def __getattr__(name):
+    # Resolved on first use, so importing a submodule (e.g. the catalog)
+    # does not load the graph engine
+    if name == "LibrarySystem":
+        from .library_system import LibrarySystem
+        return LibrarySystem
+    if name == "Architecture":
+        from .architecture import Architecture
+        return Architecture
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,16 @@ AURELION Memory-Lite Architecture Implementation
 Implements the 5-floor library system.
 """
 
+# Directory holding each floor's documents, relative to the store root
+FLOOR_DIRS = {
+    1: "Floor_01_Foundation",
+    2: "Floor_02_Systems",
+    3: "Floor_03_Networks",
+    4: "Floor_04_Action",
+    5: "Floor_05_Vision",
+}
+
+
 class Architecture:
     """Manages the 5-floor knowledge architecture."""
     
@@ -0,0 +1,346 @@
+"""
+Catalog of the documents in a memory store
+One record per markdown file (path, floor, size, mtime, title, tags), built in a
+single pass, kept current by a ChangeJournal and persisted compactly. Tags come from
+YAML front matter plus the built-in tags of the shipped template documents
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .journal import Change, ChangeJournal
+
+# PyYAML is optional and imported on the first front matter seen
+YAML_AVAILABLE = importlib.util.find_spec("yaml") is not None
+
+CATALOG_DIR = ".aurelion"
+CATALOG_FILE = "catalog.json"
+CATALOG_VERSION = 2
+
+# Tags of the shipped template documents, by file name; merged with any front-matter tags
+TEMPLATE_TAGS = {
+    "01_Career_Master.md": ["career"],
+    "02_Skills_Inventory.md": ["career"],
+    "35_Strategic_Plan.md": ["strategy"],
+    "03_Daily_Operations.md": ["daily"],
+    "32_Personality_Framework.md": ["frameworks"],
+    "18_Network_Map.md": ["network"],
+    "06_Project_Template.md": ["investigation"],
+    "26_Decision_Tree.md": ["investigation"],
+}
+
+# Front matter and the title heading live at the top; larger files are not read further
+HEAD_BYTES = 64 * 1024
+
+
+def _interval_from_env() -> float:
+    raw = os.environ.get("AURELION_JOURNAL_INTERVAL", "")
+    try:
+        return max(0.0, float(raw)) if raw else 1.0
+    except ValueError:
+        return 1.0
+
+
+def _split_tags(value) -> List[str]:
+    if isinstance(value, str):
+        value = value.replace(',', ' ').split()
+    if not isinstance(value, (list, tuple)):
+        return []
+    tags = []
+    for tag in value:
+        tag = str(tag).strip().lstrip('#').lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def _simple_front_matter(block: str) -> Dict:
+    """Flat key: value front matter, with inline [a, b] or '- item' lists, for when PyYAML is missing"""
+    meta: Dict = {}
+    key = None
+    for line in block.splitlines():
+        stripped = line.strip()
+        if key and stripped.startswith('- '):
+            meta.setdefault(key, [])
+            if isinstance(meta[key], list):
+                meta[key].append(stripped[2:].strip().strip('\'"'))
+            continue
+        if ':' not in line or line[:1].isspace():
+            continue
+        key, _, value = line.partition(':')
+        key = key.strip()
+        value = value.strip()
+        if value.startswith('[') and value.endswith(']'):
+            meta[key] = [v.strip().strip('\'"') for v in value[1:-1].split(',') if v.strip()]
+        elif value:
+            meta[key] = value.strip('\'"')
+    return meta
+
+
+def parse_header(text: str, fallback_title: str) -> Tuple[str, List[str]]:
+    """
+    Title and tags of a markdown document
+
+    Args:
+        text: Start of the document
+        fallback_title: Title used when there is no front-matter title or heading
+
+    Returns:
+        (title, tags) from YAML front matter, falling back to the first heading
+    """
+    text = text.lstrip('\ufeff')
+    meta: Dict = {}
+    body = text
+    if text.startswith('---'):
+        end = text.find('\n---', 3)
+        if end >= 0:
+            block = text[3:end]
+            body = text[end + 4:]
+            if YAML_AVAILABLE:
+                import yaml
+                try:
+                    loaded = yaml.safe_load(block)
+                    meta = loaded if isinstance(loaded, dict) else {}
+                except yaml.YAMLError:
+                    meta = {}
+            else:
+                meta = _simple_front_matter(block)
+
+    title = meta.get('title')
+    if not isinstance(title, str) or not title.strip():
+        title = fallback_title
+        for line in body.splitlines():
+            if line.startswith('# '):
+                title = line[2:].strip()
+                break
+    return title.strip(), _split_tags(meta.get('tags'))
+
+
+class CatalogEntry:
+    """Metadata of one document"""
+
+    __slots__ = ('path', 'floor', 'size', 'mtime_ns', 'title', 'tags')
+
+    def __init__(self, path: str, floor: int, size: int, mtime_ns: int,
+                 title: str, tags: List[str]):
+        self.path = path
+        self.floor = floor
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.title = title
+        self.tags = tags
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit('/', 1)[-1]
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'path': self.path,
+            'floor': self.floor,
+            'title': self.title,
+            'tags': list(self.tags),
+            'size': self.size,
+            'mtime_ns': self.mtime_ns
+        }
+
+
+class StoreCatalog:
+    """
+    Document catalog with O(1) floor and tag lookups
+    Persisted to <root>/.aurelion/catalog.json together with the journal's high-water mark
+    """
+
+    def __init__(self, root, persist: bool = True, use_inotify: bool = True,
+                 min_interval: Optional[float] = None):
+        """
+        Args:
+            root: Store root containing the Floor_0X_* directories
+            persist: Load and save the catalog file under <root>/.aurelion
+            use_inotify: Let the journal watch the store with inotify where available
+            min_interval: Seconds between stat-diff refreshes without inotify
+                (default AURELION_JOURNAL_INTERVAL, or 1)
+        """
+        self.root = Path(root)
+        self.catalog_path = self.root / CATALOG_DIR / CATALOG_FILE
+        self.persist = persist
+        self.entries: Dict[str, CatalogEntry] = {}
+        self.by_floor: Dict[int, Set[str]] = {}
+        self.by_tag: Dict[str, Set[str]] = {}
+        self._floor_lists: Dict[int, List[CatalogEntry]] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        state = self._load() if persist else {}
+        self.journal = ChangeJournal(
+            self.root,
+            known={p: (e.mtime_ns, e.size) for p, e in self.entries.items()},
+            dir_mtimes=state.get('dirs'),
+            high_water_ns=state.get('high_water_ns', 0),
+            min_interval=_interval_from_env() if min_interval is None else min_interval,
+            use_inotify=use_inotify
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def refresh(self) -> List[Change]:
+        """
+        Bring the catalog up to date with the store; call save() to persist it
+
+        Returns:
+            The changes applied (added, modified and deleted documents)
+        """
+        with self._lock:
+            # The first poll always advances the persisted high-water mark
+            first = not self.journal.scanned
+            changes = self.journal.poll()
+            self._apply(changes)
+            if changes or first:
+                self._dirty = True
+            return changes
+
+    def check(self, paths: Iterable[str]) -> List[Change]:
+        """Re-read specific store-relative paths, e.g. right after writing them"""
+        with self._lock:
+            changes = self.journal.check(paths)
+            self._apply(changes)
+            if changes:
+                self._dirty = True
+            return changes
+
+    @property
+    def dirty(self) -> bool:
+        """True if changes were applied since the last save"""
+        return self._dirty
+
+    def files_on_floor(self, floor: int) -> List[CatalogEntry]:
+        """Documents on a floor, in path order"""
+        with self._lock:
+            listing = self._floor_lists.get(floor)
+            if listing is None:
+                listing = self._floor_lists[floor] = [
+                    self.entries[p] for p in sorted(self.by_floor.get(floor, ()))
+                ]
+            return list(listing)
+
+    def files_with_tag(self, tag: str) -> List[CatalogEntry]:
+        """Documents carrying exactly this tag (case-insensitive), in path order"""
+        with self._lock:
+            return [self.entries[p] for p in sorted(self.by_tag.get(tag.lower(), ()))]
+
+    def stamps(self) -> Dict[str, Tuple[int, int, int]]:
+        """(floor, mtime_ns, size) of every document, keyed by path"""
+        with self._lock:
+            return {p: (e.floor, e.mtime_ns, e.size) for p, e in self.entries.items()}
+
+    def tags(self) -> Dict[str, int]:
+        """Every tag in the store with its document count"""
+        with self._lock:
+            return {tag: len(paths) for tag, paths in sorted(self.by_tag.items())}
+
+    def save(self):
+        """Persist entries and journal state atomically if they changed; read-only stores stay in memory"""
+        if not self.persist:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                'version': CATALOG_VERSION,
+                **self.journal.state(),
+                'docs': [
+                    [e.path, e.floor, e.size, e.mtime_ns, e.title, e.tags]
+                    for e in self.entries.values()
+                ]
+            }
+            tmp = None
+            try:
+                self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(
+                    dir=self.catalog_path.parent, prefix=f'.{self.catalog_path.name}.', suffix='.tmp'
+                )
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+                os.replace(tmp, self.catalog_path)
+                self._dirty = False
+            except OSError:
+                if tmp is not None:
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+
+    def close(self):
+        self.journal.close()
+
+    # ===== INTERNAL HELPER METHODS =====
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != CATALOG_VERSION:
+            return {}
+        for path, floor, size, mtime_ns, title, tags in data.get('docs', []):
+            self._add(CatalogEntry(path, floor, size, mtime_ns, title, tags))
+        return data
+
+    def _apply(self, changes: List[Change]):
+        for change in changes:
+            self._remove(change.path)
+            if change.kind != 'deleted':
+                self._add(self._read_entry(change))
+
+    def _read_entry(self, change: Change) -> CatalogEntry:
+        name = change.path.rsplit('/', 1)[-1]
+        fallback = name[:-3]
+        try:
+            with open(self.root / change.path, 'rb') as f:
+                head = f.read(HEAD_BYTES).decode('utf-8', errors='ignore')
+            title, tags = parse_header(head, fallback)
+        except OSError:
+            title, tags = fallback, []
+        tags += [tag for tag in TEMPLATE_TAGS.get(name, ()) if tag not in tags]
+        return CatalogEntry(change.path, change.floor, change.size, change.mtime_ns, title, tags)
+
+    def _add(self, entry: CatalogEntry):
+        self.entries[entry.path] = entry
+        self.by_floor.setdefault(entry.floor, set()).add(entry.path)
+        self._floor_lists.pop(entry.floor, None)
+        for tag in entry.tags:
+            self.by_tag.setdefault(tag, set()).add(entry.path)
+
+    def _remove(self, path: str):
+        entry = self.entries.pop(path, None)
+        if entry is None:
+            return
+        self.by_floor.get(entry.floor, set()).discard(path)
+        self._floor_lists.pop(entry.floor, None)
+        for tag in entry.tags:
+            paths = self.by_tag.get(tag)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.by_tag[tag]
+
+
+_catalogs: Dict[Path, StoreCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(root) -> StoreCatalog:
+    """Process-wide catalog for a store root, created on first use"""
+    root = Path(root)
+    with _catalogs_lock:
+        catalog = _catalogs.get(root)
+        if catalog is None:
+            catalog = _catalogs[root] = StoreCatalog(root)
+        return catalog
@@ -0,0 +1,236 @@
+"""
+Compiled lookup structures over the knowledge graph
+Built once when a LibrarySystem loads its graph so queries avoid re-walking nested dicts
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .centrality import compute_centrality
+
+# Joins a node's label and id into one key; queries never contain it, so no
+# match can straddle the two fields
+KEY_SEPARATOR = "\x00"
+
+
+def concept_key(node_id: str, node: Dict) -> str:
+    """Lowercased label and id of a node, as searched by concept lookups"""
+    return node.get('label', '').lower() + KEY_SEPARATOR + node_id.lower()
+
+
+class TrigramIndex:
+    """
+    Exact substring lookup over a fixed list of strings
+    Every 1-, 2- and 3-character gram maps to the ascending positions of the keys containing it
+    """
+
+    def __init__(self, keys: List[str]):
+        self.keys = keys
+        self.postings: Dict[str, array] = {}
+        for position, key in enumerate(keys):
+            grams = set()
+            for n in (1, 2, 3):
+                for start in range(len(key) - n + 1):
+                    grams.add(key[start:start + n])
+            for gram in grams:
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array('I')
+                posting.append(position)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def posting(self, gram: str) -> Optional[Sequence[int]]:
+        """Ascending positions of keys containing gram, or None"""
+        return self.postings.get(gram)
+
+    def key(self, position: int) -> str:
+        return self.keys[position]
+
+    def search(self, substring: str) -> List[int]:
+        """
+        Positions of keys containing substring, in ascending order
+
+        Short substrings are answered straight from their gram postings; longer
+        ones verify only the keys listed under their rarest trigram
+        """
+        if not substring:
+            return list(range(len(self)))
+        if len(substring) <= 3:
+            return list(self.posting(substring) or ())
+
+        rarest: Optional[Sequence[int]] = None
+        for start in range(len(substring) - 2):
+            posting = self.posting(substring[start:start + 3])
+            if posting is None:
+                return []
+            if rarest is None or len(posting) < len(rarest):
+                rarest = posting
+        key = self.key
+        return [position for position in rarest if substring in key(position)]
+
+
+class GraphView:
+    """
+    Common traversal over a compiled graph
+    Subclasses provide node accessors, a concept index and CSR offsets/targets arrays
+    """
+
+    offsets: Sequence[int]
+    targets: Sequence[int]
+    concepts: TrigramIndex
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def node_id(self, position: int) -> str:
+        raise NotImplementedError
+
+    def node(self, position: int) -> Dict:
+        raise NotImplementedError
+
+    def nodes_at(self, positions: Sequence[int]) -> List[Dict]:
+        """Nodes at several positions, in the order given"""
+        return [self.node(position) for position in positions]
+
+    def label(self, position: int) -> str:
+        """Display label of a node, falling back to its id"""
+        raise NotImplementedError
+
+    def files(self, position: int) -> List[str]:
+        raise NotImplementedError
+
+    def resolve(self, concept: str) -> List[int]:
+        """
+        Seed positions for a concept: an exact node id if there is one,
+        otherwise every node whose id or label equals it case-insensitively
+        """
+        raise NotImplementedError
+
+    def centrality(self) -> Tuple[Sequence[float], Sequence[float]]:
+        """(pagerank, degree centrality) per node position"""
+        raise NotImplementedError
+
+    def ranked(self, positions: Iterable[int]) -> List[int]:
+        """Positions ordered by PageRank, then degree, highest first (ties keep graph order)"""
+        pagerank, degree = self.centrality()
+        return sorted(positions, key=lambda p: (-pagerank[p], -degree[p], p))
+
+    def search(self, concept: str) -> List[int]:
+        """Positions of nodes whose lowercased label or id contains concept"""
+        if KEY_SEPARATOR in concept:
+            return []
+        return self.concepts.search(concept)
+
+    def neighbors(self, position: int) -> Sequence[int]:
+        """Neighbour positions of a node, in connects_to order"""
+        return self.targets[self.offsets[position]:self.offsets[position + 1]]
+
+    def bfs(self, seeds: List[int], max_depth: int,
+            max_fanout: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Multi-source breadth-first traversal
+
+        Args:
+            seeds: Starting node positions (depth 0, not included in the result)
+            max_depth: Maximum number of hops from any seed
+            max_fanout: Maximum neighbours followed per node (None for all)
+
+        Returns:
+            (position, depth) pairs in visit order
+        """
+        offsets = self.offsets
+        targets = self.targets
+        frontier = list(dict.fromkeys(seeds))
+        visited = set(frontier)
+        reached = []
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for position in frontier:
+                start = offsets[position]
+                end = offsets[position + 1]
+                if max_fanout is not None:
+                    end = min(end, start + max_fanout)
+                for k in range(start, end):
+                    target = targets[k]
+                    if target not in visited:
+                        visited.add(target)
+                        next_frontier.append(target)
+                        reached.append((target, depth))
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return reached
+
+
+class GraphIndex(GraphView):
+    """
+    Read-only compiled view of the nodes in a knowledge graph
+    Node positions follow the graph's dict order, so results keep the original ordering
+    """
+
+    def __init__(self, knowledge_graph: Dict):
+        nodes = knowledge_graph.get('knowledge_graph', {}).get('nodes', {})
+        self.node_ids: List[str] = list(nodes)
+        self.nodes: List[Dict] = list(nodes.values())
+        self.concepts = TrigramIndex([
+            concept_key(node_id, node) for node_id, node in nodes.items()
+        ])
+        self.positions: Dict[str, int] = {
+            node_id: position for position, node_id in enumerate(self.node_ids)
+        }
+        self._build_adjacency()
+        self._build_names()
+        self._centrality: Optional[Tuple[array, array]] = None
+
+    def _build_adjacency(self):
+        """CSR adjacency: neighbours of node i are targets[offsets[i]:offsets[i + 1]]"""
+        positions = self.positions
+        self.offsets = array('I', [0])
+        self.targets = array('I')
+        for node in self.nodes:
+            for conn_id in node.get('connects_to', []):
+                target = positions.get(conn_id)
+                if target is not None:
+                    self.targets.append(target)
+            self.offsets.append(len(self.targets))
+
+    def _build_names(self):
+        """Case-insensitive exact id/label -> positions, used to resolve seed concepts"""
+        self.names: Dict[str, List[int]] = {}
+        for position, node_id in enumerate(self.node_ids):
+            label = self.nodes[position].get('label', '')
+            for name in {node_id.lower(), label.lower()}:
+                self.names.setdefault(name, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def node_id(self, position: int) -> str:
+        return self.node_ids[position]
+
+    def node(self, position: int) -> Dict:
+        return self.nodes[position]
+
+    def label(self, position: int) -> str:
+        return self.nodes[position].get('label', self.node_ids[position])
+
+    def files(self, position: int) -> List[str]:
+        return self.nodes[position].get('file_locations', [])
+
+    def centrality(self) -> Tuple[Sequence[float], Sequence[float]]:
+        if self._centrality is None:
+            self._centrality = compute_centrality(self.offsets, self.targets)
+        return self._centrality
+
+    def set_centrality(self, pagerank: array, degree: array):
+        """Use precomputed scores (e.g. warm-started from a previous compile)"""
+        self._centrality = (pagerank, degree)
+
+    def resolve(self, concept: str) -> List[int]:
+        for node_id in (concept, concept.lower()):
+            position = self.positions.get(node_id)
+            if position is not None:
+                return [position]
+        return list(self.names.get(concept.lower(), ()))
@@ -0,0 +1,513 @@
+"""
+SQLite-backed knowledge graph store
+Nodes, edges, file locations and properties live in indexed tables on disk and are
+read per query, so the graph no longer has to fit in memory and opening it is constant
+time. Imported in bulk from knowledge_graph.json into a .sqlite file next to it
+
+Tables:
+
+    meta                        source file mtime/size and whether FTS5 is in use
+    nodes                       one row per node in JSON order (position), indexed on
+                                id, lowercased id and lowercased label; carries the
+                                fixed fields plus PageRank/degree centrality
+    edges                       raw connects_to entries per source, with the target's
+                                position when it exists (indexed on source)
+    file_locations/properties   list fields per node, in their original order
+    concepts                    FTS5 trigram index over the lowercased label and id,
+                                for substring concept search (when SQLite has FTS5)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .centrality import carry_over, compute_centrality
+from .graph_index import KEY_SEPARATOR, GraphIndex, GraphView
+from .snapshot import (FLAG_CONNECTS, FLAG_FILES, FLAG_FLOOR, FLAG_LABEL, FLAG_PROPERTIES,
+                       KNOWN_FIELDS, LIST_FIELDS, NO_FLOOR)
+
+STORE_VERSION = 1
+STORE_SUFFIX = ".sqlite"
+
+# Address space SQLite may memory-map per open store
+MMAP_BYTES = 1 << 30
+# Bound parameters per IN (...) query, under SQLite's historical limit of 999
+_CHUNK = 500
+# Shortest substring the trigram index can answer; shorter ones scan the nodes table
+_MIN_TRIGRAM = 3
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE nodes (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    id_lower TEXT NOT NULL,
+    label TEXT,
+    label_lower TEXT NOT NULL,
+    floor INTEGER,
+    flags INTEGER NOT NULL,
+    extra TEXT,
+    pagerank REAL NOT NULL,
+    degree REAL NOT NULL
+);
+CREATE TABLE edges (
+    source INTEGER NOT NULL,
+    ord INTEGER NOT NULL,
+    target_id TEXT NOT NULL,
+    target INTEGER,
+    PRIMARY KEY (source, ord)
+) WITHOUT ROWID;
+CREATE TABLE file_locations (
+    node INTEGER NOT NULL,
+    ord INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (node, ord)
+) WITHOUT ROWID;
+CREATE TABLE properties (
+    node INTEGER NOT NULL,
+    ord INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (node, ord)
+) WITHOUT ROWID;
+"""
+
+# Built after the bulk insert, which is faster than maintaining them row by row
+_INDEXES = """
+CREATE UNIQUE INDEX nodes_id ON nodes (id);
+CREATE INDEX nodes_id_lower ON nodes (id_lower);
+CREATE INDEX nodes_label_lower ON nodes (label_lower);
+"""
+
+# (node field, table, node column, value column) for list fields
+_LIST_TABLES = (
+    ('properties', 'properties', 'node', 'value'),
+    ('connects_to', 'edges', 'source', 'target_id'),
+    ('file_locations', 'file_locations', 'node', 'path'),
+)
+
+_CONCEPTS = ("CREATE VIRTUAL TABLE concepts USING fts5("
+             "label_lower, id_lower, content='', tokenize='trigram case_sensitive 1')")
+
+
+def store_path(json_path: str) -> Path:
+    """SQLite graph store that sits alongside a knowledge graph JSON file"""
+    return Path(json_path).with_suffix(STORE_SUFFIX)
+
+
+def _chunks(values: Sequence[int]) -> Iterator[Sequence[int]]:
+    for start in range(0, len(values), _CHUNK):
+        yield values[start:start + _CHUNK]
+
+
+def _placeholders(count: int) -> str:
+    return ",".join("?" * count)
+
+
+def _has_trigram_fts(conn: sqlite3.Connection) -> bool:
+    """True if this SQLite build has FTS5 with the trigram tokenizer (3.34+)"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp.probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+# ===== BULK IMPORT =====
+
+def import_graph(knowledge_graph: Dict, path: Path,
+                 source: Optional[os.stat_result] = None,
+                 previous_scores: Optional[Dict[str, float]] = None):
+    """
+    Write a knowledge graph to a SQLite store (atomically, via a temp file)
+
+    Args:
+        knowledge_graph: Parsed knowledge_graph.json
+        path: Store file to write
+        source: stat of the JSON it was imported from, recorded for staleness checks
+        previous_scores: PageRank by node id from an earlier import, used to
+            warm-start the centrality computation
+    """
+    nodes = knowledge_graph.get('knowledge_graph', {}).get('nodes', {})
+    node_ids = list(nodes)
+    positions = {node_id: position for position, node_id in enumerate(node_ids)}
+
+    # CSR adjacency exists only for the import, to compute centrality
+    offsets, targets = array('I', [0]), array('I')
+    for node in nodes.values():
+        for conn_id in node.get('connects_to', []):
+            target = positions.get(conn_id)
+            if target is not None:
+                targets.append(target)
+        offsets.append(len(targets))
+    initial = carry_over(node_ids, previous_scores) if previous_scores else None
+    pagerank, degree = compute_centrality(offsets, targets, initial=initial)
+    del offsets, targets
+
+    # SQLite opens the empty file mkstemp leaves as a new database
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        _write_store(tmp, nodes, node_ids, positions, pagerank, degree, source)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _write_store(tmp: str, nodes: Dict, node_ids: List[str], positions: Dict[str, int],
+                 pagerank: Sequence[float], degree: Sequence[float],
+                 source: Optional[os.stat_result]):
+    """Create the tables, bulk-insert every row, then build the indexes"""
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(_SCHEMA)
+        fts = _has_trigram_fts(conn)
+        if fts:
+            conn.execute(_CONCEPTS)
+        with conn:
+            node_rows, edge_rows, list_rows = _rows(nodes, positions, pagerank, degree)
+            conn.executemany("INSERT INTO nodes VALUES (?,?,?,?,?,?,?,?,?,?)", node_rows)
+            conn.executemany("INSERT INTO edges VALUES (?,?,?,?)", edge_rows)
+            conn.executemany("INSERT INTO file_locations VALUES (?,?,?)", list_rows['file_locations'])
+            conn.executemany("INSERT INTO properties VALUES (?,?,?)", list_rows['properties'])
+            if fts:
+                conn.execute("INSERT INTO concepts (rowid, label_lower, id_lower) "
+                             "SELECT position, label_lower, id_lower FROM nodes")
+            meta = {
+                'version': STORE_VERSION,
+                'nodes': len(node_ids),
+                'source': [source.st_mtime_ns, source.st_size] if source else None,
+                'fts': fts,
+            }
+            conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                             [(key, json.dumps(value)) for key, value in meta.items()])
+        conn.executescript(_INDEXES)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def _rows(nodes: Dict, positions: Dict[str, int], pagerank: Sequence[float],
+          degree: Sequence[float]) -> Tuple[List[tuple], List[tuple], Dict[str, List[tuple]]]:
+    """Rows for the nodes and edges tables, and for each list-of-strings table"""
+    node_rows, edge_rows = [], []
+    list_rows: Dict[str, List[tuple]] = {'file_locations': [], 'properties': []}
+    for position, (node_id, node) in enumerate(nodes.items()):
+        flags = 0
+        extra = {}
+
+        label = node.get('label')
+        if isinstance(label, str):
+            flags |= FLAG_LABEL
+        else:
+            label = None
+            if 'label' in node:
+                extra['label'] = node['label']
+
+        floor = node.get('floor')
+        if isinstance(floor, int) and not isinstance(floor, bool) and NO_FLOOR < floor < 2 ** 31:
+            flags |= FLAG_FLOOR
+        else:
+            floor = None
+            if 'floor' in node:
+                extra['floor'] = node['floor']
+
+        for field, flag, _ in LIST_FIELDS:
+            values = node.get(field)
+            if isinstance(values, list) and all(isinstance(v, str) for v in values):
+                flags |= flag
+                if field in list_rows:
+                    list_rows[field].extend((position, i, v) for i, v in enumerate(values))
+            elif field in node:
+                extra[field] = values
+
+        # Edges follow connects_to even when it is kept in extra; only string ids name a node
+        connects_to = node.get('connects_to')
+        if isinstance(connects_to, list):
+            edge_rows.extend((position, i, conn_id, positions.get(conn_id))
+                             for i, conn_id in enumerate(connects_to) if isinstance(conn_id, str))
+
+        for key, value in node.items():
+            if key not in KNOWN_FIELDS:
+                extra[key] = value
+
+        node_rows.append((
+            position, node_id, node_id.lower(), label, label.lower() if label else '',
+            floor, flags, json.dumps(extra) if extra else None,
+            pagerank[position], degree[position],
+        ))
+    return node_rows, edge_rows, list_rows
+
+
+# ===== STORE =====
+
+class _ScoreColumn(Sequence):
+    """One centrality column, read from the nodes table on access"""
+
+    def __init__(self, graph: 'SQLiteGraph', column: str):
+        self._graph = graph
+        self._column = column
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        row = self._graph._one(f"SELECT {self._column} FROM nodes WHERE position = ?", (position,))
+        if row is None:
+            raise IndexError(position)
+        return row[0]
+
+
+class SQLiteGraph(GraphView):
+    """Graph stored in SQLite; nodes, edges and scores are queried as they are needed"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise ValueError(f"No graph store at {self.path}")
+        self._conn = sqlite3.connect(self.path.resolve().as_uri() + '?mode=ro', uri=True,
+                                     check_same_thread=False)
+        self._lock = threading.Lock()
+        try:
+            # Read pages through a shared mapping rather than copying them into a private cache
+            self._conn.execute(f"PRAGMA mmap_size = {MMAP_BYTES}")
+            self.meta = {key: json.loads(value)
+                         for key, value in self._conn.execute("SELECT key, value FROM meta")}
+        except sqlite3.DatabaseError as e:
+            self.close()
+            raise ValueError(f"Not a graph store: {self.path}") from e
+        if self.meta.get('version') != STORE_VERSION:
+            self.close()
+            raise ValueError(f"Graph store has the wrong version: {self.path}")
+        self._node_count = self.meta['nodes']
+        self._centrality = (_ScoreColumn(self, 'pagerank'), _ScoreColumn(self, 'degree'))
+
+    @property
+    def source(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the JSON this store was imported from"""
+        source = self.meta.get('source')
+        return tuple(source) if source else None
+
+    def close(self):
+        self._conn.close()
+
+    def _all(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _one(self, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    # ===== NODE ACCESS =====
+
+    def __len__(self) -> int:
+        return self._node_count
+
+    def node_id(self, position: int) -> str:
+        row = self._one("SELECT id FROM nodes WHERE position = ?", (position,))
+        if row is None:
+            raise IndexError(position)
+        return row[0]
+
+    def label(self, position: int) -> str:
+        row = self._one("SELECT label FROM nodes WHERE position = ?", (position,))
+        if row is not None and row[0] is not None:
+            return row[0]
+        return self.node(position).get('label', self.node_id(position))
+
+    def files(self, position: int) -> List[str]:
+        row = self._one("SELECT flags FROM nodes WHERE position = ?", (position,))
+        if row is not None and row[0] & FLAG_FILES:
+            return [path for path, in self._all(
+                "SELECT path FROM file_locations WHERE node = ? ORDER BY ord", (position,)
+            )]
+        return self.node(position).get('file_locations', [])
+
+    def node(self, position: int) -> Dict:
+        """Rebuild a node's original dict"""
+        return self.nodes_at([position])[0]
+
+    def nodes_at(self, positions: Sequence[int]) -> List[Dict]:
+        """Rebuild several nodes' dicts with a few queries per chunk of positions"""
+        nodes: Dict[int, Dict] = {}
+        for chunk in _chunks(positions):
+            marks = _placeholders(len(chunk))
+            lists: Dict[Tuple[str, int], List[str]] = {}
+            for field, table, key, column in _LIST_TABLES:
+                for position, value in self._all(
+                        f"SELECT {key}, {column} FROM {table} WHERE {key} IN ({marks}) "
+                        f"ORDER BY {key}, ord", chunk):
+                    lists.setdefault((field, position), []).append(value)
+            for position, label, floor, flags, extra in self._all(
+                    f"SELECT position, label, floor, flags, extra FROM nodes "
+                    f"WHERE position IN ({marks})", chunk):
+                node = {}
+                if flags & FLAG_LABEL:
+                    node['label'] = label
+                if flags & FLAG_PROPERTIES:
+                    node['properties'] = lists.get(('properties', position), [])
+                if flags & FLAG_CONNECTS:
+                    node['connects_to'] = lists.get(('connects_to', position), [])
+                if flags & FLAG_FLOOR:
+                    node['floor'] = floor
+                if flags & FLAG_FILES:
+                    node['file_locations'] = lists.get(('file_locations', position), [])
+                if extra is not None:
+                    node.update(json.loads(extra))
+                nodes[position] = node
+        try:
+            return [nodes[position] for position in positions]
+        except KeyError as e:
+            raise IndexError(e.args[0]) from None
+
+    def resolve(self, concept: str) -> List[int]:
+        for node_id in (concept, concept.lower()):
+            row = self._one("SELECT position FROM nodes WHERE id = ?", (node_id,))
+            if row is not None:
+                return [row[0]]
+        name = concept.lower()
+        return [position for position, in self._all(
+            "SELECT position FROM nodes WHERE id_lower = ? OR label_lower = ? ORDER BY position",
+            (name, name)
+        )]
+
+    # ===== SEARCH AND RANKING =====
+
+    def search(self, concept: str) -> List[int]:
+        if KEY_SEPARATOR in concept:
+            return []
+        if not concept:
+            return list(range(len(self)))
+        if self.meta.get('fts') and len(concept) >= _MIN_TRIGRAM:
+            phrase = '"' + concept.replace('"', '""') + '"'
+            rows = self._all("SELECT rowid FROM concepts WHERE concepts MATCH ? ORDER BY rowid",
+                             (phrase,))
+        else:
+            rows = self._all("SELECT position FROM nodes WHERE instr(label_lower, ?) > 0 "
+                             "OR instr(id_lower, ?) > 0 ORDER BY position", (concept, concept))
+        return [position for position, in rows]
+
+    def centrality(self) -> Tuple[Sequence[float], Sequence[float]]:
+        return self._centrality
+
+    def ranked(self, positions: Iterable[int]) -> List[int]:
+        positions = list(positions)
+        if len(positions) * 4 > len(self):
+            # A large share of the graph: one pass over the table beats point lookups
+            wanted = set(positions)
+            scores = {p: (pr, dc) for p, pr, dc in self._all(
+                "SELECT position, pagerank, degree FROM nodes") if p in wanted}
+        else:
+            scores = {}
+            for chunk in _chunks(positions):
+                scores.update((p, (pr, dc)) for p, pr, dc in self._all(
+                    f"SELECT position, pagerank, degree FROM nodes "
+                    f"WHERE position IN ({_placeholders(len(chunk))})", chunk))
+        return sorted(positions, key=lambda p: (-scores[p][0], -scores[p][1], p))
+
+    # ===== TRAVERSAL =====
+
+    def neighbors(self, position: int) -> Sequence[int]:
+        return [target for target, in self._all(
+            "SELECT target FROM edges WHERE source = ? AND target IS NOT NULL ORDER BY ord",
+            (position,)
+        )]
+
+    def _adjacency(self, sources: List[int]) -> Dict[int, List[int]]:
+        """Neighbour positions of several nodes, in connects_to order"""
+        adjacency: Dict[int, List[int]] = {}
+        for chunk in _chunks(sources):
+            for source, target in self._all(
+                    f"SELECT source, target FROM edges WHERE source IN "
+                    f"({_placeholders(len(chunk))}) AND target IS NOT NULL "
+                    f"ORDER BY source, ord", chunk):
+                adjacency.setdefault(source, []).append(target)
+        return adjacency
+
+    def bfs(self, seeds: List[int], max_depth: int,
+            max_fanout: Optional[int] = None) -> List[Tuple[int, int]]:
+        # Same visit order as GraphView.bfs, fetching each level's edges in one pass
+        frontier = list(dict.fromkeys(seeds))
+        visited = set(frontier)
+        reached = []
+        for depth in range(1, max_depth + 1):
+            adjacency = self._adjacency(frontier)
+            next_frontier = []
+            for position in frontier:
+                targets = adjacency.get(position, ())
+                if max_fanout is not None:
+                    targets = targets[:max_fanout]
+                for target in targets:
+                    if target not in visited:
+                        visited.add(target)
+                        next_frontier.append(target)
+                        reached.append((target, depth))
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return reached
+
+    def scores_by_id(self) -> Dict[str, float]:
+        """PageRank per node id, to warm-start the next import"""
+        return dict(self._all("SELECT id, pagerank FROM nodes"))
+
+
+def load_graph_store(json_path: str, load_json: Callable[[str], Dict]) -> GraphView:
+    """
+    Open the SQLite store for a knowledge graph JSON file, importing the JSON
+    first if the store is missing or the JSON changed since it was imported
+
+    A re-import warm-starts PageRank from the previous store's scores.
+    Falls back to an in-memory GraphIndex if the store cannot be written
+    """
+    source = Path(json_path)
+    stat = source.stat()
+    path = store_path(json_path)
+    previous_scores = None
+    try:
+        store = SQLiteGraph(path)
+        if store.source == (stat.st_mtime_ns, stat.st_size):
+            return store
+        try:
+            previous_scores = store.scores_by_id()
+        finally:
+            store.close()
+    except (ValueError, sqlite3.Error):
+        pass
+
+    knowledge_graph = load_json(json_path)
+    try:
+        import_graph(knowledge_graph, path, stat, previous_scores)
+        return SQLiteGraph(path)
+    except (OSError, sqlite3.Error):
+        return GraphIndex(knowledge_graph)
+
+
+# ===== COMMAND LINE =====
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk import knowledge_graph.json into a SQLite graph store")
+    parser.add_argument("json_path", help="Path to knowledge_graph.json")
+    parser.add_argument("store", nargs="?", help="Store file to write (default: next to the JSON)")
+    args = parser.parse_args()
+
+    with open(args.json_path, 'r', encoding='utf-8') as f:
+        graph_json = json.load(f)
+    target = Path(args.store) if args.store else store_path(args.json_path)
+    import_graph(graph_json, target, Path(args.json_path).stat())
+    print(f"Imported {len(SQLiteGraph(target))} nodes into {target}")
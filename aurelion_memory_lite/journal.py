@@ -0,0 +1,318 @@
+"""
+Change journal for a memory store
+Reports markdown documents added, modified or deleted under the floor directories,
+using inotify where available and a stat-snapshot diff everywhere else
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .architecture import FLOOR_DIRS
+
+# Directory mtimes are only trusted when older than the previous scan by this
+# much, covering coarse filesystem clocks (FAT stores 2-second timestamps)
+CLOCK_SLACK_NS = 2_000_000_000
+
+_FLOOR_OF_DIR = {name: floor for floor, name in FLOOR_DIRS.items()}
+
+
+class Change(NamedTuple):
+    """A single document change; path is store-relative with forward slashes"""
+    kind: str  # 'added', 'modified' or 'deleted'
+    floor: int
+    path: str
+    mtime_ns: int
+    size: int
+
+
+def floor_of(path: str) -> Optional[int]:
+    """Floor number of a store-relative path, or None if it is outside every floor"""
+    return _FLOOR_OF_DIR.get(path.split('/', 1)[0])
+
+
+# ===== INOTIFY =====
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK if hasattr(os, 'O_NONBLOCK') else 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+               | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class _Inotify:
+    """Minimal non-blocking inotify binding; raises OSError where it is unavailable"""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify requires Linux")
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc = libc
+        self._errno = ctypes.get_errno
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+
+    def watch(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(self._errno(), f"inotify_add_watch failed: {directory}")
+        self.dirs[wd] = directory
+
+    def read(self) -> Tuple[List[Tuple[Path, int, str]], bool]:
+        """Queued (directory, mask, name) events, and whether the kernel queue overflowed"""
+        events = []
+        overflow = False
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, length = _EVENT.unpack_from(buf, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(buf[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                elif mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                elif wd in self.dirs:
+                    events.append((self.dirs[wd], mask, name))
+        return events, overflow
+
+    def close(self):
+        os.close(self.fd)
+
+
+# ===== JOURNAL =====
+
+class ChangeJournal:
+    """
+    Detects document changes under a store's floor directories
+
+    The journal compares the store against a baseline of (mtime_ns, size) per
+    document. The first poll diffs the whole store against the baseline it was
+    given, skipping the listing of directories unchanged since the persisted
+    high-water mark, so a restarted process only reprocesses what changed while
+    it was down. After that, inotify (on Linux) limits each poll to the paths
+    the kernel reported; elsewhere every poll is a stat diff, at most once per
+    min_interval seconds.
+    """
+
+    def __init__(self, root, known: Optional[Dict[str, Tuple[int, int]]] = None,
+                 dir_mtimes: Optional[Dict[str, int]] = None, high_water_ns: int = 0,
+                 min_interval: float = 0.0, use_inotify: bool = True):
+        """
+        Args:
+            root: Store root containing the Floor_0X_* directories
+            known: Baseline (mtime_ns, size) per store-relative document path
+            dir_mtimes: Directory mtimes recorded by the last scan (see state())
+            high_water_ns: Wall-clock time the last scan started (see state())
+            min_interval: Minimum seconds between stat-diff polls without inotify
+            use_inotify: Watch the store with inotify when the platform allows it
+        """
+        self.root = Path(root)
+        self.files: Dict[str, Tuple[int, int]] = dict(known or {})
+        self.dir_mtimes: Dict[str, int] = dict(dir_mtimes or {})
+        self.high_water_ns = high_water_ns
+        self.min_interval = min_interval
+        self.use_inotify = use_inotify
+        self._inotify: Optional[_Inotify] = None
+        self._watched: Set[str] = set()
+        self._scanned = False
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def scanned(self) -> bool:
+        """True once this process has diffed the whole store"""
+        return self._scanned
+
+    @property
+    def watching(self) -> bool:
+        """True while inotify is delivering events"""
+        return self._inotify is not None
+
+    def state(self) -> Dict:
+        """High-water mark and directory mtimes to persist alongside the baseline"""
+        with self._lock:
+            return {'high_water_ns': self.high_water_ns, 'dirs': dict(self.dir_mtimes)}
+
+    def poll(self) -> List[Change]:
+        """Changes since the previous poll (or since the baseline, on the first one)"""
+        with self._lock:
+            if not self._scanned:
+                self._start_watching()
+                return self._full_scan()
+            if self._inotify is not None:
+                events, overflow = self._inotify.read()
+                if overflow:
+                    return self._full_scan()
+                return self._check(self._dirty_paths(events))
+            if time.monotonic() - self._last_scan < self.min_interval:
+                return []
+            return self._full_scan()
+
+    def check(self, paths: Iterable[str]) -> List[Change]:
+        """Re-stat specific store-relative paths, e.g. right after writing them"""
+        with self._lock:
+            return self._check(paths)
+
+    def close(self):
+        with self._lock:
+            self._stop_watching()
+
+    # ===== INTERNAL HELPER METHODS =====
+
+    def _start_watching(self):
+        if not self.use_inotify or self._inotify is not None:
+            return
+        try:
+            self._inotify = _Inotify()
+            self._inotify.watch(self.root)
+        except OSError:
+            self._stop_watching()
+
+    def _stop_watching(self):
+        if self._inotify is not None:
+            self._inotify.close()
+        self._inotify = None
+        self._watched.clear()
+
+    def _watch(self, rel_dir: str):
+        if self._inotify is None or rel_dir in self._watched:
+            return
+        try:
+            self._inotify.watch(self.root / rel_dir)
+            self._watched.add(rel_dir)
+        except OSError:
+            # Typically fs.inotify.max_user_watches; polling still works
+            self._stop_watching()
+
+    def _walk(self, top: str, trusted: Dict[str, int], known_files: Dict[str, List[str]],
+              known_dirs: Dict[str, List[str]], dir_mtimes: Dict[str, int]) -> Iterator[str]:
+        """
+        Document paths under store-relative directory top
+
+        Directories whose mtime matches a trusted value reuse their known
+        listing instead of being read again
+        """
+        stack = [top]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                mtime = os.stat(self.root / rel_dir).st_mtime_ns
+            except OSError:
+                continue
+            dir_mtimes[rel_dir] = mtime
+            self._watch(rel_dir)
+            if trusted.get(rel_dir) == mtime:
+                yield from known_files.get(rel_dir, ())
+                stack.extend(known_dirs.get(rel_dir, ()))
+                continue
+            try:
+                with os.scandir(self.root / rel_dir) as entries:
+                    for entry in entries:
+                        rel = f"{rel_dir}/{entry.name}"
+                        if entry.is_dir() and not entry.is_symlink():
+                            stack.append(rel)
+                        elif entry.name.endswith('.md'):
+                            yield rel
+            except OSError:
+                continue
+
+    def _full_scan(self) -> List[Change]:
+        started = time.time_ns()
+        cutoff = self.high_water_ns - CLOCK_SLACK_NS
+        trusted = {d: m for d, m in self.dir_mtimes.items() if m < cutoff}
+        known_files: Dict[str, List[str]] = {}
+        for path in self.files:
+            known_files.setdefault(path.rsplit('/', 1)[0], []).append(path)
+        known_dirs: Dict[str, List[str]] = {}
+        for rel_dir in self.dir_mtimes:
+            if '/' in rel_dir:
+                known_dirs.setdefault(rel_dir.rsplit('/', 1)[0], []).append(rel_dir)
+
+        dir_mtimes: Dict[str, int] = {}
+        seen: Set[str] = set()
+        for name in FLOOR_DIRS.values():
+            seen.update(self._walk(name, trusted, known_files, known_dirs, dir_mtimes))
+        changes = self._check(sorted(seen | set(self.files)))
+
+        self.dir_mtimes = dir_mtimes
+        self.high_water_ns = started
+        self._scanned = True
+        self._last_scan = time.monotonic()
+        return changes
+
+    def _dirty_paths(self, events: List[Tuple[Path, int, str]]) -> Set[str]:
+        """Store-relative document paths touched by a batch of inotify events"""
+        dirty: Set[str] = set()
+        for directory, mask, name in events:
+            rel_dir = directory.relative_to(self.root).as_posix()
+            if rel_dir == '.':
+                rel_dir = ''
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF) or (mask & IN_ISDIR and mask & (IN_DELETE | IN_MOVED_FROM)):
+                # A directory went away: everything known beneath it needs a re-stat
+                gone = rel_dir if mask & (IN_DELETE_SELF | IN_MOVE_SELF) else rel
+                prefix = gone + '/'
+                dirty.update(p for p in self.files if p.startswith(prefix))
+                for d in [d for d in self._watched if d == gone or d.startswith(prefix)]:
+                    self._watched.discard(d)
+            elif mask & IN_ISDIR:
+                # A new directory (or floor) appeared: watch and list it
+                if floor_of(rel) is not None:
+                    dirty.update(self._walk(rel, {}, {}, {}, self.dir_mtimes))
+            elif name.endswith('.md') and rel_dir:
+                dirty.add(rel)
+        return dirty
+
+    def _check(self, paths: Iterable[str]) -> List[Change]:
+        changes = []
+        for path in paths:
+            path = path.replace('\\', '/')
+            floor = floor_of(path)
+            if floor is None or not path.endswith('.md'):
+                continue
+            previous = self.files.get(path)
+            try:
+                st = os.stat(self.root / path)
+            except OSError:
+                if previous is not None:
+                    del self.files[path]
+                    changes.append(Change('deleted', floor, path, previous[0], previous[1]))
+                continue
+            current = (st.st_mtime_ns, st.st_size)
+            if current == previous:
+                continue
+            self.files[path] = current
+            kind = 'added' if previous is None else 'modified'
+            changes.append(Change(kind, floor, path, current[0], current[1]))
+        return changes
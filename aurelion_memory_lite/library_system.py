@@ -3,11 +3,28 @@ Knowledge Management System - 5-Floor Library Architecture
 Handles knowledge indexing, search, and retrieval for personal knowledge bases
 """
 
+import itertools
 import json
+import os
+import time
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
+from .architecture import FLOOR_DIRS
+from .catalog import StoreCatalog, get_catalog
+from .graph_index import GraphIndex, GraphView
+from .graph_store import STORE_SUFFIX, SQLiteGraph, load_graph_store
+from .semantic import get_semantic_index
+from .snapshot import load_graph
+from .query_log import QueryLog
+from .result_cache import MISS, ResultCache
+
+GRAPH_BACKENDS = ('snapshot', 'sqlite', 'memory')
+
+# Stamps each loaded graph, so instances sharing a result cache never see each other's results
+_graph_generations = itertools.count(1)
+
 
 class LibrarySystem:
     """
@@ -15,19 +32,69 @@ class LibrarySystem:
     Provides search and retrieval across your personal knowledge base
     """
 
-    def __init__(self, knowledge_graph_path: str, floor_mapping_path: str):
+    def __init__(self, knowledge_graph_path: str, floor_mapping_path: str,
+                 history_size: int = 1000, use_snapshot: bool = True,
+                 store_path: Optional[str] = None, result_cache: Optional[ResultCache] = None,
+                 graph_backend: Optional[str] = None):
         """
         Initialize library system with knowledge graph and floor mapping
         
         Args:
             knowledge_graph_path: Path to knowledge_graph.json
             floor_mapping_path: Path to floor_mapping.md
+            history_size: Number of recent queries kept in the session history
+            use_snapshot: Open the graph from its memory-mapped binary snapshot
+                (compiled next to the JSON on first use) instead of parsing JSON
+            store_path: Root of the memory store holding the Floor_0X_* directories
+                (default: AURELION_MEMORY_PATH, else the knowledge graph's directory)
+            result_cache: Cache for repeated concept searches (default: a private
+                ResultCache with the default budget and TTLs)
+            graph_backend: 'snapshot', 'sqlite' (an on-disk SQLite store imported
+                next to the JSON, queried per lookup) or 'memory' (default:
+                AURELION_GRAPH_BACKEND, else 'snapshot'; 'memory' if use_snapshot
+                is False). A knowledge_graph_path ending in .sqlite opens that store
         """
-        self.knowledge_graph = self._load_json(knowledge_graph_path)
+        self.knowledge_graph_path = knowledge_graph_path
+        self._knowledge_graph: Optional[Dict] = None
+        if graph_backend is None:
+            graph_backend = os.environ.get("AURELION_GRAPH_BACKEND", 'snapshot') if use_snapshot else 'memory'
+        if graph_backend not in GRAPH_BACKENDS:
+            raise ValueError(f"Unknown graph backend {graph_backend!r}; expected one of {GRAPH_BACKENDS}")
+        source = Path(knowledge_graph_path)
+        if source.suffix == STORE_SUFFIX:
+            self.graph_index: GraphView = SQLiteGraph(source)
+        elif graph_backend == 'sqlite' and source.is_file():
+            self.graph_index = load_graph_store(knowledge_graph_path, self._load_json)
+        elif graph_backend == 'snapshot' and source.is_file():
+            self.graph_index = load_graph(knowledge_graph_path, self._load_json)
+        else:
+            self.graph_index = GraphIndex(self.knowledge_graph)
+        self.graph_generation = next(_graph_generations)
         self.floor_mapping_path = floor_mapping_path
-        self.query_history = []
+        self.store_path = Path(
+            store_path or os.environ.get("AURELION_MEMORY_PATH") or Path(knowledge_graph_path).parent
+        ).expanduser()
+        self._catalog: Optional[StoreCatalog] = None
+        self.query_log = QueryLog(history_size)
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
         self.session_start = datetime.now()
 
+    @property
+    def knowledge_graph(self) -> Dict:
+        """Raw knowledge graph JSON, parsed on first access"""
+        if self._knowledge_graph is None:
+            self._knowledge_graph = self._load_json(self.knowledge_graph_path)
+        return self._knowledge_graph
+
+    @property
+    def catalog(self) -> StoreCatalog:
+        """Catalog of the documents in the store, shared process-wide and refreshed on use"""
+        if self._catalog is None:
+            self._catalog = get_catalog(self.store_path)
+        self._catalog.refresh()
+        self._catalog.save()
+        return self._catalog
+
     @staticmethod
     def _load_json(path: str) -> Dict:
         """Load JSON file"""
@@ -46,16 +113,23 @@ class LibrarySystem:
             concept: Search term (e.g., "career advancement", "strategy")
             
         Returns:
-            List of file references with metadata
+            List of file references with metadata, from the most central
+            matching concept (by PageRank) down
         """
-        matching_nodes = self._search_knowledge_graph(concept.lower())
+        started = time.perf_counter()
+        key = ('concept', self.graph_generation, concept.lower())
+        cached = self.result_cache.get(key)
+        if cached is MISS:
+            matching_nodes = self._search_knowledge_graph(concept.lower())
+            cached = self._extract_files_from_nodes(matching_nodes) if matching_nodes else None
+            self.result_cache.put(key, cached, _records_size(cached), negative=cached is None)
         
-        if not matching_nodes:
+        if cached is None:
             return []
         
-        files_found = self._extract_files_from_nodes(matching_nodes)
+        files_found = [dict(record) for record in cached]
         
-        self._log_query('concept', concept, len(files_found))
+        self._log_query('concept', concept, len(files_found), started)
         
         return files_found
 
@@ -69,127 +143,149 @@ class LibrarySystem:
         Returns:
             List of file references on that floor
         """
-        floors = {
-            1: "Foundation & Navigation",
-            2: "Frameworks & Understanding",
-            3: "Networks & Relationships",
-            4: "Action & Implementation",
-            5: "Vision & Meaning"
-        }
-        
-        if floor_number not in floors:
+        started = time.perf_counter()
+        if floor_number not in FLOOR_DIRS:
             return []
         
         files_on_floor = self._get_files_by_floor(floor_number)
         
-        self._log_query('floor', f"Floor {floor_number}", len(files_on_floor))
+        self._log_query('floor', f"Floor {floor_number}", len(files_on_floor), started)
         
         return files_on_floor
 
     def search_by_tag(self, tag: str) -> List[Dict]:
         """
-        Search for files by tag/category
+        Search for files by front-matter tag
         
         Args:
-            tag: Tag to search for (e.g., "career", "strategy", "daily")
+            tag: Tag to search for (e.g., "career", "strategy", "daily");
+                matches every tag containing it, case-insensitively
             
         Returns:
             List of matching files
         """
-        tag_mapping = {
-            "career": ["01_Career_Master.md", "02_Skills_Inventory.md"],
-            "strategy": ["35_Strategic_Plan.md"],
-            "daily": ["03_Daily_Operations.md"],
-            "frameworks": ["32_Personality_Framework.md"],
-            "network": ["18_Network_Map.md"],
-            "investigation": ["06_Project_Template.md", "26_Decision_Tree.md"],
-        }
-        
+        started = time.perf_counter()
+        catalog = self.catalog
         matching_tag = tag.lower()
         files = []
         
-        for key, file_list in tag_mapping.items():
+        # Tag postings are a dict hit each; only the (small) tag vocabulary is scanned
+        for key in catalog.tags():
             if matching_tag in key:
-                files.extend([{"name": f, "tag": key} for f in file_list])
+                files.extend({**entry.to_dict(), "tag": key} for entry in catalog.files_with_tag(key))
         
-        self._log_query('tag', tag, len(files))
+        self._log_query('tag', tag, len(files), started)
         
         return files
 
-    def get_related_concepts(self, concept: str, max_hops: int = 2) -> List[Dict]:
+    def search_semantic(self, query: str, top_k: int = 10,
+                        floor_number: Optional[int] = None) -> List[Dict]:
+        """
+        Search store documents by meaning with the local vector index
+        
+        Args:
+            query: Free-text query; paraphrases of a document's wording still match
+            top_k: Number of documents to return
+            floor_number: Restrict to one floor (1-5), or None for all
+            
+        Returns:
+            List of files, best match first, with their score and best-matching section
+        """
+        started = time.perf_counter()
+        index = get_semantic_index(self.store_path)
+        # Only documents whose mtime or size changed are re-embedded, and
+        # the index is rewritten only when some were
+        if index.sync(self.catalog.stamps()):
+            index.save()
+        files = [
+            {'name': hit['path'].rsplit('/', 1)[-1], **hit}
+            for hit in index.search(query, top_k, floor_number)
+        ]
+        
+        self._log_query('semantic', query, len(files), started)
+        
+        return files
+
+    def get_related_concepts(self, concept: str, max_hops: int = 2,
+                             max_fanout: Optional[int] = None) -> List[Dict]:
         """
         Find concepts related to a starting concept
         
         Args:
-            concept: Starting concept
+            concept: Starting concept (node id, or exact label)
             max_hops: Maximum connection depth to traverse
+            max_fanout: Maximum connections followed from each node (None for all)
             
         Returns:
-            List of related concepts with their connections
+            List of related concepts with their hop depth, nearest first and
+            by PageRank within each depth
         """
-        current_node = concept.lower()
-        visited = set()
-        related = []
+        started = time.perf_counter()
+        related = self._related(self.graph_index.resolve(concept), max_hops, max_fanout)
+        
+        self._log_query('related_concepts', concept, len(related), started)
         
-        for hop in range(max_hops):
-            if current_node in visited:
-                break
-                
-            visited.add(current_node)
-            connections = self._get_connections(current_node)
+        return related
+
+    def get_related_concepts_many(self, concepts: List[str], max_hops: int = 2,
+                                  max_fanout: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """
+        Find related concepts for many starting concepts in one call
+        
+        Args:
+            concepts: Starting concepts
+            max_hops: Maximum connection depth to traverse
+            max_fanout: Maximum connections followed from each node (None for all)
             
-            if connections:
-                related.extend(connections)
-                current_node = connections[0]['label'].lower()
+        Returns:
+            Mapping of each starting concept to its related concepts
+        """
+        started = time.perf_counter()
+        results = {}
+        for concept in concepts:
+            if concept not in results:
+                results[concept] = self._related(
+                    self.graph_index.resolve(concept), max_hops, max_fanout
+                )
         
-        self._log_query('related_concepts', concept, len(related))
+        self._log_query('related_concepts', ", ".join(concepts),
+                        sum(len(r) for r in results.values()), started)
         
-        return related
+        return results
 
     def get_query_history(self) -> List[Dict]:
         """
-        Get all queries from current session
+        Get recent queries from current session
         
         Returns:
-            List of query records with timestamps
+            List of query records with timestamps, oldest first (bounded by history_size)
         """
-        return self.query_history
+        return self.query_log.history()
 
     def get_session_summary(self) -> Dict:
         """
         Generate summary statistics for current session
         
         Returns:
-            Dictionary with query counts by type
+            Dictionary with query counts and latency by type
         """
-        if not self.query_history:
+        if not len(self.query_log):
             return {"total_queries": 0, "by_type": {}}
         
-        by_type = {}
-        for entry in self.query_history:
-            qtype = entry['query_type']
-            by_type[qtype] = by_type.get(qtype, 0) + 1
-        
         return {
             "session_start": self.session_start.isoformat(),
-            "total_queries": len(self.query_history),
-            "by_type": by_type
+            "total_queries": len(self.query_log),
+            "by_type": self.query_log.counts(),
+            "latency_by_type": self.query_log.latency(),
+            "result_cache": self.result_cache.stats()
         }
 
     # ===== INTERNAL HELPER METHODS =====
 
     def _search_knowledge_graph(self, concept: str) -> List[Dict]:
-        """Find nodes in knowledge graph matching search term"""
-        graph = self.knowledge_graph.get('knowledge_graph', {})
-        nodes = graph.get('nodes', {})
-        
-        matching = []
-        for node_id, node_data in nodes.items():
-            label = node_data.get('label', '').lower()
-            if concept in label or concept in node_id.lower():
-                matching.append(node_data)
-        
-        return matching
+        """Find nodes in knowledge graph matching search term, most central first"""
+        graph = self.graph_index
+        return graph.nodes_at(graph.ranked(graph.search(concept)))
 
     def _extract_files_from_nodes(self, nodes: List[Dict]) -> List[Dict]:
         """Extract file references from concept nodes"""
@@ -205,50 +301,36 @@ class LibrarySystem:
         return files
 
     def _get_files_by_floor(self, floor: int) -> List[Dict]:
-        """Get all files assigned to a specific floor"""
-        floor_files = {
-            1: ["00_Hub_Index.md", "01_Career_Master.md", "02_Skills_Inventory.md", 
-                "03_Daily_Operations.md"],
-            2: ["10_Glossary.md", "11_Transmittal_Standards.md"],
-            3: ["18_Network_Map.md", "21_Background_Story.md"],
-            4: ["06_Project_Template.md", "26_Decision_Tree.md"],
-            5: ["32_Personality_Framework.md", "35_Strategic_Plan.md"],
-        }
-        
-        files = floor_files.get(floor, [])
-        return [{"name": f, "floor": floor} for f in files]
+        """Get all files on a specific floor from the store catalog"""
+        return [entry.to_dict() for entry in self.catalog.files_on_floor(floor)]
 
-    def _get_connections(self, node_id: str) -> List[Dict]:
-        """Get connected concepts for a given node"""
-        graph = self.knowledge_graph.get('knowledge_graph', {})
-        nodes = graph.get('nodes', {})
-        
-        if node_id not in nodes:
-            return []
-        
-        node = nodes[node_id]
-        connections = node.get('connects_to', [])
-        
-        connected_nodes = []
-        for conn_id in connections:
-            if conn_id in nodes:
-                connected = nodes[conn_id]
-                connected_nodes.append({
-                    'id': conn_id,
-                    'label': connected.get('label', conn_id),
-                    'files': connected.get('file_locations', [])
-                })
-        
-        return connected_nodes
+    def _related(self, seeds: List[int], max_hops: int,
+                 max_fanout: Optional[int]) -> List[Dict]:
+        """Breadth-first neighbourhood of seed nodes as result records"""
+        graph = self.graph_index
+        pagerank, degree = graph.centrality()
+        reached = sorted(graph.bfs(seeds, max_hops, max_fanout),
+                         key=lambda r: (r[1], -pagerank[r[0]], -degree[r[0]]))
+        related = []
+        for position, depth in reached:
+            related.append({
+                'id': graph.node_id(position),
+                'label': graph.label(position),
+                'files': graph.files(position),
+                'depth': depth
+            })
+        return related
 
-    def _log_query(self, query_type: str, query: str, results_count: int):
+    def _log_query(self, query_type: str, query: str, results_count: int, started: float):
         """Log query for session history"""
-        self.query_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'query_type': query_type,
-            'query': query,
-            'results_count': results_count
-        })
+        self.query_log.record(query_type, query, results_count, time.perf_counter() - started)
+
+
+def _records_size(records: Optional[List[Dict]]) -> int:
+    """Rough in-memory size of cached result records, for the cache budget"""
+    if not records:
+        return 64
+    return sum(64 + sum(len(str(v)) for v in record.values()) for record in records)
 
 
 # ===== EXAMPLE USAGE =====
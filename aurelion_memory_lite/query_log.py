@@ -0,0 +1,76 @@
+"""
+Bounded query history for LibrarySystem sessions
+Keeps the most recent queries in a fixed-size ring plus running per-type aggregates
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List
+
+
+class QueryRecord:
+    """Compact record of a single query"""
+
+    __slots__ = ('timestamp', 'query_type', 'query', 'results_count', 'elapsed')
+
+    def __init__(self, timestamp: float, query_type: str, query: str,
+                 results_count: int, elapsed: float):
+        self.timestamp = timestamp
+        self.query_type = query_type
+        self.query = query
+        self.results_count = results_count
+        self.elapsed = elapsed
+
+    def to_dict(self) -> Dict:
+        return {
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
+            'query_type': self.query_type,
+            'query': self.query,
+            'results_count': self.results_count,
+            'elapsed_ms': round(self.elapsed * 1000, 3)
+        }
+
+
+class QueryLog:
+    """
+    Fixed-capacity ring of recent queries with running aggregates
+    Memory stays flat however long the session runs, and summaries are O(query types)
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.records = deque(maxlen=capacity)
+        self.total = 0
+        # query type -> [count, total seconds, max seconds]
+        self.by_type: Dict[str, List] = {}
+
+    def record(self, query_type: str, query: str, results_count: int, elapsed: float):
+        """Append a query, evicting the oldest record once the ring is full"""
+        self.records.append(QueryRecord(time.time(), query_type, query, results_count, elapsed))
+        self.total += 1
+        stats = self.by_type.get(query_type)
+        if stats is None:
+            stats = self.by_type[query_type] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += elapsed
+        if elapsed > stats[2]:
+            stats[2] = elapsed
+
+    def history(self) -> List[Dict]:
+        """Retained records, oldest first"""
+        return [record.to_dict() for record in self.records]
+
+    def counts(self) -> Dict[str, int]:
+        return {qtype: stats[0] for qtype, stats in self.by_type.items()}
+
+    def latency(self) -> Dict[str, Dict]:
+        return {
+            qtype: {
+                'mean_ms': round(stats[1] / stats[0] * 1000, 3),
+                'max_ms': round(stats[2] * 1000, 3)
+            }
+            for qtype, stats in self.by_type.items()
+        }
+
+    def __len__(self) -> int:
+        return self.total
@@ -0,0 +1,123 @@
+"""
+Result cache for repeated queries
+Least-recently-used entries under a size budget, each expiring after a TTL; empty
+(negative) results are kept too, under a shorter TTL. Keys are built by the caller and
+carry whatever stamp (store generation, graph version) makes an older result stale
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 30.0
+
+# Returned by get() when there is no live entry (None is a valid cached result)
+MISS = object()
+
+
+class ResultCache:
+    """
+    TTL + LRU cache of query results with a size budget
+    Sizes are whatever the caller passes to put(), e.g. the length of the encoded result
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_bytes: Size budget; 0 disables the cache
+            ttl: Seconds a result stays valid; 0 keeps it until evicted
+            negative_ttl: Seconds an empty result stays valid; 0 does not cache them
+            clock: Monotonic time source
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, size, negative, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, bool, Any]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Cached result for a key
+
+        Returns:
+            The value, or MISS if there is no live entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry[2]:
+                self.negative_hits += 1
+            return entry[3]
+
+    def put(self, key: Hashable, value: Any, size: int, negative: bool = False):
+        """
+        Store a result, evicting least recently used entries to stay within budget
+
+        Args:
+            key: Cache key, including the stamp that invalidates it
+            value: Result to cache; treat it as read-only from now on
+            size: Approximate size in bytes, charged against the budget
+            negative: The result is empty (cached under negative_ttl)
+        """
+        ttl = self.negative_ttl if negative else self.ttl
+        if not self.max_bytes or size > self.max_bytes or (negative and ttl <= 0):
+            return
+        expires_at = self._clock() + ttl if ttl > 0 else float('inf')
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, size, negative, value)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict:
+        """Occupancy and hit counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry[1]
@@ -0,0 +1,469 @@
+"""
+Offline semantic search over a memory store
+Documents and their sections are embedded by a deterministic local encoder
+(hashed word and character n-grams under a signed random projection) and kept
+in a dense matrix; queries are scored against every row in one vectorized pass.
+NumPy is used when installed, with a pure-Python fallback otherwise.
+"""
+
+import hashlib
+import heapq
+import importlib.util
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+from array import array
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+SEMANTIC_DIR = ".aurelion"
+SEMANTIC_META = "semantic.json"
+SEMANTIC_MATRIX = "semantic.f32"
+SEMANTIC_VERSION = 1
+
+DIMENSIONS = 256
+# Feature weights relative to a whole word
+BIGRAM_WEIGHT = 0.5
+TRIGRAM_WEIGHT = 0.25
+# Text embedded per document; later bytes of very large files are ignored
+MAX_DOCUMENT_BYTES = 4 * 1024 * 1024
+
+_TOKEN_RE = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+_HEADING_RE = re.compile(r"#{1,6}\s+(.*)")
+
+# Frequent function words carry no topic and would dominate unweighted vectors
+STOP_WORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do does for
+from had has have how i if in into is it its just may more most my no not of on or our
+out so than that the their them then there these they this to up us was we were what
+when which who will with would you your
+""".split())
+
+
+# ===== ENCODER =====
+
+def _hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature (unlike hash(), identical across processes)"""
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _bucket(digest: int, dimensions: int) -> Tuple[int, float]:
+    """Column and sign of a hashed feature: a fixed, seedless random projection"""
+    return digest % dimensions, (1.0 if digest >> 63 else -1.0)
+
+
+@lru_cache(maxsize=1 << 17)
+def _word_hash(word: str) -> int:
+    return _hash('w:' + word)
+
+
+def _pair_hash(first: int, second: int) -> int:
+    """Hash of a word bigram mixed from its words' hashes"""
+    mixed = (first * 0x9E3779B97F4A7C15 + second) & _MASK64
+    mixed ^= mixed >> 31
+    return (mixed * 0xBF58476D1CE4E5B9) & _MASK64
+
+
+@lru_cache(maxsize=1 << 17)
+def _word_vector(word: str, dimensions: int) -> Tuple[Tuple[int, float], ...]:
+    """Sparse projection of one word: the word itself plus its character trigrams"""
+    columns: Dict[int, float] = {}
+    column, sign = _bucket(_word_hash(word), dimensions)
+    columns[column] = sign
+    # Trigrams of the padded word match inflections ("promote" / "promotion")
+    padded = '<' + word + '>'
+    for start in range(len(padded) - 2):
+        column, sign = _bucket(_hash('t:' + padded[start:start + 3]), dimensions)
+        columns[column] = columns.get(column, 0.0) + TRIGRAM_WEIGHT * sign
+    return tuple(columns.items())
+
+
+def encode(text: str, dimensions: int = DIMENSIONS) -> List[float]:
+    """
+    Embed a text as a unit vector
+
+    Args:
+        text: Text to embed
+        dimensions: Vector length
+
+    Returns:
+        L2-normalized vector (all zeros if the text has no indexable words)
+    """
+    words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in STOP_WORDS]
+    vector = [0.0] * dimensions
+    # Sublinear term frequency keeps repetition from swamping the vector
+    for word, count in Counter(words).items():
+        weight = 1.0 + math.log(count)
+        for column, value in _word_vector(word, dimensions):
+            vector[column] += weight * value
+    hashes = list(map(_word_hash, words))
+    for (first, second), count in Counter(zip(hashes, hashes[1:])).items():
+        column, sign = _bucket(_pair_hash(first, second), dimensions)
+        vector[column] += BIGRAM_WEIGHT * (1.0 + math.log(count)) * sign
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm:
+        vector = [v / norm for v in vector]
+    return vector
+
+
+def split_sections(text: str) -> List[Tuple[str, int, str]]:
+    """
+    Markdown sections of a document
+
+    Returns:
+        (heading, first line number (0-based), section text) per section;
+        text before the first heading is a section with an empty heading
+    """
+    sections = []
+    heading, start, lines = '', 0, []
+    for line_no, line in enumerate(text.splitlines()):
+        match = _HEADING_RE.match(line)
+        if match:
+            if any(l.strip() for l in lines):
+                sections.append((heading, start, '\n'.join(lines)))
+            heading, start, lines = match.group(1).strip(), line_no, [line]
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((heading, start, '\n'.join(lines)))
+    return sections
+
+
+# ===== MATRIX =====
+
+class _Matrix:
+    """Growable float32 row store; NumPy-backed when available"""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.rows = 0
+        if NUMPY_AVAILABLE:
+            import numpy
+            self._np = numpy
+            self._data = numpy.zeros((64, dimensions), dtype=numpy.float32)
+        else:
+            self._np = None
+            self._data = array('f')
+
+    def append(self, vector: List[float]) -> int:
+        row = self.rows
+        if self._np is not None:
+            if row == len(self._data):
+                grown = self._np.zeros((2 * len(self._data), self.dimensions), dtype=self._np.float32)
+                grown[:row] = self._data
+                self._data = grown
+            self._data[row] = vector
+        else:
+            self._data.extend(vector)
+        self.rows += 1
+        return row
+
+    def set(self, row: int, vector: List[float]):
+        if self._np is not None:
+            self._data[row] = vector
+        else:
+            start = row * self.dimensions
+            self._data[start:start + self.dimensions] = array('f', vector)
+
+    def scores(self, query: List[float]):
+        """Dot product of every row with query (rows are unit length, so cosine)"""
+        if self._np is not None:
+            return self._data[:self.rows] @ self._np.asarray(query, dtype=self._np.float32)
+        dims = self.dimensions
+        data = self._data
+        return [
+            sum(map(float.__mul__, query, data[start:start + dims]))
+            for start in range(0, self.rows * dims, dims)
+        ]
+
+    def top(self, query: List[float], floors: array, floor: Optional[int],
+            k: int) -> List[Tuple[float, int]]:
+        """
+        (score, row) of the k best rows, best first
+
+        floors holds each row's floor (0 for a free row); only rows on floor
+        (or on any floor, if it is None) are considered
+        """
+        scores = self.scores(query)
+        if self._np is not None:
+            np = self._np
+            row_floors = np.frombuffer(floors, dtype=np.int8, count=self.rows)
+            mask = row_floors > 0 if floor is None else row_floors == floor
+            candidates = np.flatnonzero(mask)
+            k = min(k, len(candidates))
+            if k <= 0:
+                return []
+            picked = scores[candidates]
+            best = np.argpartition(-picked, k - 1)[:k]
+            best = best[np.lexsort((candidates[best], -picked[best]))]
+            return [(float(picked[i]), int(candidates[i])) for i in best]
+        return heapq.nlargest(
+            k,
+            ((score, row) for row, score in enumerate(scores)
+             if floors[row] > 0 and (floor is None or floors[row] == floor)),
+            key=lambda item: (item[0], -item[1])
+        )
+
+    def tobytes(self) -> bytes:
+        if self._np is not None:
+            return self._data[:self.rows].tobytes()
+        return self._data.tobytes()
+
+    @classmethod
+    def frombytes(cls, dimensions: int, raw: bytes) -> '_Matrix':
+        matrix = cls(dimensions)
+        rows = len(raw) // (4 * dimensions)
+        if matrix._np is not None:
+            data = matrix._np.frombuffer(raw, dtype=matrix._np.float32, count=rows * dimensions)
+            matrix._data = data.reshape(rows, dimensions).copy() if rows else matrix._data
+        else:
+            matrix._data.frombytes(raw[:rows * dimensions * 4])
+        matrix.rows = rows
+        return matrix
+
+
+def _replace_file(path: Path, data: bytes):
+    """Atomically replace a file via a uniquely named temp file beside it"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# ===== INDEX =====
+
+class SemanticIndex:
+    """
+    Document and section vectors of one memory store
+    Persisted to <root>/.aurelion/semantic.json (row metadata) and semantic.f32 (vectors)
+    """
+
+    def __init__(self, root, dimensions: int = DIMENSIONS, persist: bool = True):
+        """
+        Args:
+            root: Store root containing the Floor_0X_* directories
+            dimensions: Embedding size
+            persist: Load and save the index under <root>/.aurelion
+        """
+        self.root = Path(root)
+        self.dimensions = dimensions
+        self.persist = persist
+        self.meta_path = self.root / SEMANTIC_DIR / SEMANTIC_META
+        self.matrix_path = self.root / SEMANTIC_DIR / SEMANTIC_MATRIX
+        self._lock = threading.RLock()
+        self._clear()
+        if persist:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _clear(self):
+        self.matrix = _Matrix(self.dimensions)
+        # row -> [doc path, floor, heading, line] (heading None for the whole-document row)
+        self.rows: List[Optional[list]] = []
+        self.floors = array('b')
+        # doc path -> [mtime_ns, size, [rows]]
+        self.docs: Dict[str, list] = {}
+        self._free: List[int] = []
+        self._dirty = False
+
+    # ===== MAINTENANCE =====
+
+    def sync(self, stamps: Dict[str, Tuple[int, int, int]]) -> int:
+        """
+        Bring the index in line with a catalog listing
+
+        Args:
+            stamps: store-relative path -> (floor, mtime_ns, size) for every document
+
+        Returns:
+            Number of documents embedded or dropped
+        """
+        changed = 0
+        with self._lock:
+            for path in [p for p in self.docs if p not in stamps]:
+                self.remove_document(path)
+                changed += 1
+            for path, (floor, mtime_ns, size) in stamps.items():
+                doc = self.docs.get(path)
+                if doc is None or doc[0] != mtime_ns or doc[1] != size:
+                    self.update_document(path, floor)
+                    changed += 1
+        return changed
+
+    def update_document(self, path: str, floor: int):
+        """(Re-)embed one store-relative document; a missing file is dropped"""
+        full_path = self.root / path
+        try:
+            st = os.stat(full_path)
+            with self._lock:
+                doc = self.docs.get(path)
+                if doc is not None and doc[:2] == [st.st_mtime_ns, st.st_size]:
+                    return
+            with open(full_path, 'rb') as f:
+                text = f.read(MAX_DOCUMENT_BYTES).decode('utf-8', errors='ignore')
+        except OSError:
+            self.remove_document(path)
+            return
+
+        entries = []
+        total = [0.0] * self.dimensions
+        for heading, line, body in split_sections(text.lstrip('\ufeff')):
+            vector = encode(body, self.dimensions)
+            if any(vector):
+                entries.append(([path, floor, heading, line], vector))
+                total = [a + b for a, b in zip(total, vector)]
+        norm = math.sqrt(sum(v * v for v in total))
+        if len(entries) > 1 and norm:
+            # A whole-document row, for queries spread over several sections
+            entries.insert(0, ([path, floor, None, 0], [v / norm for v in total]))
+
+        with self._lock:
+            self.remove_document(path)
+            rows = []
+            for meta, vector in entries:
+                if self._free:
+                    row = self._free.pop()
+                    self.matrix.set(row, vector)
+                    self.rows[row] = meta
+                    self.floors[row] = floor
+                else:
+                    row = self.matrix.append(vector)
+                    self.rows.append(meta)
+                    self.floors.append(floor)
+                rows.append(row)
+            self.docs[path] = [st.st_mtime_ns, st.st_size, rows]
+            self._dirty = True
+
+    def remove_document(self, path: str):
+        with self._lock:
+            doc = self.docs.pop(path, None)
+            if doc is None:
+                return
+            zero = [0.0] * self.dimensions
+            for row in doc[2]:
+                self.rows[row] = None
+                self.floors[row] = 0
+                self.matrix.set(row, zero)
+                self._free.append(row)
+            self._dirty = True
+
+    # ===== QUERIES =====
+
+    def search(self, query: str, k: int = 10, floor: Optional[int] = None) -> List[Dict]:
+        """
+        Documents closest in meaning to a query
+
+        Args:
+            query: Free-text query
+            k: Number of documents to return
+            floor: Restrict to one floor (None for all)
+
+        Returns:
+            Up to k {path, floor, score, section, line} records, best first;
+            section/line point at the best-matching section
+        """
+        vector = encode(query, self.dimensions)
+        if k <= 0 or not any(vector):
+            return []
+        with self._lock:
+            # Each document has several rows; widen the pool until k documents are found
+            want = k * 4
+            while True:
+                ranked = self.matrix.top(vector, self.floors, floor, want)
+                best: Dict[str, Dict] = {}
+                for score, row in ranked:
+                    path, row_floor, heading, line = self.rows[row]
+                    hit = best.get(path)
+                    if hit is None:
+                        # Rows arrive best first, so this is the document's score
+                        hit = best[path] = {'path': path, 'floor': row_floor, 'score': score,
+                                            'section': heading, 'line': line}
+                    elif hit['section'] is None and heading is not None:
+                        hit['section'], hit['line'] = heading, line
+                if len(best) >= k or len(ranked) < want:
+                    break
+                want *= 4
+        results = sorted(best.values(), key=lambda h: (-h['score'], h['path']))[:k]
+        for hit in results:
+            hit['score'] = round(hit['score'], 4)
+        return results
+
+    # ===== PERSISTENCE =====
+
+    def save(self):
+        """Persist rows and vectors if they changed; read-only stores stay in memory"""
+        if not self.persist:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            meta = {
+                'version': SEMANTIC_VERSION,
+                'dimensions': self.dimensions,
+                'rows': self.rows,
+                'docs': self.docs,
+            }
+            try:
+                self.meta_path.parent.mkdir(parents=True, exist_ok=True)
+                # Vectors first: a meta file never describes more rows than exist
+                _replace_file(self.matrix_path, self.matrix.tobytes())
+                _replace_file(self.meta_path, json.dumps(
+                    meta, separators=(',', ':'), ensure_ascii=False
+                ).encode('utf-8'))
+                self._dirty = False
+            except OSError:
+                pass
+
+    def _load(self):
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self.matrix_path, 'rb') as f:
+                raw = f.read()
+        except (OSError, ValueError):
+            return
+        if (meta.get('version') != SEMANTIC_VERSION or meta.get('dimensions') != self.dimensions
+                or len(raw) != 4 * self.dimensions * len(meta['rows'])):
+            return
+        self.matrix = _Matrix.frombytes(self.dimensions, raw)
+        self.rows = meta['rows']
+        self.floors = array('b', (entry[1] if entry else 0 for entry in self.rows))
+        self.docs = meta['docs']
+        self._free = [row for row, entry in enumerate(self.rows) if entry is None]
+
+
+_indexes: Dict[Path, SemanticIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_semantic_index(root) -> SemanticIndex:
+    """Process-wide semantic index for a store root, loaded on first use"""
+    root = Path(root)
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = SemanticIndex(root)
+        return index
+
+
+def loaded_semantic_index(root) -> Optional[SemanticIndex]:
+    """The semantic index for a store root if one is open in this process"""
+    with _indexes_lock:
+        return _indexes.get(Path(root))
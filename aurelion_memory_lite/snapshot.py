@@ -0,0 +1,441 @@
+"""
+Binary memory-mapped snapshot of a compiled knowledge graph
+Written next to knowledge_graph.json and opened with mmap, so startup does not parse JSON
+and several processes share the same read-only pages
+
+Layout: 8-byte magic, u32 version, u32 header length, a JSON header describing each
+section (offset, item count, array typecode) and the source file's mtime/size, then
+8-byte-aligned sections:
+
+    str_offsets/str_blob        interned UTF-8 string table
+    node_id/node_label/node_key string ids per node (key = lowercased label + id)
+    node_floor/node_flags       integer floor and which optional fields are present
+    node_extra                  JSON of any fields the fixed columns cannot hold
+    edge_offsets/edge_targets   CSR adjacency over node positions
+    conn_*/file_*/prop_*        raw connects_to / file_locations / properties lists
+    gram_ids/gram_*             trigram index (grams sorted by string)
+    id_order                    positions sorted by node id
+    name_keys/name_positions    lowercased id/label -> position, sorted by name
+    rank_pagerank/rank_degree   PageRank and degree centrality per node
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .centrality import carry_over, compute_centrality
+from .graph_index import GraphIndex, GraphView, TrigramIndex
+
+MAGIC = b"AURGRAPH"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snap"
+
+NONE = 0xFFFFFFFF
+NO_FLOOR = -2 ** 31
+
+FLAG_LABEL = 1
+FLAG_FLOOR = 2
+FLAG_PROPERTIES = 4
+FLAG_CONNECTS = 8
+FLAG_FILES = 16
+
+# (node key, flag, section prefix) for list-of-string fields
+LIST_FIELDS = (
+    ('properties', FLAG_PROPERTIES, 'prop'),
+    ('connects_to', FLAG_CONNECTS, 'conn'),
+    ('file_locations', FLAG_FILES, 'file'),
+)
+KNOWN_FIELDS = {'label', 'floor', 'properties', 'connects_to', 'file_locations'}
+
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def snapshot_path(json_path: str) -> Path:
+    """Snapshot file that sits alongside a knowledge graph JSON file"""
+    return Path(json_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.offsets = array('Q', [0])
+        self.blob = bytearray()
+
+    def __call__(self, value: str) -> int:
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.offsets) - 1
+            self.blob += value.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return sid
+
+
+def write_snapshot(graph: GraphIndex, path: Path,
+                   source: Optional[os.stat_result] = None,
+                   extra_sections: Optional[Dict[str, array]] = None):
+    """
+    Serialize a compiled graph to a snapshot file (atomically, via a temp file)
+
+    Args:
+        graph: Compiled in-memory graph
+        path: Snapshot file to write
+        source: stat of the JSON it was compiled from, recorded for staleness checks
+        extra_sections: Additional named arrays to store (e.g. precomputed scores)
+    """
+    s = _StringTable()
+    sections: Dict[str, array] = {
+        'node_id': array('I'), 'node_label': array('I'), 'node_key': array('I'),
+        'node_floor': array('i'), 'node_flags': array('I'), 'node_extra': array('I'),
+    }
+    for _, _, prefix in LIST_FIELDS:
+        sections[prefix + '_offsets'] = array('I', [0])
+        sections[prefix + '_ids'] = array('I')
+
+    for position, node_id in enumerate(graph.node_ids):
+        node = graph.nodes[position]
+        flags = 0
+        extra = {}
+        sections['node_id'].append(s(node_id))
+        sections['node_key'].append(s(graph.concepts.keys[position]))
+
+        label = node.get('label')
+        if isinstance(label, str):
+            flags |= FLAG_LABEL
+            sections['node_label'].append(s(label))
+        else:
+            sections['node_label'].append(NONE)
+            if 'label' in node:
+                extra['label'] = label
+
+        floor = node.get('floor')
+        if isinstance(floor, int) and not isinstance(floor, bool) and NO_FLOOR < floor < 2 ** 31:
+            flags |= FLAG_FLOOR
+            sections['node_floor'].append(floor)
+        else:
+            sections['node_floor'].append(NO_FLOOR)
+            if 'floor' in node:
+                extra['floor'] = floor
+
+        for field, flag, prefix in LIST_FIELDS:
+            values = node.get(field)
+            ids = sections[prefix + '_ids']
+            if isinstance(values, list) and all(isinstance(v, str) for v in values):
+                flags |= flag
+                ids.extend(s(v) for v in values)
+            elif field in node:
+                extra[field] = values
+            sections[prefix + '_offsets'].append(len(ids))
+
+        for key, value in node.items():
+            if key not in KNOWN_FIELDS:
+                extra[key] = value
+        sections['node_flags'].append(flags)
+        sections['node_extra'].append(s(json.dumps(extra)) if extra else NONE)
+
+    sections['edge_offsets'] = graph.offsets
+    sections['edge_targets'] = graph.targets
+
+    gram_ids, gram_offsets, gram_postings = array('I'), array('I', [0]), array('I')
+    for gram in sorted(graph.concepts.postings):
+        gram_ids.append(s(gram))
+        gram_postings.extend(graph.concepts.postings[gram])
+        gram_offsets.append(len(gram_postings))
+    sections.update(gram_ids=gram_ids, gram_offsets=gram_offsets, gram_postings=gram_postings)
+
+    sections['id_order'] = array('I', sorted(range(len(graph)), key=graph.node_ids.__getitem__))
+    name_keys, name_positions = array('I'), array('I')
+    for name in sorted(graph.names):
+        for position in graph.names[name]:
+            name_keys.append(s(name))
+            name_positions.append(position)
+    sections.update(name_keys=name_keys, name_positions=name_positions)
+
+    pagerank, degree = graph.centrality()
+    sections.update(rank_pagerank=array('d', pagerank), rank_degree=array('d', degree))
+
+    sections['str_offsets'] = s.offsets
+    sections['str_blob'] = array('B', bytes(s.blob))
+    sections.update(extra_sections or {})
+
+    # Lay sections out after a reserved header area, each 8-byte aligned;
+    # grow the reservation until the JSON header fits in it
+    reserved = 4096
+    while True:
+        layout = {}
+        cursor = reserved
+        for name, values in sections.items():
+            layout[name] = [values.typecode, cursor, len(values)]
+            cursor = _align(cursor + len(values) * values.itemsize)
+        header = {
+            'byteorder': sys.byteorder,
+            'nodes': len(graph),
+            'source': [source.st_mtime_ns, source.st_size] if source else None,
+            'sections': layout,
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        if _PREAMBLE.size + len(header_bytes) <= reserved:
+            break
+        reserved *= 2
+
+    # A unique temp file, so concurrent writers never share one
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PREAMBLE.pack(MAGIC, SNAPSHOT_VERSION, len(header_bytes)))
+            f.write(header_bytes)
+            for name, values in sections.items():
+                f.seek(layout[name][1])
+                f.write(values.tobytes())
+            f.truncate(cursor)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _MappedTrigrams(TrigramIndex):
+    """Trigram index read straight out of snapshot sections"""
+
+    def __init__(self, snapshot: 'GraphSnapshot'):
+        self._snap = snapshot
+        self._gram_ids = snapshot.section('gram_ids')
+        self._gram_offsets = snapshot.section('gram_offsets')
+        self._gram_postings = snapshot.section('gram_postings')
+        self._keys = snapshot.section('node_key')
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def posting(self, gram: str) -> Optional[Sequence[int]]:
+        i = self._snap.find_string(self._gram_ids, gram)
+        if i < 0:
+            return None
+        return self._gram_postings[self._gram_offsets[i]:self._gram_offsets[i + 1]]
+
+    def key(self, position: int) -> str:
+        return self._snap.string(self._keys[position])
+
+
+class GraphSnapshot(GraphView):
+    """Memory-mapped compiled graph; node data is decoded lazily on access"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, header_len = _PREAMBLE.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"Not a graph snapshot (or wrong version): {self.path}")
+            start = _PREAMBLE.size
+            self.header = json.loads(self._mmap[start:start + header_len].decode('utf-8'))
+            if self.header['byteorder'] != sys.byteorder:
+                raise ValueError(f"Snapshot written on a {self.header['byteorder']}-endian host")
+            self._view = memoryview(self._mmap)
+            self._sections = {}
+            for name, (typecode, offset, count) in self.header['sections'].items():
+                itemsize = array(typecode).itemsize
+                self._sections[name] = self._view[offset:offset + count * itemsize].cast(typecode)
+        except Exception:
+            self.close()
+            raise
+
+        self._node_count = self.header['nodes']
+        self._str_offsets = self._sections['str_offsets']
+        self._str_blob = self._sections['str_blob']
+        self._ids = self._sections['node_id']
+        self._labels = self._sections['node_label']
+        self._floors = self._sections['node_floor']
+        self._flags = self._sections['node_flags']
+        self._extras = self._sections['node_extra']
+        self.offsets = self._sections['edge_offsets']
+        self.targets = self._sections['edge_targets']
+        self.concepts = _MappedTrigrams(self)
+        self._centrality: Optional[Tuple[Sequence[float], Sequence[float]]] = None
+
+    @property
+    def source(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the JSON this snapshot was compiled from"""
+        source = self.header.get('source')
+        return tuple(source) if source else None
+
+    @property
+    def has_centrality(self) -> bool:
+        """True if the snapshot was written with precomputed centrality scores"""
+        return 'rank_pagerank' in self._sections and 'rank_degree' in self._sections
+
+    def section(self, name: str) -> Optional[memoryview]:
+        return self._sections.get(name)
+
+    def centrality(self) -> Tuple[Sequence[float], Sequence[float]]:
+        if self._centrality is None:
+            if self.has_centrality:
+                self._centrality = (self._sections['rank_pagerank'], self._sections['rank_degree'])
+            else:
+                self._centrality = compute_centrality(self.offsets, self.targets)
+        return self._centrality
+
+    def close(self):
+        self._centrality = None
+        for view in getattr(self, '_sections', {}).values():
+            view.release()
+        self._sections = {}
+        if getattr(self, '_view', None) is not None:
+            self._view.release()
+            self._view = None
+        self._mmap.close()
+
+    # ===== STRING TABLE =====
+
+    def string(self, sid: int) -> str:
+        return str(self._str_blob[self._str_offsets[sid]:self._str_offsets[sid + 1]], 'utf-8')
+
+    def find_string(self, sorted_ids: Sequence[int], target: str) -> int:
+        """Index of target in a section of string ids sorted by string value, or -1"""
+        lo, hi = 0, len(sorted_ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.string(sorted_ids[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(sorted_ids) and self.string(sorted_ids[lo]) == target:
+            return lo
+        return -1
+
+    # ===== NODE ACCESS =====
+
+    def __len__(self) -> int:
+        return self._node_count
+
+    def node_id(self, position: int) -> str:
+        return self.string(self._ids[position])
+
+    def label(self, position: int) -> str:
+        if self._flags[position] & FLAG_LABEL:
+            return self.string(self._labels[position])
+        return self.node(position).get('label', self.node_id(position))
+
+    def files(self, position: int) -> List[str]:
+        if self._flags[position] & FLAG_FILES:
+            return self._string_list('file', position)
+        return self.node(position).get('file_locations', [])
+
+    def _string_list(self, prefix: str, position: int) -> List[str]:
+        offsets = self._sections[prefix + '_offsets']
+        ids = self._sections[prefix + '_ids']
+        return [self.string(sid) for sid in ids[offsets[position]:offsets[position + 1]]]
+
+    def node(self, position: int) -> Dict:
+        """Rebuild a node's original dict"""
+        flags = self._flags[position]
+        node = {}
+        if flags & FLAG_LABEL:
+            node['label'] = self.string(self._labels[position])
+        if flags & FLAG_PROPERTIES:
+            node['properties'] = self._string_list('prop', position)
+        if flags & FLAG_CONNECTS:
+            node['connects_to'] = self._string_list('conn', position)
+        if flags & FLAG_FLOOR:
+            node['floor'] = self._floors[position]
+        if flags & FLAG_FILES:
+            node['file_locations'] = self._string_list('file', position)
+        if self._extras[position] != NONE:
+            node.update(json.loads(self.string(self._extras[position])))
+        return node
+
+    def resolve(self, concept: str) -> List[int]:
+        id_order = self._sections['id_order']
+        for node_id in (concept, concept.lower()):
+            lo, hi = 0, len(id_order)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.node_id(id_order[mid]) < node_id:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < len(id_order) and self.node_id(id_order[lo]) == node_id:
+                return [id_order[lo]]
+
+        name_keys = self._sections['name_keys']
+        name_positions = self._sections['name_positions']
+        name = concept.lower()
+        first = self.find_string(name_keys, name)
+        if first < 0:
+            return []
+        # find_string returns the first entry; equal names are adjacent
+        positions = []
+        sid = name_keys[first]
+        for i in range(first, len(name_keys)):
+            if name_keys[i] != sid:
+                break
+            positions.append(name_positions[i])
+        return positions
+
+
+def load_graph(json_path: str, load_json: Callable[[str], Dict]) -> GraphView:
+    """
+    Open the snapshot for a knowledge graph JSON file, rebuilding it first if
+    it is missing, predates centrality scores, or the JSON changed since it was written
+
+    A rebuild reuses the previous snapshot's scores: unchanged adjacency keeps
+    them as they are, and an edited graph warm-starts PageRank from them.
+    Falls back to an in-memory GraphIndex if the snapshot cannot be written
+    """
+    source = Path(json_path)
+    stat = source.stat()
+    path = snapshot_path(json_path)
+    previous: Optional[GraphSnapshot] = None
+    try:
+        snapshot = GraphSnapshot(path)
+        if snapshot.source == (stat.st_mtime_ns, stat.st_size) and snapshot.has_centrality:
+            return snapshot
+        previous = snapshot
+    except (OSError, ValueError, KeyError):
+        pass
+
+    graph = GraphIndex(load_json(json_path))
+    if previous is not None:
+        try:
+            _reuse_centrality(graph, previous)
+        finally:
+            previous.close()
+    try:
+        write_snapshot(graph, path, stat)
+        return GraphSnapshot(path)
+    except OSError:
+        return graph
+
+
+def _same_adjacency(graph: GraphIndex, previous: GraphSnapshot) -> bool:
+    return (len(graph) == len(previous)
+            and graph.offsets.tobytes() == previous.offsets.tobytes()
+            and graph.targets.tobytes() == previous.targets.tobytes()
+            and all(graph.node_ids[i] == previous.node_id(i) for i in range(len(graph))))
+
+
+def _reuse_centrality(graph: GraphIndex, previous: GraphSnapshot):
+    """Seed a recompiled graph's centrality from the snapshot it replaces"""
+    if not previous.has_centrality:
+        return
+    pagerank, degree = previous.centrality()
+    if _same_adjacency(graph, previous):
+        graph.set_centrality(array('d', pagerank), array('d', degree))
+        return
+    scores = {previous.node_id(i): pagerank[i] for i in range(len(previous))}
+    graph.set_centrality(*compute_centrality(
+        graph.offsets, graph.targets, initial=carry_over(graph.node_ids, scores)
+    ))
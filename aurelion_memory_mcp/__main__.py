@@ -1,5 +1,12 @@
 """Entry point for python -m aurelion_memory_mcp"""
 import asyncio
-from .server import main
 
-asyncio.run(main())
+
+def main() -> None:
+    """Console-script entry point (aurelion-memory-mcp)."""
+    from .server import main as serve
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+In-process document cache shared by the MCP tools.
+
+Entries are keyed by absolute path and validated against (mtime_ns, size) on
+every lookup, so edits made outside the server are picked up on the next read.
+Decoded text is held under a byte budget with least-recently-used eviction;
+each mounted store (see ``stores``) gets a partition with its own budget.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .stats import metrics
+from .writes import ChangeEvent, changes
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _budget_from_env() -> int:
+    raw = os.environ.get("AURELION_CACHE_BYTES", "")
+    try:
+        return int(raw) if raw else DEFAULT_CACHE_BYTES
+    except ValueError:
+        return DEFAULT_CACHE_BYTES
+
+
+class DocumentCache:
+    """Stat-validated LRU cache of decoded UTF-8 documents."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size, text)
+        self._docs: OrderedDict[Path, tuple[int, int, str]] = OrderedDict()
+        # directory -> (listing, {dir: mtime_ns} for every directory walked)
+        self._listings: dict[Path, tuple[list[Path], dict[Path, int]]] = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def read_text(self, path: Path) -> str:
+        """Decoded contents of ``path``, served from cache when unchanged on disk."""
+        st = path.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._docs.get(path)
+            if entry is not None:
+                if entry[:2] == key:
+                    self._docs.move_to_end(path)
+                    self.hits += 1
+                    return entry[2]
+                self._drop(path)
+                self.invalidations += 1
+            self.misses += 1
+
+        start = time.perf_counter_ns()
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        metrics.record("phase.file_read", time.perf_counter_ns() - start)
+        metrics.add("bytes_read", st.st_size)
+        if st.st_size <= self.max_bytes:
+            with self._lock:
+                if path in self._docs:
+                    self._drop(path)
+                self._docs[path] = (key[0], key[1], text)
+                self.current_bytes += st.st_size
+                while self.current_bytes > self.max_bytes and self._docs:
+                    oldest = next(iter(self._docs))
+                    self._drop(oldest)
+                    self.evictions += 1
+        return text
+
+    def list_markdown(self, directory: Path) -> list[Path]:
+        """Sorted ``*.md`` files under ``directory``, re-walked only when a directory changes.
+
+        Adding, removing or renaming an entry bumps its parent directory's
+        mtime, so checking the directories is enough to validate the listing.
+        """
+        with self._lock:
+            entry = self._listings.get(directory)
+        if entry is not None:
+            listing, dir_mtimes = entry
+            try:
+                if all(d.stat().st_mtime_ns == m for d, m in dir_mtimes.items()):
+                    with self._lock:
+                        self.hits += 1
+                    return listing
+            except OSError:
+                pass
+
+        with self._lock:
+            self.misses += 1
+        listing = []
+        dir_mtimes = {}
+        with metrics.timer("phase.directory_walk"):
+            for root, dirs, files in os.walk(directory):
+                root_path = Path(root)
+                dir_mtimes[root_path] = root_path.stat().st_mtime_ns
+                listing.extend(root_path / name for name in files if name.endswith(".md"))
+            listing.sort()
+        with self._lock:
+            self._listings[directory] = (listing, dir_mtimes)
+        return listing
+
+    def invalidate(self, path: Path) -> None:
+        """Forget a document (and any listing containing it) after writing it."""
+        with self._lock:
+            if path in self._docs:
+                self._drop(path)
+                self.invalidations += 1
+            for directory in [d for d in self._listings if directory_contains(d, path)]:
+                del self._listings[directory]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._listings.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "documents": len(self._docs),
+                "listings": len(self._listings),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _drop(self, path: Path) -> None:
+        _, size, _ = self._docs.pop(path)
+        self.current_bytes -= size
+
+
+def directory_contains(directory: Path, path: Path) -> bool:
+    """True if ``path`` lies somewhere under ``directory``."""
+    try:
+        path.relative_to(directory)
+        return True
+    except ValueError:
+        return False
+
+
+class StoreCaches:
+    """Document caches partitioned by store root, each under its own byte budget.
+
+    Paths outside every mounted store share the default partition. A busy
+    store evicts only its own documents, so one store's working set cannot
+    push another's out of memory.
+    """
+
+    def __init__(self, default_bytes: int = DEFAULT_CACHE_BYTES):
+        self.default = DocumentCache(default_bytes)
+        self._stores: dict[Path, DocumentCache] = {}
+        self._lock = threading.Lock()
+
+    def mount(self, root: Path, max_bytes: int) -> DocumentCache:
+        """Give ``root`` its own partition (an existing one keeps its budget)."""
+        with self._lock:
+            cache = self._stores.get(root)
+            if cache is None:
+                cache = self._stores[root] = DocumentCache(max_bytes)
+            return cache
+
+    def for_path(self, path: Path) -> DocumentCache:
+        """Partition holding ``path``: the innermost mounted store above it."""
+        stores = self._stores
+        if stores:
+            for parent in (path, *path.parents):
+                cache = stores.get(parent)
+                if cache is not None:
+                    return cache
+        return self.default
+
+    def read_text(self, path: Path) -> str:
+        return self.for_path(path).read_text(path)
+
+    def list_markdown(self, directory: Path) -> list[Path]:
+        return self.for_path(directory).list_markdown(directory)
+
+    def invalidate(self, path: Path) -> None:
+        self.for_path(path).invalidate(path)
+
+    def clear(self) -> None:
+        with self._lock:
+            caches = [self.default, *self._stores.values()]
+        for cache in caches:
+            cache.clear()
+
+    def stats(self, root: Path | None = None) -> dict:
+        """Counters of one store's partition (the default one if ``root`` is not mounted)."""
+        return self.for_path(root).stats() if root is not None else self.default.stats()
+
+
+document_cache = StoreCaches(_budget_from_env())
+
+
+def _on_changes(events: list[ChangeEvent]) -> None:
+    for event in events:
+        document_cache.invalidate(event.full_path)
+
+
+changes.subscribe(_on_changes)
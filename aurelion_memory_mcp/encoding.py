@@ -0,0 +1,221 @@
+"""
+Response encoding for MCP tool results.
+
+Results are encoded as compact JSON in a single call to the fastest encoder
+available: orjson when it is installed, the stdlib encoder otherwise
+(AURELION_JSON_ENCODER=json forces the stdlib one). Set AURELION_JSON_INDENT,
+e.g. to 2, to pretty-print instead.
+
+Responses are capped at AURELION_MAX_RESPONSE_CHARS characters (default
+4 MiB, 0 for no cap). A result over the cap is built chunk by chunk instead:
+containers are encoded element by element and the walk stops as soon as the
+budget is spent, so the rest of an oversized result is never encoded. What
+was cut is listed under a top-level ``truncated`` key (a trailing
+``{"truncated": ...}`` element for list results) as JSON pointers with the
+number of items, keys or characters left out.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+from typing import Any, Callable, Iterator
+
+from .stats import metrics
+
+DEFAULT_MAX_CHARS = 4 * 1024 * 1024
+# Part of the cap kept free for the truncation marker itself
+MARKER_RESERVE = 512
+# Characters _mark adds around the marker itself: ',{"truncated":' and '}'
+_MARKER_WRAPPING = 15
+
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+
+
+def _int_from_env(name: str, default: int) -> int:
+    raw = os.environ.get(name, "")
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+def _stdlib_dumps(value: Any, indent: int = 0) -> str:
+    if indent:
+        return json.dumps(value, ensure_ascii=False, indent=indent)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _orjson_dumps() -> Callable[[Any, int], str]:
+    import orjson
+
+    compact = orjson.OPT_NON_STR_KEYS
+    pretty = compact | orjson.OPT_INDENT_2
+
+    def dumps(value: Any, indent: int = 0) -> str:
+        if indent not in (0, 2):
+            return _stdlib_dumps(value, indent)
+        try:
+            return orjson.dumps(value, option=pretty if indent else compact).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder accepts
+            return _stdlib_dumps(value, indent)
+
+    return dumps
+
+
+def _pointer(parent: str, key: Any) -> str:
+    """JSON pointer of ``key`` under ``parent``."""
+    return f"{parent}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+class _Budget:
+    """Characters left for a capped response, and what had to be left out."""
+
+    def __init__(self, remaining: int):
+        self.remaining = remaining
+        self.omitted: list[dict] = []
+
+    def take(self, text: str) -> str:
+        self.remaining -= len(text)
+        return text
+
+    def fits(self, text: str) -> bool:
+        return len(text) <= self.remaining
+
+
+class ResultEncoder:
+    """Encodes tool results as JSON text, within a response-size cap."""
+
+    def __init__(
+        self,
+        indent: int = 0,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        backend: str = "auto",
+    ):
+        self.indent = indent
+        self.max_chars = max_chars
+        self.backend = "orjson" if backend != "json" and ORJSON_AVAILABLE else "json"
+        self._dumps = _orjson_dumps() if self.backend == "orjson" else _stdlib_dumps
+
+    @classmethod
+    def from_env(cls) -> "ResultEncoder":
+        return cls(
+            indent=_int_from_env("AURELION_JSON_INDENT", 0),
+            max_chars=_int_from_env("AURELION_MAX_RESPONSE_CHARS", DEFAULT_MAX_CHARS),
+            backend=os.environ.get("AURELION_JSON_ENCODER", "auto").strip().lower(),
+        )
+
+    def dumps(self, value: Any) -> str:
+        """Compact JSON for ``value``, uncapped."""
+        return self._dumps(value)
+
+    def encode(self, result: Any) -> str:
+        """JSON text for a tool result, truncated with a marker if over the cap."""
+        cap = self.max_chars
+        if not cap:
+            return self._dumps(result, self.indent)
+        # Dicts are walked straight away so that one huge value (a whole
+        # document's content) is cut before it is encoded, not after
+        if not isinstance(result, dict):
+            text = self._dumps(result)
+            if len(text) <= cap:
+                return self._dumps(result, self.indent) if self.indent else text
+
+        budget = _Budget(max(0, cap - MARKER_RESERVE))
+        text = "".join(self._chunks(result, "", budget, whole_first=False))
+        if budget.omitted:
+            text = self._mark(result, text, budget.omitted)
+            metrics.add("responses.truncated")
+        if self.indent:
+            text = self._dumps(json.loads(text), self.indent)
+        return text
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "indent": self.indent, "max_chars": self.max_chars}
+
+    # ─── Internals ───────────────────────────────────────────────────────────
+
+    def _chunks(self, value: Any, pointer: str, budget: _Budget, whole_first: bool) -> Iterator[str]:
+        """Compact JSON for ``value`` in pieces, stopping once the budget is spent."""
+        if isinstance(value, str):
+            yield from self._string(value, pointer, budget)
+            return
+        container = isinstance(value, (dict, list, tuple))
+        if whole_first or not container:
+            text = self._dumps(value)
+            if budget.fits(text):
+                yield budget.take(text)
+                return
+            if not container:
+                budget.omitted.append({"at": pointer or "/"})
+                budget.remaining = 0
+                yield "null"
+                return
+
+        if isinstance(value, dict):
+            budget.remaining -= 2
+            yield "{"
+            for i, (key, item) in enumerate(value.items()):
+                head = ("," if i else "") + self._dumps(str(key)) + ":"
+                if len(head) >= budget.remaining:
+                    budget.omitted.append({"at": pointer or "/", "keys": len(value) - i})
+                    break
+                yield budget.take(head)
+                yield from self._chunks(item, _pointer(pointer, key), budget, isinstance(item, (list, tuple)))
+            yield "}"
+        else:
+            budget.remaining -= 2
+            yield "["
+            for i, item in enumerate(value):
+                if i and budget.remaining <= 1:
+                    budget.omitted.append({"at": pointer or "/", "items": len(value) - i})
+                    break
+                if i:
+                    yield budget.take(",")
+                yield from self._chunks(item, _pointer(pointer, i), budget, True)
+            yield "]"
+
+    def _string(self, value: str, pointer: str, budget: _Budget) -> Iterator[str]:
+        # A string never encodes to fewer characters than it has, so an
+        # oversized one is cut before it is encoded
+        if len(value) + 2 <= budget.remaining:
+            text = self._dumps(value)
+            if budget.fits(text):
+                yield budget.take(text)
+                return
+        cut = value[:max(0, budget.remaining - 2)]
+        text = self._dumps(cut)
+        while len(text) > budget.remaining and cut:
+            # Escapes made it longer; drop at least as many characters as it is over by
+            cut = cut[:len(cut) - (len(text) - budget.remaining)]
+            text = self._dumps(cut)
+        budget.omitted.append({"at": pointer or "/", "chars": len(value) - len(cut)})
+        budget.remaining = 0
+        yield text
+
+    def _mark(self, result: Any, text: str, omitted: list[dict]) -> str:
+        """Attach the truncation marker to the encoded (and truncated) result.
+
+        Each level of nesting is cut at most once, so the marker normally fits
+        in MARKER_RESERVE; if deep or long-keyed pointers make it too long,
+        trailing entries are dropped and only counted, under ``more``.
+        """
+        if not isinstance(result, (dict, list, tuple)):
+            return text
+        kept = list(omitted)
+        while True:
+            info: dict[str, Any] = {"max_chars": self.max_chars, "omitted": kept}
+            if len(kept) < len(omitted):
+                info["more"] = len(omitted) - len(kept)
+            marker = self._dumps(info)
+            if len(text) + len(marker) + _MARKER_WRAPPING <= self.max_chars or not kept:
+                break
+            kept.pop()
+        if isinstance(result, dict):
+            return text[:-1] + ("," if len(text) > 2 else "") + '"truncated":' + marker + "}"
+        return text[:-1] + ("," if len(text) > 2 else "") + '{"truncated":' + marker + "}]"
+
+
+result_encoder = ResultEncoder.from_env()
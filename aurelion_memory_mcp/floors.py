@@ -0,0 +1,47 @@
+"""
+Floor layout of an AURELION memory store.
+
+Shared by the server and the index layers so they agree on which
+directories make up the store and the order they are walked in. The layout
+itself is defined once, in ``aurelion_memory_lite.architecture``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+from aurelion_memory_lite.architecture import FLOOR_DIRS, Architecture
+
+from .cache import document_cache
+
+FLOOR_NAMES = dict(Architecture.FLOORS)
+
+
+def floor_dirs(memory_path: Path, floor: int | None = None) -> list[tuple[int, Path]]:
+    """Existing floor directories, optionally scoped to a single floor."""
+    floors = [floor] if floor is not None else list(FLOOR_DIRS)
+    dirs = []
+    for f_num in floors:
+        dir_name = FLOOR_DIRS.get(f_num)
+        if dir_name:
+            d = memory_path / dir_name
+            if d.exists():
+                dirs.append((f_num, d))
+    return dirs
+
+
+def iter_floor_files(memory_path: Path, floor: int | None = None) -> Iterator[tuple[int, Path]]:
+    """Yield (floor, path) for every markdown document, floor by floor in path order."""
+    for f_num, d in floor_dirs(memory_path, floor):
+        for md_file in document_cache.list_markdown(d):
+            yield f_num, md_file
+
+
+def floor_of(doc_path: str) -> int | None:
+    """Floor number for a store-relative path, or None if it is outside every floor."""
+    head = doc_path.replace("\\", "/").lstrip("/").split("/", 1)[0]
+    for f_num, dir_name in FLOOR_DIRS.items():
+        if head == dir_name:
+            return f_num
+    return None
@@ -0,0 +1,610 @@
+"""
+Persistent inverted index over the memory store.
+
+Maps each lowercased term to postings of (doc id -> line numbers). The index
+lives in ``<memory store>/.aurelion/search_index.json``, is loaded once per
+process and kept current by ``write_document`` and a cheap stat-based refresh
+on load; updates from committed writes are saved by the deferred saver (see
+``persist``), not on every batch. Queries cost roughly the size of the
+posting lists they touch plus a read of each matching document for its
+snippet.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from .cache import document_cache
+from .floors import FLOOR_NAMES, floor_of, iter_floor_files
+from .mapped import byte_needle, find_snippet, is_large
+from .persist import saver
+from .ranking import BM25Stats
+from .stats import metrics
+from .writes import ChangeEvent, changes
+
+if TYPE_CHECKING:
+    from .query import QueryPlan
+
+INDEX_DIR = ".aurelion"
+INDEX_FILE = "search_index.json"
+INDEX_VERSION = 2
+
+_TOKEN_RE = re.compile(r"\w+")
+# Characters str.splitlines() breaks on; queries containing them can span
+# lines, which the line-level postings cannot answer.
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+class InvertedIndex:
+    """Term -> postings index for substring search over Floor_0X_* documents."""
+
+    def __init__(self, memory_path: Path):
+        self.memory_path = memory_path
+        self.index_path = memory_path / INDEX_DIR / INDEX_FILE
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        # doc id -> [path, floor, mtime_ns, size]; None once the doc is removed
+        self._docs: list[Optional[list]] = []
+        # Ids of removed docs, reused by the next documents indexed
+        self._free: list[int] = []
+        self._doc_ids: dict[str, int] = {}
+        self._postings: dict[str, dict[int, list[int]]] = {}
+        self._doc_terms: dict[int, list[str]] = {}
+        self._floors: dict[int, set[int]] = {f: set() for f in FLOOR_NAMES}
+        self._vocab: Optional[list[str]] = None
+        self.bm25 = BM25Stats()
+        self._dirty = False
+
+    # ─── Lifecycle ────────────────────────────────────────────────────────────
+
+    @classmethod
+    def open(cls, memory_path: Path) -> "InvertedIndex":
+        """Load the on-disk index (building it if absent) and bring it up to date."""
+        index = cls(memory_path)
+        if not index.load():
+            index.build()
+        else:
+            index.refresh()
+        index.save()
+        return index
+
+    def load(self) -> bool:
+        """Load the persisted index. Returns False if it is missing or unusable."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        with self._lock:
+            self._clear()
+            # Ids of removed docs are compacted away, keeping live ids in order
+            new_ids: dict[int, int] = {}
+            for old_id, doc in enumerate(data["docs"]):
+                if doc is not None:
+                    doc_id = new_ids[old_id] = len(self._docs)
+                    self._docs.append(doc)
+                    self._doc_ids[doc[0]] = doc_id
+                    self._floors.setdefault(doc[1], set()).add(doc_id)
+                    self._doc_terms[doc_id] = []
+            for term, plist in data["postings"].items():
+                postings = {}
+                for old_id, lines in plist:
+                    doc_id = new_ids[old_id]
+                    postings[doc_id] = lines
+                    self._doc_terms[doc_id].append(term)
+                self._postings[term] = postings
+            self.bm25 = BM25Stats.from_json(data["bm25"])
+            if len(new_ids) < len(data["docs"]):
+                self.bm25.renumber(new_ids)
+                self._dirty = True
+        return True
+
+    def save(self) -> None:
+        """Persist the index atomically if it changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": INDEX_VERSION,
+                "docs": self._docs,
+                "postings": {
+                    term: [[doc_id, lines] for doc_id, lines in postings.items()]
+                    for term, postings in self._postings.items()
+                },
+                "bm25": self.bm25.to_json(),
+            }
+            tmp = None
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(
+                    dir=self.index_path.parent, prefix=f".{self.index_path.name}.", suffix=".tmp"
+                )
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp, self.index_path)
+                self._dirty = False
+            except OSError:
+                # Read-only stores still get an in-memory index
+                if tmp is not None:
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+
+    def build(self) -> None:
+        """Index every document in the store from scratch."""
+        with self._lock:
+            self._clear()
+            for _, md_file in iter_floor_files(self.memory_path):
+                self.update_document(md_file.relative_to(self.memory_path).as_posix())
+            self._dirty = True
+
+    def refresh(self) -> int:
+        """Re-index documents whose (mtime_ns, size) changed and drop deleted ones."""
+        changed = 0
+        with self._lock:
+            seen = set()
+            for _, md_file in iter_floor_files(self.memory_path):
+                rel = md_file.relative_to(self.memory_path).as_posix()
+                seen.add(rel)
+                doc_id = self._doc_ids.get(rel)
+                try:
+                    st = md_file.stat()
+                except OSError:
+                    continue
+                if doc_id is not None:
+                    doc = self._docs[doc_id]
+                    if doc[2] == st.st_mtime_ns and doc[3] == st.st_size:
+                        continue
+                self.update_document(rel)
+                changed += 1
+            for rel in [p for p in self._doc_ids if p not in seen]:
+                self.remove_document(rel)
+                changed += 1
+        return changed
+
+    # ─── Maintenance ──────────────────────────────────────────────────────────
+
+    def update_document(self, doc_path: str) -> None:
+        """(Re-)index a single store-relative document path."""
+        doc_path = doc_path.replace("\\", "/")
+        floor = floor_of(doc_path)
+        full_path = self.memory_path / doc_path
+        if floor is None or not doc_path.endswith(".md"):
+            return
+        try:
+            st = full_path.stat()
+        except OSError:
+            self.remove_document(doc_path)
+            return
+        with self._lock:
+            doc_id = self._doc_ids.get(doc_path)
+            if doc_id is not None and self._docs[doc_id][2:] == [st.st_mtime_ns, st.st_size]:
+                # Already indexed at this version (change reported twice)
+                return
+        try:
+            content = document_cache.read_text(full_path)
+        except OSError:
+            self.remove_document(doc_path)
+            return
+        with self._lock:
+            self.remove_document(doc_path)
+            # A re-indexed document takes back the id it just released
+            doc = [doc_path, floor, st.st_mtime_ns, st.st_size]
+            if self._free:
+                doc_id = self._free.pop()
+                self._docs[doc_id] = doc
+            else:
+                doc_id = len(self._docs)
+                self._docs.append(doc)
+            self._doc_ids[doc_path] = doc_id
+            self._floors.setdefault(floor, set()).add(doc_id)
+            terms = []
+            counts: dict[str, int] = {}
+            for line_no, line in enumerate(content.splitlines()):
+                tokens = _TOKEN_RE.findall(line.lower())
+                for term in tokens:
+                    counts[term] = counts.get(term, 0) + 1
+                for term in set(tokens):
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = {}
+                        self._vocab = None
+                    lines = postings.get(doc_id)
+                    if lines is None:
+                        lines = postings[doc_id] = []
+                        terms.append(term)
+                    lines.append(line_no)
+            self._doc_terms[doc_id] = terms
+            self.bm25.add(doc_id, counts)
+            self._dirty = True
+
+    def remove_document(self, doc_path: str) -> None:
+        """Drop a document and its postings from the index."""
+        with self._lock:
+            doc_id = self._doc_ids.pop(doc_path.replace("\\", "/"), None)
+            if doc_id is None:
+                return
+            self._floors.get(self._docs[doc_id][1], set()).discard(doc_id)
+            self._docs[doc_id] = None
+            self._free.append(doc_id)
+            terms = self._doc_terms.pop(doc_id, [])
+            self.bm25.remove(doc_id, terms)
+            for term in terms:
+                postings = self._postings[term]
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._vocab = None
+            self._dirty = True
+
+    # ─── Queries ──────────────────────────────────────────────────────────────
+
+    def _sorted_vocab(self) -> list[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        return self._vocab
+
+    def _matching_terms(self, run: str, left_open: bool, right_open: bool) -> list[str]:
+        """Index terms a query word run can fall inside of.
+
+        A run touching the start of the query may be the tail of a longer
+        term, one touching the end may be its head; interior runs are exact.
+        """
+        if not left_open and not right_open:
+            return [run] if run in self._postings else []
+        vocab = self._sorted_vocab()
+        if not left_open:
+            lo = bisect.bisect_left(vocab, run)
+            hi = bisect.bisect_left(vocab, run + "\U0010ffff")
+            return vocab[lo:hi]
+        if not right_open:
+            return [t for t in vocab if t.endswith(run)]
+        return [t for t in vocab if run in t]
+
+    def candidates(self, query: str, floor: int | None = None) -> Optional[dict[int, set[int]]]:
+        """Doc id -> candidate line numbers for a query, or None if unanswerable.
+
+        Every line that contains the query is among the candidates; lines may
+        be false positives when the query has more than one word run.
+        """
+        query_lower = query.lower()
+        if _LINE_BREAKS.intersection(query_lower):
+            return None
+        runs = list(_TOKEN_RE.finditer(query_lower))
+        if not runs:
+            return None
+
+        # Resolve each run to a doc -> lines map and intersect them smallest first
+        per_run = []
+        with self._lock:
+            for m in runs:
+                hits: dict[int, set[int]] = {}
+                for term in self._matching_terms(
+                    m.group(), m.start() == 0, m.end() == len(query_lower)
+                ):
+                    for doc_id, lines in self._postings[term].items():
+                        hits.setdefault(doc_id, set()).update(lines)
+                if not hits:
+                    return {}
+                per_run.append(hits)
+            per_run.sort(key=len)
+            result = per_run[0]
+            if floor is not None:
+                allowed = self._floors.get(floor, set())
+                result = {d: l for d, l in result.items() if d in allowed}
+            for hits in per_run[1:]:
+                narrowed = {}
+                for doc_id, lines in result.items():
+                    other = hits.get(doc_id)
+                    if other is not None:
+                        common = lines & other
+                        if common:
+                            narrowed[doc_id] = common
+                result = narrowed
+                if not result:
+                    break
+        return result
+
+    def doc_info(self, doc_id: int) -> tuple[str, int]:
+        """(path, floor) for a live doc id."""
+        doc = self._docs[doc_id]
+        return doc[0], doc[1]
+
+    def search(
+        self,
+        query: str,
+        floor: int | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Optional[list[dict]]:
+        """Substring search via postings; None means the caller must scan instead."""
+        matches = self.iter_matches(query, floor, cancel)
+        return None if matches is None else list(matches)
+
+    def iter_matches(
+        self,
+        query: str,
+        floor: int | None = None,
+        cancel: threading.Event | None = None,
+        skip: int = 0,
+    ) -> Optional[Iterator[dict]]:
+        """Lazily yield matches in (floor, path) order, after skipping ``skip`` of them.
+
+        Documents are only read as the caller consumes results, so a caller
+        that stops early pays for the documents it actually received. Returns
+        None if the query needs a scan instead.
+        """
+        with metrics.timer("phase.match"):
+            cands = self.candidates(query, floor)
+        if cands is None:
+            return None
+        query_lower = query.lower()
+        with self._lock:
+            ordered = sorted((self.doc_info(d), lines) for d, lines in cands.items())
+        if skip and _TOKEN_RE.fullmatch(query_lower):
+            # A bare single-word query needs no verification, so skipped
+            # documents never have to be read
+            ordered = ordered[skip:]
+            skip = 0
+        return self._verify(ordered, query_lower, cancel, skip)
+
+    def _verify(
+        self,
+        ordered: list[tuple[tuple[str, int], set[int]]],
+        query_lower: str,
+        cancel: threading.Event | None,
+        skip: int,
+    ) -> Iterator[dict]:
+        needle = byte_needle(query_lower)
+        for (doc_path, f_num), lines in ordered:
+            if cancel is not None and cancel.is_set():
+                return
+            try:
+                snippet = self._snippet(self.memory_path / doc_path, lines, query_lower, needle)
+            except OSError:
+                continue
+            if snippet is None:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            yield {
+                "path": doc_path,
+                "floor": f_num,
+                "floor_name": FLOOR_NAMES[f_num],
+                "snippet": snippet,
+            }
+
+    def _snippet(
+        self,
+        full_path: Path,
+        lines: set[int],
+        query_lower: str,
+        needle: bytes | None,
+    ) -> str | None:
+        """Earliest candidate line holding the query, or None if none does."""
+        if needle is not None and is_large(full_path):
+            # The first byte-level match lies on that same line
+            return find_snippet(full_path, needle, query_lower)
+        content = document_cache.read_text(full_path)
+        start = time.perf_counter_ns()
+        doc_lines = content.splitlines()
+        snippet = None
+        for line_no in sorted(lines):
+            if line_no < len(doc_lines) and query_lower in doc_lines[line_no].lower():
+                snippet = doc_lines[line_no].strip()[:200]
+                break
+        metrics.record("phase.snippet", time.perf_counter_ns() - start)
+        return snippet
+
+    # ─── Query plans ──────────────────────────────────────────────────────────
+
+    def text_terms(self, text: str) -> Optional[list[list[str]]]:
+        """Index terms each word run of ``text`` can fall inside of, or None if unanswerable."""
+        text_lower = text.lower()
+        if _LINE_BREAKS.intersection(text_lower):
+            return None
+        runs = list(_TOKEN_RE.finditer(text_lower))
+        if not runs:
+            return None
+        with self._lock:
+            return [
+                self._matching_terms(m.group(), m.start() == 0, m.end() == len(text_lower))
+                for m in runs
+            ]
+
+    def postings_size(self, terms: list[str]) -> int:
+        """Number of (term, doc) postings behind ``terms``: an upper bound on their docs."""
+        with self._lock:
+            return sum(len(self._postings.get(t, ())) for t in terms)
+
+    def docs_with_terms(self, terms: list[str], within: set[int]) -> set[int]:
+        """Docs in ``within`` holding any of ``terms``, walking the smaller side of each."""
+        docs: set[int] = set()
+        with self._lock:
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                if len(within) < len(postings):
+                    docs.update(d for d in within if d in postings)
+                else:
+                    docs.update(d for d in postings if d in within)
+        return docs
+
+    def floor_docs(self, floor: int | None = None) -> set[int]:
+        """Live doc ids on a floor (every floor for ``None``)."""
+        with self._lock:
+            if floor is None:
+                return set(self._doc_ids.values())
+            return set(self._floors.get(floor, ()))
+
+    def docs_for_paths(self, doc_paths: set[str]) -> set[int]:
+        with self._lock:
+            return {self._doc_ids[p] for p in doc_paths if p in self._doc_ids}
+
+    def iter_plan(
+        self,
+        plan: "QueryPlan",
+        floor: int | None = None,
+        cancel: threading.Event | None = None,
+        skip: int = 0,
+    ) -> Iterator[dict]:
+        """Lazily yield a compiled query's matches in (floor, path) order.
+
+        The plan narrows the candidates on postings alone; documents are only
+        read for their snippet, and checked against the query only when the
+        plan is not exact (phrases, regexes, words the index cannot resolve).
+        """
+        with metrics.timer("phase.match"):
+            with self._lock:
+                docs = plan.candidates(self, self.floor_docs(floor))
+                ordered = sorted((self.doc_info(d), d) for d in docs)
+        if skip and plan.exact:
+            ordered = ordered[skip:]
+            skip = 0
+        return self._verify_plan(ordered, plan, cancel, skip)
+
+    def _verify_plan(
+        self,
+        ordered: list[tuple[tuple[str, int], int]],
+        plan: "QueryPlan",
+        cancel: threading.Event | None,
+        skip: int,
+    ) -> Iterator[dict]:
+        for (doc_path, f_num), doc_id in ordered:
+            if cancel is not None and cancel.is_set():
+                return
+            try:
+                content = document_cache.read_text(self.memory_path / doc_path)
+            except OSError:
+                continue
+            start = time.perf_counter_ns()
+            lines = content.splitlines()
+            matched = plan.exact or plan.matches(doc_id, lines)
+            snippet = plan.snippet(lines) if matched else None
+            metrics.record("phase.snippet", time.perf_counter_ns() - start)
+            if not matched:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            yield {
+                "path": doc_path,
+                "floor": f_num,
+                "floor_name": FLOOR_NAMES[f_num],
+                "snippet": snippet,
+            }
+
+    def rank(self, query: str, floor: int | None = None, limit: int = 10) -> list[dict]:
+        """Top ``limit`` documents by BM25 over the query's terms, best first."""
+        terms = _TOKEN_RE.findall(query.lower())
+        with self._lock:
+            allowed = self._floors.get(floor, set()) if floor is not None else None
+            top = self.bm25.top_k(terms, limit, allowed.__contains__ if allowed is not None else None)
+            hits = []
+            for score, doc_id in top:
+                doc_path, f_num = self.doc_info(doc_id)
+                # Snippet from the earliest line holding any query term
+                first = min(
+                    self._postings[t][doc_id][0]
+                    for t in terms
+                    if doc_id in self._postings.get(t, ())
+                )
+                hits.append((doc_path, f_num, score, first))
+
+        results = []
+        for doc_path, f_num, score, first in hits:
+            try:
+                doc_lines = document_cache.read_text(self.memory_path / doc_path).splitlines()
+            except OSError:
+                continue
+            results.append({
+                "path": doc_path,
+                "floor": f_num,
+                "floor_name": FLOOR_NAMES[f_num],
+                "score": round(score, 4),
+                "snippet": doc_lines[first].strip()[:200] if first < len(doc_lines) else "",
+            })
+        return results
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+
+class _Opening:
+    """A store whose index is being opened, and the changes that arrived meanwhile."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events: list[ChangeEvent] = []
+
+
+_indexes: dict[Path, InvertedIndex] = {}
+_opening: dict[Path, _Opening] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(memory_path: Path) -> InvertedIndex:
+    """Process-wide index for a memory store, opened on first use.
+
+    Only callers for the same store wait while it is opened (a cold build
+    can take a while); other stores' lookups and updates go straight on.
+    """
+    with _indexes_lock:
+        index = _indexes.get(memory_path)
+        if index is not None:
+            return index
+        opening = _opening.setdefault(memory_path, _Opening())
+    with opening.lock:
+        with _indexes_lock:
+            index = _indexes.get(memory_path)
+        if index is not None:
+            return index
+        index = InvertedIndex.open(memory_path)
+        with _indexes_lock:
+            _indexes[memory_path] = index
+            _opening.pop(memory_path, None)
+            missed = opening.events
+        # Writes committed during the open may have landed after it read them
+        _apply(index, missed)
+        return index
+
+
+def _apply(index: InvertedIndex, events: list[ChangeEvent]) -> None:
+    for event in events:
+        if event.kind == "deleted":
+            index.remove_document(event.doc_path)
+        else:
+            index.update_document(event.doc_path)
+    if events:
+        saver.schedule(index)
+
+
+def _on_changes(events: list[ChangeEvent]) -> None:
+    """Apply committed writes to open (or opening) indexes; others catch up on open."""
+    by_index: dict[InvertedIndex, list[ChangeEvent]] = {}
+    with _indexes_lock:
+        for event in events:
+            index = _indexes.get(event.memory_path)
+            if index is not None:
+                by_index.setdefault(index, []).append(event)
+            elif event.memory_path in _opening:
+                _opening[event.memory_path].events.append(event)
+    for index, index_events in by_index.items():
+        _apply(index, index_events)
+
+
+changes.subscribe(_on_changes)
@@ -0,0 +1,193 @@
+"""
+Zero-copy access to large documents.
+
+Documents at or above AURELION_MMAP_BYTES (default 1 MiB) are memory-mapped
+and searched at the byte level instead of being decoded and lowercased whole;
+only the line holding the first match is decoded for the snippet. Ranged
+reads return a byte or line slice without loading the rest of the file.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from .stats import metrics
+
+DEFAULT_MMAP_BYTES = 1024 * 1024
+
+# ASCII characters str.splitlines() breaks on; a query containing one can
+# only be answered by the text path
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e")
+
+
+def _threshold_from_env() -> int:
+    raw = os.environ.get("AURELION_MMAP_BYTES", "")
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_MMAP_BYTES
+    except ValueError:
+        return DEFAULT_MMAP_BYTES
+
+
+MMAP_THRESHOLD = _threshold_from_env()
+
+
+# Bytes lowercased per step of a case-insensitive search; bounds the copy
+_FOLD_CHUNK = 1024 * 1024
+
+
+def byte_needle(query_lower: str) -> bytes | None:
+    """``query_lower`` as bytes for a byte-level search, or None if it needs the text path.
+
+    Only ASCII queries without line breaks qualify: ``bytes.lower()`` folds
+    ASCII case only, which matches ``str.lower()`` for every ASCII character.
+    """
+    if not query_lower or not query_lower.isascii() or _LINE_BREAKS.intersection(query_lower):
+        return None
+    return query_lower.encode("ascii")
+
+
+def find_folded(data: mmap.mmap | bytes, needle: bytes) -> int:
+    """Offset of the first ASCII case-insensitive match of lowercase ``needle`` in ``data``, or -1."""
+    if needle.upper() == needle:
+        # Nothing to fold, so search the buffer in place
+        return data.find(needle)
+    overlap = len(needle) - 1
+    step = max(_FOLD_CHUNK, len(needle))
+    for start in range(0, len(data), step):
+        hit = data[start:start + step + overlap].lower().find(needle)
+        if hit >= 0:
+            return start + hit
+    return -1
+
+
+def is_large(path: Path) -> bool:
+    """True if ``path`` should be searched through a memory map."""
+    try:
+        return path.stat().st_size >= MMAP_THRESHOLD
+    except OSError:
+        return False
+
+
+@contextmanager
+def mapped(path: Path) -> Iterator[mmap.mmap | bytes]:
+    """Read-only buffer over a file's bytes (``b""`` for empty files, which cannot be mapped)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def find_snippet(path: Path, needle: bytes, query_lower: str) -> str | None:
+    """First matching line (stripped, 200 chars) of a mapped file, or None if it has no match.
+
+    Agrees with ``scan.match_snippet`` on the decoded text for ASCII queries.
+    """
+    start = time.perf_counter_ns()
+    with mapped(path) as data:
+        found = find_folded(data, needle)
+        matched = time.perf_counter_ns()
+        metrics.record("phase.match", matched - start)
+        if found < 0:
+            return None
+        line_start = data.rfind(b"\n", 0, found) + 1
+        line_end = data.find(b"\n", found + len(needle))
+        if line_end < 0:
+            line_end = len(data)
+        window = data[line_start:line_end]
+    metrics.add("bytes_decoded", len(window))
+    snippet = ""
+    # The newline-delimited window may still hold \r and other separators
+    for line in window.decode("utf-8", errors="ignore").splitlines():
+        if query_lower in line.lower():
+            snippet = line.strip()[:200]
+            break
+    metrics.record("phase.snippet", time.perf_counter_ns() - matched)
+    return snippet
+
+
+def _sequence_length(lead: int) -> int:
+    """Length of the UTF-8 sequence started by byte ``lead``."""
+    return 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+
+
+def _partial_char(raw: bytes) -> int:
+    """Number of bytes at the end of ``raw`` that start an incomplete UTF-8 sequence."""
+    for back in range(1, min(4, len(raw)) + 1):
+        byte = raw[-back]
+        if byte < 0x80:
+            return 0
+        if byte >= 0xC0:
+            return 0 if back >= _sequence_length(byte) else back
+    return 0
+
+
+def read_range(path: Path, offset: int, length: int | None = None) -> dict:
+    """Decoded bytes ``[offset, offset + length)`` of a file, aligned to whole characters.
+
+    An offset inside a multi-byte character moves forward to the next one and
+    a character cut off at the end is left for the following read (or
+    completed, if it is the only one), so paging with ``next_offset`` never
+    splits or loses characters.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = min(max(0, offset), size)
+        f.seek(offset)
+        lead = f.read(3)
+        skip = 0
+        while skip < len(lead) and 0x80 <= lead[skip] < 0xC0:
+            skip += 1
+        offset += skip
+        f.seek(offset)
+        raw = f.read(max(0, length) if length is not None else -1)
+        partial = _partial_char(raw)
+        if partial and offset + len(raw) < size:
+            if partial == len(raw):
+                # A range shorter than its first character still has to make progress
+                raw += f.read(_sequence_length(raw[0]) - len(raw))
+            else:
+                raw = raw[:-partial]
+    at_end = offset + len(raw) >= size
+    metrics.add("bytes_read", len(raw))
+    return {
+        "content": raw.decode("utf-8", errors="ignore"),
+        "offset": offset,
+        "length": len(raw),
+        "size_bytes": size,
+        "next_offset": None if at_end else offset + len(raw),
+    }
+
+
+def read_lines(path: Path, start_line: int = 1, end_line: int | None = None) -> dict:
+    """Lines ``start_line`` to ``end_line`` (1-based, inclusive) of a file.
+
+    Lines are split on ``\\n`` only, as counted by a full read's ``lines``.
+    The file is streamed, so only the requested lines are held in memory.
+    """
+    start_line = max(1, start_line)
+    selected = []
+    last = start_line - 1
+    has_more = False
+    with open(path, "rb") as f:
+        for line_no, raw in enumerate(f, 1):
+            if end_line is not None and line_no > end_line:
+                has_more = True
+                break
+            if line_no >= start_line:
+                selected.append(raw)
+                last = line_no
+    raw = b"".join(selected)
+    metrics.add("bytes_read", len(raw))
+    return {
+        "content": raw.decode("utf-8", errors="ignore"),
+        "start_line": start_line,
+        "end_line": last,
+        "has_more": has_more,
+    }
@@ -0,0 +1,91 @@
+"""
+Deferred saves for the on-disk indexes and store catalog.
+
+Committed writes update the open search and semantic indexes and the store
+catalog in memory straight away, but saving one rewrites its whole file. So
+changes only schedule a save, which runs AURELION_INDEX_SAVE_DELAY_MS after
+the first unsaved change (default 2000; 0 saves inline). A burst of writes
+then costs a single save, and anything still pending is saved at exit. A
+file that missed its last save catches up on the next open: both indexes
+re-check document stamps when they load, and the catalog's journal re-reads
+everything newer than its persisted high-water mark.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import threading
+from typing import Protocol
+
+from .writes import flush_writes
+
+DEFAULT_SAVE_DELAY_MS = 2000
+
+
+class Saveable(Protocol):
+    def save(self) -> None: ...
+
+
+def _delay_from_env() -> float:
+    raw = os.environ.get("AURELION_INDEX_SAVE_DELAY_MS", "")
+    try:
+        return max(0.0, float(raw)) / 1000 if raw else DEFAULT_SAVE_DELAY_MS / 1000
+    except ValueError:
+        return DEFAULT_SAVE_DELAY_MS / 1000
+
+
+class DeferredSaver:
+    """Saves scheduled targets together, once the delay after the first one has passed."""
+
+    def __init__(self, delay: float | None = None):
+        self.delay = _delay_from_env() if delay is None else delay
+        self._pending: dict[int, Saveable] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self.saves = 0
+
+    def schedule(self, target: Saveable) -> None:
+        """Save ``target`` soon; scheduling it again before then is free."""
+        if self.delay <= 0:
+            self._save(target)
+            return
+        with self._lock:
+            self._pending[id(target)] = target
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """Save everything scheduled so far."""
+        with self._lock:
+            targets = list(self._pending.values())
+            self._pending.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for target in targets:
+            self._save(target)
+
+    def _save(self, target: Saveable) -> None:
+        try:
+            target.save()
+            self.saves += 1
+        except Exception as e:
+            print(f"aurelion-memory: index save failed: {e}", file=sys.stderr)
+
+
+saver = DeferredSaver()
+
+
+@atexit.register
+def _save_at_exit() -> None:
+    # Writes still queued would schedule more saves; commit them first
+    flush_writes()
+    saver.flush()
@@ -0,0 +1,530 @@
+"""
+Query language for memory_search (``mode: "query"``).
+
+    career AND (promotion OR raise) NOT draft
+    "quarterly review" floor:4 -tag:archive
+    /^## goals?$/ tag:strategy
+
+Words and quoted phrases match case-insensitively within one line, as plain
+memory_search does. ``/regex/`` is matched line by line, case-insensitively,
+with ``^`` and ``$`` anchored at line boundaries. ``floor:N`` and ``tag:name``
+filter by floor and front-matter tag (``tag:`` matches every tag containing
+the name, as LibrarySystem.search_by_tag does). Operands side by side are
+ANDed; NOT (or a leading ``-``) binds tightest, then AND, then OR, and
+parentheses group.
+
+A query compiles to a plan over the inverted index. Each AND evaluates its
+operands cheapest first (by posting-list size), intersecting within the
+documents that survived so far and stopping once none are left, then
+subtracts its NOT operands. Documents are read only for the survivors, and
+checked against the text only when a phrase, regex or unindexed word needs
+it, so a regex never runs on a document the other operands ruled out.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from .floors import FLOOR_NAMES
+
+if TYPE_CHECKING:
+    from .index import InvertedIndex
+
+_WORD_RE = re.compile(r"\w+")
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | "(?P<phrase>[^"]*)"
+      | /(?P<regex>(?:\\.|[^/\\])+)/
+      | (?P<field>floor|tag):(?:"(?P<quoted>[^"]*)"|(?P<value>[^\s()"]+))
+      | (?P<bare>floor|tag):(?=[\s()]|$)
+      | (?P<minus>-)(?=[^\s)])
+      | (?P<word>[^\s()"]+)
+    )
+    """,
+    re.VERBOSE,
+)
+_OPERATORS = frozenset({"AND", "OR", "NOT"})
+# Shortest regex literal worth a postings lookup
+_MIN_LITERAL = 2
+SNIPPET_CHARS = 200
+
+
+class QuerySyntaxError(ValueError):
+    """The query could not be parsed."""
+
+
+class _Doc:
+    """A candidate document being verified, lowercased on demand."""
+
+    __slots__ = ("doc_id", "lines", "_lowered")
+
+    def __init__(self, doc_id: int, lines: list[str]):
+        self.doc_id = doc_id
+        self.lines = lines
+        self._lowered: list[str] | None = None
+
+    @property
+    def lowered(self) -> list[str]:
+        if self._lowered is None:
+            self._lowered = [line.lower() for line in self.lines]
+        return self._lowered
+
+
+# ─── Plan nodes ───────────────────────────────────────────────────────────────
+
+class _Node:
+    # True when candidates() is exactly the set of matching documents
+    exact = True
+    # Estimated number of candidate documents, for ordering AND operands
+    cost = 0
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        """Look up postings and estimate cost, once per execution."""
+
+    def candidates(self, index: InvertedIndex, within: set[int]) -> set[int]:
+        """Docs in ``within`` that may match (exactly those if ``exact``)."""
+        raise NotImplementedError
+
+    def matches(self, doc: _Doc) -> bool:
+        raise NotImplementedError
+
+    def leaves(self) -> Iterator[_Node]:
+        """Text and regex operands outside any NOT, for picking a snippet."""
+        return iter(())
+
+    def describe(self) -> str:
+        raise NotImplementedError
+
+
+def _narrow(index: InvertedIndex, runs: list[list[str]], within: set[int]) -> set[int]:
+    """Docs in ``within`` holding a term for every run, smallest posting lists first."""
+    docs = within
+    for terms in sorted(runs, key=index.postings_size):
+        if not docs:
+            break
+        docs = index.docs_with_terms(terms, docs)
+    return docs
+
+
+class Text(_Node):
+    """A word or phrase that must occur within one line."""
+
+    def __init__(self, text: str):
+        self.text = text.lower()
+        self.runs: list[list[str]] | None = None
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        self.runs = index.text_terms(self.text)
+        if self.runs is None:
+            self.exact, self.cost = False, universe
+            return
+        # A lone word needs no verification: any term containing it contains it
+        self.exact = len(self.runs) == 1 and _WORD_RE.fullmatch(self.text) is not None
+        self.cost = min(index.postings_size(terms) for terms in self.runs)
+
+    def candidates(self, index: InvertedIndex, within: set[int]) -> set[int]:
+        return set(within) if self.runs is None else _narrow(index, self.runs, within)
+
+    def matches(self, doc: _Doc) -> bool:
+        text = self.text
+        return any(text in line for line in doc.lowered)
+
+    def matches_line(self, line: str, lowered: str) -> bool:
+        return self.text in lowered
+
+    def leaves(self) -> Iterator[_Node]:
+        yield self
+
+    def describe(self) -> str:
+        return f'"{self.text}"'
+
+
+def required_literals(source: str) -> list[str]:
+    """Lowercased literal runs every match of a regex must contain (conservatively).
+
+    Group contents, character classes, escapes and characters made optional
+    by ``?``/``*``/``{`` are skipped, and a top-level ``|`` means nothing is
+    required.
+    """
+    runs: list[str] = []
+    current: list[str] = []
+    depth = 0
+    i = 0
+
+    def flush() -> None:
+        if len(current) >= _MIN_LITERAL:
+            runs.append("".join(current))
+        current.clear()
+
+    while i < len(source):
+        ch = source[i]
+        if ch == "\\":
+            flush()
+            i += 2
+            continue
+        if ch == "[":
+            flush()
+            i += 1
+            if source[i:i + 1] == "^":
+                i += 1
+            if source[i:i + 1] == "]":
+                i += 1
+            while i < len(source) and source[i] != "]":
+                i += 2 if source[i] == "\\" else 1
+            i += 1
+            continue
+        if ch == "(":
+            depth += 1
+            flush()
+        elif ch == ")":
+            depth -= 1
+            flush()
+        elif depth:
+            pass
+        elif ch == "|":
+            return []
+        elif ch.isalnum() or ch == "_":
+            if source[i + 1:i + 2] in ("?", "*", "{"):
+                flush()
+            else:
+                current.append(ch.lower())
+        else:
+            flush()
+        i += 1
+    flush()
+    return runs
+
+
+class Regex(_Node):
+    """A regular expression matched against each line."""
+
+    exact = False
+
+    def __init__(self, source: str):
+        try:
+            self.pattern = re.compile(source, re.IGNORECASE)
+        except re.error as e:
+            raise QuerySyntaxError(f"Invalid regex /{source}/: {e}") from e
+        self.source = source
+        self.literals = required_literals(source)
+        self.runs: list[list[str]] = []
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        self.runs = []
+        for literal in self.literals:
+            self.runs.extend(index.text_terms(literal) or ())
+        self.cost = min((index.postings_size(t) for t in self.runs), default=universe)
+
+    def candidates(self, index: InvertedIndex, within: set[int]) -> set[int]:
+        return _narrow(index, self.runs, within) if self.runs else set(within)
+
+    def matches(self, doc: _Doc) -> bool:
+        search = self.pattern.search
+        return any(search(line) for line in doc.lines)
+
+    def matches_line(self, line: str, lowered: str) -> bool:
+        return self.pattern.search(line) is not None
+
+    def leaves(self) -> Iterator[_Node]:
+        yield self
+
+    def describe(self) -> str:
+        return f"/{self.source}/"
+
+
+class _DocSet(_Node):
+    """A filter resolved to a set of doc ids when the plan is prepared."""
+
+    docs: set[int] | frozenset[int] = frozenset()
+
+    def candidates(self, index: InvertedIndex, within: set[int]) -> set[int]:
+        small, large = (within, self.docs) if len(within) < len(self.docs) else (self.docs, within)
+        return {d for d in small if d in large}
+
+    def matches(self, doc: _Doc) -> bool:
+        return doc.doc_id in self.docs
+
+
+class Floor(_DocSet):
+    def __init__(self, floor: int):
+        self.floor = floor
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        self.docs = index.floor_docs(self.floor)
+        self.cost = len(self.docs)
+
+    def describe(self) -> str:
+        return f"floor:{self.floor}"
+
+
+class Tag(_DocSet):
+    def __init__(self, tag: str):
+        self.tag = tag.lower()
+        self.paths: set[str] = set()
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        self.docs = index.docs_for_paths(self.paths)
+        self.cost = len(self.docs)
+
+    def describe(self) -> str:
+        return f"tag:{self.tag}"
+
+
+class Not(_Node):
+    def __init__(self, child: _Node):
+        self.child = child
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        self.child.prepare(index, universe)
+        self.exact = self.child.exact
+        self.cost = universe
+
+    def candidates(self, index: InvertedIndex, within: set[int]) -> set[int]:
+        if not self.child.exact:
+            # Cannot subtract a superset; verification decides
+            return set(within)
+        return within - self.child.candidates(index, within)
+
+    def matches(self, doc: _Doc) -> bool:
+        return not self.child.matches(doc)
+
+    def describe(self) -> str:
+        return f"NOT {self.child.describe()}"
+
+
+class And(_Node):
+    def __init__(self, children: list[_Node]):
+        self.children = children
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        for child in self.children:
+            child.prepare(index, universe)
+        self.exact = all(child.exact for child in self.children)
+        positives = [c for c in self.children if not isinstance(c, Not)]
+        self.cost = min((c.cost for c in positives), default=universe)
+        # Cheapest first for narrowing; exact filters first for verification
+        self.children.sort(key=lambda c: (isinstance(c, Not), c.cost))
+        self._verify_order = sorted(self.children, key=lambda c: (not c.exact, c.cost))
+
+    def candidates(self, index: InvertedIndex, within: set[int]) -> set[int]:
+        docs = within
+        for child in self.children:
+            if not docs:
+                break
+            docs = child.candidates(index, docs)
+        return docs
+
+    def matches(self, doc: _Doc) -> bool:
+        return all(child.matches(doc) for child in self._verify_order)
+
+    def leaves(self) -> Iterator[_Node]:
+        for child in self.children:
+            yield from child.leaves()
+
+    def describe(self) -> str:
+        return "(" + " AND ".join(c.describe() for c in self.children) + ")"
+
+
+class Or(_Node):
+    def __init__(self, children: list[_Node]):
+        self.children = children
+
+    def prepare(self, index: InvertedIndex, universe: int) -> None:
+        for child in self.children:
+            child.prepare(index, universe)
+        self.exact = all(child.exact for child in self.children)
+        self.cost = min(universe, sum(c.cost for c in self.children))
+
+    def candidates(self, index: InvertedIndex, within: set[int]) -> set[int]:
+        docs: set[int] = set()
+        for child in self.children:
+            docs |= child.candidates(index, within - docs if docs else within)
+        return docs
+
+    def matches(self, doc: _Doc) -> bool:
+        return any(child.matches(doc) for child in self.children)
+
+    def leaves(self) -> Iterator[_Node]:
+        for child in self.children:
+            yield from child.leaves()
+
+    def describe(self) -> str:
+        return "(" + " OR ".join(c.describe() for c in self.children) + ")"
+
+
+# ─── Parser ───────────────────────────────────────────────────────────────────
+
+def _tokenize(query: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    end = len(query.rstrip())
+    while pos < end:
+        m = _TOKEN_RE.match(query, pos)
+        if m is None or m.end() == pos:
+            stray = query[pos:].lstrip()[:1]
+            what = "unterminated phrase" if stray == '"' else f"unexpected {stray!r}"
+            raise QuerySyntaxError(f"Invalid query: {what} at position {pos}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "bare":
+            raise QuerySyntaxError(f"Invalid query: {m.group(kind)}: needs a value")
+        if kind in ("quoted", "value"):
+            tokens.append((m.group("field"), m.group(kind)))
+        elif kind == "word" and m.group("word") in _OPERATORS:
+            tokens.append((m.group("word"), ""))
+        else:
+            tokens.append((kind, m.group(kind)))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent: or := and (OR and)*; and := unary ([AND] unary)*; unary := (NOT|-) unary | primary."""
+
+    _STARTS = frozenset({"lparen", "phrase", "regex", "floor", "tag", "word", "minus", "NOT"})
+
+    def __init__(self, tokens: list[tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self) -> tuple[str, str]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self) -> _Node:
+        node = self.or_expr()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Invalid query: unexpected {self._shown(self.take())}")
+        return node
+
+    @staticmethod
+    def _shown(token: tuple[str, str]) -> str:
+        kind, value = token
+        return value or kind
+
+    def or_expr(self) -> _Node:
+        children = [self.and_expr()]
+        while self.peek() == "OR":
+            self.take()
+            children.append(self.and_expr())
+        return children[0] if len(children) == 1 else Or(_flatten(children, Or))
+
+    def and_expr(self) -> _Node:
+        children = [self.unary()]
+        while True:
+            if self.peek() == "AND":
+                self.take()
+            elif self.peek() not in self._STARTS:
+                break
+            children.append(self.unary())
+        return children[0] if len(children) == 1 else And(_flatten(children, And))
+
+    def unary(self) -> _Node:
+        if self.peek() in ("NOT", "minus"):
+            self.take()
+            return Not(self.unary())
+        return self.primary()
+
+    def primary(self) -> _Node:
+        if self.peek() is None:
+            raise QuerySyntaxError("Invalid query: expected a term at the end")
+        kind, value = self.take()
+        if kind == "lparen":
+            node = self.or_expr()
+            if self.peek() != "rparen":
+                raise QuerySyntaxError("Invalid query: missing )")
+            self.take()
+            return node
+        if kind in ("phrase", "word"):
+            if not value:
+                raise QuerySyntaxError("Invalid query: empty phrase")
+            return Text(value)
+        if kind == "regex":
+            return Regex(value)
+        if kind == "floor":
+            if not value.isdigit() or int(value) not in FLOOR_NAMES:
+                raise QuerySyntaxError(f"Invalid query: floor:{value} (use 1-5)")
+            return Floor(int(value))
+        if kind == "tag":
+            if not value:
+                raise QuerySyntaxError("Invalid query: empty tag")
+            return Tag(value)
+        raise QuerySyntaxError(f"Invalid query: unexpected {self._shown((kind, value))}")
+
+
+def _flatten(children: list[_Node], kind: type) -> list[_Node]:
+    flat: list[_Node] = []
+    for child in children:
+        flat.extend(child.children if isinstance(child, kind) else [child])
+    return flat
+
+
+# ─── Plans ────────────────────────────────────────────────────────────────────
+
+class QueryPlan:
+    """A parsed query, ready to run against an inverted index."""
+
+    def __init__(self, root: _Node):
+        self.root = root
+        self._leaves = list(root.leaves())
+        self._tags = [n for n in _walk(root) if isinstance(n, Tag)]
+
+    @property
+    def exact(self) -> bool:
+        """True once prepared if the candidates need no verification."""
+        return self.root.exact
+
+    def resolve_tags(self, tag_paths: Callable[[str], set[str]]) -> None:
+        """Resolve ``tag:`` filters to document paths (e.g. from the store catalog)."""
+        for node in self._tags:
+            node.paths = tag_paths(node.tag)
+
+    def candidates(self, index: InvertedIndex, universe: set[int]) -> set[int]:
+        """Run the index phase: docs in ``universe`` that may match."""
+        self.root.prepare(index, len(universe))
+        return self.root.candidates(index, universe)
+
+    def matches(self, doc_id: int, lines: list[str]) -> bool:
+        return self.root.matches(_Doc(doc_id, lines))
+
+    def snippet(self, lines: list[str]) -> str:
+        """First line holding a text or regex operand, else the first line after any front matter."""
+        for line in lines:
+            lowered = line.lower()
+            if any(leaf.matches_line(line, lowered) for leaf in self._leaves):
+                return line.strip()[:SNIPPET_CHARS]
+        start = 0
+        if lines and lines[0].lstrip("\ufeff").strip() == "---":
+            closing = next((i for i in range(1, len(lines)) if lines[i].strip() == "---"), None)
+            start = closing + 1 if closing is not None else 0
+        for line in lines[start:]:
+            if line.strip():
+                return line.strip()[:SNIPPET_CHARS]
+        return ""
+
+    def describe(self) -> str:
+        """The plan in canonical form, AND operands in execution order once prepared."""
+        return self.root.describe()
+
+
+def _walk(node: _Node) -> Iterator[_Node]:
+    yield node
+    for child in getattr(node, "children", ()):
+        yield from _walk(child)
+    if isinstance(node, Not):
+        yield from _walk(node.child)
+
+
+def compile_query(query: str) -> QueryPlan:
+    """Parse a query into a plan; raises QuerySyntaxError if it is malformed."""
+    tokens = _tokenize(query)
+    if not tokens:
+        raise QuerySyntaxError("Invalid query: empty")
+    return QueryPlan(_Parser(tokens).parse())
@@ -0,0 +1,138 @@
+"""
+BM25 corpus statistics for ranked memory_search.
+
+Statistics are array-backed: one document-length array indexed by doc id, and
+per term a pair of parallel arrays (ascending doc ids, term frequencies). New
+doc ids usually come last, so adding a document mostly appends to each array
+(a reused id is inserted in place) and removing one is a bisect plus delete.
+Owned and persisted by the inverted index.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class BM25Stats:
+    """Per-document term frequencies, document lengths and corpus IDF inputs."""
+
+    def __init__(self):
+        self.doc_len = array("I")
+        self.term_docs: dict[str, array] = {}
+        self.term_tfs: dict[str, array] = {}
+        self.n_docs = 0
+        self.total_len = 0
+
+    def add(self, doc_id: int, counts: dict[str, int]) -> None:
+        """Record a newly indexed document under a new or released doc id."""
+        length = sum(counts.values())
+        if len(self.doc_len) <= doc_id:
+            self.doc_len.extend([0] * (doc_id + 1 - len(self.doc_len)))
+        self.doc_len[doc_id] = length
+        self.n_docs += 1
+        self.total_len += length
+        for term, tf in counts.items():
+            docs = self.term_docs.get(term)
+            if docs is None:
+                docs = self.term_docs[term] = array("I")
+                self.term_tfs[term] = array("I")
+            tfs = self.term_tfs[term]
+            if not docs or docs[-1] < doc_id:
+                docs.append(doc_id)
+                tfs.append(tf)
+            else:
+                pos = bisect_left(docs, doc_id)
+                docs.insert(pos, doc_id)
+                tfs.insert(pos, tf)
+
+    def remove(self, doc_id: int, terms: Iterable[str]) -> None:
+        """Forget a document given the terms it was indexed under."""
+        if doc_id >= len(self.doc_len):
+            return
+        self.n_docs -= 1
+        self.total_len -= self.doc_len[doc_id]
+        self.doc_len[doc_id] = 0
+        for term in terms:
+            docs = self.term_docs.get(term)
+            if docs is None:
+                continue
+            pos = bisect_left(docs, doc_id)
+            if pos < len(docs) and docs[pos] == doc_id:
+                del docs[pos]
+                del self.term_tfs[term][pos]
+            if not docs:
+                del self.term_docs[term]
+                del self.term_tfs[term]
+
+    def renumber(self, new_ids: dict[int, int]) -> None:
+        """Move documents to new ids (old -> new); the mapping must preserve their order."""
+        doc_len = array("I", [0]) * len(new_ids)
+        for old_id, doc_id in new_ids.items():
+            if old_id < len(self.doc_len):
+                doc_len[doc_id] = self.doc_len[old_id]
+        self.doc_len = doc_len
+        for term, docs in self.term_docs.items():
+            self.term_docs[term] = array("I", (new_ids[d] for d in docs))
+
+    def idf(self, term: str) -> float:
+        df = len(self.term_docs.get(term, ()))
+        return math.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def top_k(
+        self,
+        terms: Iterable[str],
+        k: int,
+        accept: Callable[[int], bool] | None = None,
+    ) -> list[tuple[float, int]]:
+        """Best ``k`` (score, doc id) pairs for the query terms, highest score first.
+
+        Cost is the total length of the query terms' postings.
+        """
+        if not self.n_docs:
+            return []
+        avg_len = self.total_len / self.n_docs or 1.0
+        doc_len = self.doc_len
+        scores: dict[int, float] = {}
+        for term in set(terms):
+            docs = self.term_docs.get(term)
+            if docs is None:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in zip(docs, self.term_tfs[term]):
+                if accept is not None and not accept(doc_id):
+                    continue
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        # Ties broken by doc id so results are stable across runs
+        best = heapq.nsmallest(k, ((-s, d) for d, s in scores.items()))
+        return [(-neg, doc_id) for neg, doc_id in best]
+
+    # ─── Persistence ──────────────────────────────────────────────────────────
+
+    def to_json(self) -> dict:
+        return {
+            "n_docs": self.n_docs,
+            "doc_len": self.doc_len.tolist(),
+            "terms": {
+                term: [docs.tolist(), self.term_tfs[term].tolist()]
+                for term, docs in self.term_docs.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "BM25Stats":
+        stats = cls()
+        stats.doc_len = array("I", data["doc_len"])
+        for term, (docs, tfs) in data["terms"].items():
+            stats.term_docs[term] = array("I", docs)
+            stats.term_tfs[term] = array("I", tfs)
+        stats.n_docs = data["n_docs"]
+        stats.total_len = sum(stats.doc_len)
+        return stats
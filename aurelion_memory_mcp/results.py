@@ -0,0 +1,125 @@
+"""
+Result cache for the read-only search and listing tools.
+
+Responses are cached as encoded text, keyed by tool, normalized arguments
+and the generation of every store they read. A store's generation is bumped
+by each batch of change events (committed writes and outside edits found by
+the change journal), so a response is never served after its store changed.
+
+Entries also expire after AURELION_RESULT_CACHE_TTL seconds (default 300);
+"not found" responses are cached too, for AURELION_RESULT_CACHE_NEGATIVE_TTL
+seconds (default 30). The cache holds at most AURELION_RESULT_CACHE_BYTES of
+responses (default 16 MiB; 0 disables it), evicting the least recently used.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from aurelion_memory_lite.result_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_NEGATIVE_TTL,
+    DEFAULT_TTL,
+    MISS,
+    ResultCache,
+)
+
+from .stats import metrics
+from .writes import ChangeEvent, changes
+
+CACHED_TOOLS = frozenset({
+    "memory_search",
+    "memory_search_many",
+    "memory_semantic_search",
+    "memory_federated_search",
+    "memory_floor",
+})
+
+
+def _number_from_env(name: str, default: float) -> float:
+    raw = os.environ.get(name, "")
+    try:
+        return max(0.0, float(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+class StoreGenerations:
+    """Change counter per store root, bumped by every batch of change events."""
+
+    def __init__(self):
+        self._generations: dict[Path, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, memory_path: Path) -> int:
+        return self._generations.get(memory_path, 0)
+
+    def bump(self, memory_paths: set[Path]) -> None:
+        with self._lock:
+            for memory_path in memory_paths:
+                self._generations[memory_path] = self._generations.get(memory_path, 0) + 1
+
+
+generations = StoreGenerations()
+
+result_cache = ResultCache(
+    max_bytes=int(_number_from_env("AURELION_RESULT_CACHE_BYTES", DEFAULT_MAX_BYTES)),
+    ttl=_number_from_env("AURELION_RESULT_CACHE_TTL", DEFAULT_TTL),
+    negative_ttl=_number_from_env("AURELION_RESULT_CACHE_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL),
+)
+
+
+def _on_changes(events: list[ChangeEvent]) -> None:
+    generations.bump({event.memory_path for event in events})
+
+
+changes.subscribe(_on_changes)
+
+
+def cache_key(tool: str, arguments: dict[str, Any], memory_paths: list[Path]) -> tuple:
+    """(tool, canonical arguments, (store, generation) for each store read)."""
+    normalized = json.dumps(
+        {k: v for k, v in arguments.items() if v is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return tool, normalized, tuple((p, generations.get(p)) for p in memory_paths)
+
+
+def _outcome(text: str) -> str | None:
+    """"found" or "empty" for a cacheable response, None for errors."""
+    if text.lstrip("{[ \n").startswith('"error"') or '"errors":' in text:
+        return None
+    if text.startswith("No documents found") or text == "[]":
+        return "empty"
+    return "found"
+
+
+def cached_response(
+    tool: str,
+    arguments: dict[str, Any],
+    memory_paths: list[Path],
+    compute: Callable[[], str],
+    cancel: threading.Event | None = None,
+) -> str:
+    """Cached response for a tool call, or ``compute()``'s, cached for next time.
+
+    Callers bring the stores up to date (flush writes, poll the journal)
+    first, so the generations in the key are current.
+    """
+    key = cache_key(tool, arguments, memory_paths)
+    text = result_cache.get(key)
+    if text is not MISS:
+        metrics.add("result_cache.hits")
+        return text
+    metrics.add("result_cache.misses")
+    text = compute()
+    outcome = _outcome(text)
+    # A cancelled call may have stopped part-way through its scan
+    if outcome is not None and not (cancel is not None and cancel.is_set()):
+        result_cache.put(key, text, len(text), negative=outcome == "empty")
+    return text
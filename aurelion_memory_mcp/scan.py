@@ -0,0 +1,230 @@
+"""
+Full-text scanning of the memory store.
+
+Used when the inverted index cannot answer a query. The scan can fan out
+across floors and file batches to a thread or process pool; batches are
+merged in submission order, so results match the sequential walk exactly.
+Matches are produced lazily so paged searches can stop early.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+from .cache import document_cache
+from .floors import FLOOR_NAMES, iter_floor_files
+from .mapped import byte_needle, find_snippet, is_large
+from .stats import metrics
+
+SCAN_MODES = ("thread", "process")
+
+
+def _scan_config() -> tuple[int, str]:
+    """(workers, mode) from AURELION_SCAN_WORKERS / AURELION_SCAN_MODE."""
+    raw = os.environ.get("AURELION_SCAN_WORKERS", "")
+    try:
+        workers = max(1, int(raw)) if raw else 1
+    except ValueError:
+        workers = 1
+    mode = os.environ.get("AURELION_SCAN_MODE", "thread")
+    return workers, mode if mode in SCAN_MODES else "thread"
+
+
+_pools: dict[tuple[str, int], Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(mode: str, workers: int) -> Executor:
+    with _pools_lock:
+        pool = _pools.get((mode, workers))
+        if pool is None:
+            if mode == "process":
+                # Imported lazily: it pulls in multiprocessing, which slows start-up
+                from concurrent.futures import ProcessPoolExecutor
+                pool = ProcessPoolExecutor(max_workers=workers)
+            else:
+                pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aurelion-scan")
+            _pools[(mode, workers)] = pool
+        return pool
+
+
+def match_snippet(content: str, query_lower: str) -> str | None:
+    """First matching line (stripped, 200 chars) if ``content`` contains the query, else None."""
+    start = time.perf_counter_ns()
+    found = query_lower in content.lower()
+    matched = time.perf_counter_ns()
+    metrics.record("phase.match", matched - start)
+    if not found:
+        return None
+    snippet = ""
+    for line in content.splitlines():
+        if query_lower in line.lower():
+            snippet = line.strip()[:200]
+            break
+    metrics.record("phase.snippet", time.perf_counter_ns() - matched)
+    return snippet
+
+
+def _scan_batch(
+    memory_path: Path,
+    query_lower: str,
+    batch: list[tuple[int, Path]],
+    use_cache: bool = True,
+    cancel: threading.Event | None = None,
+) -> list[dict]:
+    results = []
+    needle = byte_needle(query_lower)
+    for f_num, md_file in batch:
+        if cancel is not None and cancel.is_set():
+            break
+        try:
+            # Large documents are searched in place rather than decoded and
+            # lowercased whole (and kept out of the document cache)
+            if needle is not None and is_large(md_file):
+                snippet = find_snippet(md_file, needle, query_lower)
+            else:
+                if use_cache:
+                    content = document_cache.read_text(md_file)
+                else:
+                    content = md_file.read_text(encoding="utf-8", errors="ignore")
+                snippet = match_snippet(content, query_lower)
+            if snippet is not None:
+                results.append({
+                    "path": md_file.relative_to(memory_path).as_posix(),
+                    "floor": f_num,
+                    "floor_name": FLOOR_NAMES[f_num],
+                    "snippet": snippet,
+                })
+        except Exception:
+            continue
+    return results
+
+
+def _scan_batch_process(memory_path: Path, query_lower: str, batch: list[tuple[int, Path]]) -> list[dict]:
+    # Worker processes do not share the parent's document cache
+    return _scan_batch(memory_path, query_lower, batch, use_cache=False)
+
+
+def scan_files(
+    memory_path: Path,
+    query: str,
+    floor: int | None = None,
+    cancel: threading.Event | None = None,
+    workers: int | None = None,
+    mode: str | None = None,
+) -> list[dict]:
+    """Full-text search by reading every document on the selected floors.
+
+    ``workers``/``mode`` default to AURELION_SCAN_WORKERS (1, sequential) and
+    AURELION_SCAN_MODE ("thread" or "process").
+    """
+    return list(iter_scan(memory_path, query, floor, cancel, workers, mode))
+
+
+def iter_scan(
+    memory_path: Path,
+    query: str,
+    floor: int | None = None,
+    cancel: threading.Event | None = None,
+    workers: int | None = None,
+    mode: str | None = None,
+) -> Iterator[dict]:
+    """Lazily yield scan matches in walk order; closing the iterator stops the scan."""
+    env_workers, env_mode = _scan_config()
+    workers = workers or env_workers
+    mode = mode or env_mode
+    query_lower = query.lower()
+    files = list(iter_floor_files(memory_path, floor))
+
+    if workers <= 1 or len(files) < 2:
+        for item in files:
+            if cancel is not None and cancel.is_set():
+                return
+            yield from _scan_batch(memory_path, query_lower, [item])
+        return
+
+    # Several batches per worker keeps the pool busy when file sizes are uneven
+    size = max(1, -(-len(files) // (workers * 4)))
+    batches = [files[i:i + size] for i in range(0, len(files), size)]
+    pool = _pool(mode, workers)
+
+    def submit(batch: list[tuple[int, Path]]) -> Future:
+        if mode == "process":
+            return pool.submit(_scan_batch_process, memory_path, query_lower, batch)
+        return pool.submit(_scan_batch, memory_path, query_lower, batch, True, cancel)
+
+    # Keep a bounded window of batches in flight so a caller that stops after
+    # the first page does not pay for scanning the whole store
+    pending = iter(batches)
+    window = deque(submit(b) for b in islice(pending, workers * 2))
+    try:
+        while window:
+            if cancel is not None and cancel.is_set():
+                return
+            future = window.popleft()
+            for batch in islice(pending, 1):
+                window.append(submit(batch))
+            yield from future.result()
+    finally:
+        for future in window:
+            future.cancel()
+
+
+def scan_many(
+    memory_path: Path,
+    queries: list[str],
+    floor: int | None = None,
+    cancel: threading.Event | None = None,
+    limit: int | None = None,
+) -> list[list[dict]]:
+    """Scan for several queries in a single walk, one result list per query.
+
+    Each document is read and lowercased once for the whole batch. The walk
+    stops early once every query has ``limit`` results.
+    """
+    lowered = [q.lower() for q in queries]
+    needles = [byte_needle(q) for q in lowered]
+    results: list[list[dict]] = [[] for _ in queries]
+    for f_num, md_file in iter_floor_files(memory_path, floor):
+        if cancel is not None and cancel.is_set():
+            break
+        pending = [i for i, found in enumerate(results) if limit is None or len(found) < limit]
+        if not pending:
+            break
+        large = is_large(md_file)
+        content_lower = lines = None
+        for i in pending:
+            query_lower = lowered[i]
+            try:
+                if large and needles[i] is not None:
+                    snippet = find_snippet(md_file, needles[i], query_lower)
+                else:
+                    if content_lower is None:
+                        content = document_cache.read_text(md_file)
+                        content_lower = content.lower()
+                    if query_lower not in content_lower:
+                        continue
+                    if lines is None:
+                        lines = content.splitlines()
+                    snippet = next(
+                        (line.strip()[:200] for line in lines if query_lower in line.lower()), ""
+                    )
+            except (OSError, ValueError):
+                # e.g. the document went away mid-walk; the other queries still get their turn
+                metrics.add("scan.errors")
+                continue
+            if snippet is not None:
+                results[i].append({
+                    "path": md_file.relative_to(memory_path).as_posix(),
+                    "floor": f_num,
+                    "floor_name": FLOOR_NAMES[f_num],
+                    "snippet": snippet,
+                })
+    return results
@@ -17,113 +17,428 @@ Compatible with:
 from __future__ import annotations
 
 import asyncio
+import base64
+import importlib.util
 import json
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Any, Optional
+from itertools import islice
+from typing import Any, Iterator
+
+from aurelion_memory_lite.catalog import get_catalog
+from aurelion_memory_lite.semantic import get_semantic_index, loaded_semantic_index
+
+from .cache import document_cache
+from .encoding import result_encoder
+from .floors import FLOOR_DIRS, FLOOR_NAMES, floor_of
+from .index import get_index
+from .mapped import read_lines, read_range
+from .persist import saver
+from .query import QuerySyntaxError, compile_query
+from .results import CACHED_TOOLS, cached_response, result_cache
+from .scan import iter_scan, scan_many
+from .session import get_session_index
+from .stats import metrics, start_stats_dump
+from .stores import get_registry
+from .workers import ToolRunner, map_batch
+from .writes import ChangeEvent, changes, flush_writes, get_writer
 
 # MCP SDK — install with: pip install mcp
-try:
-    import mcp.server.stdio
-    import mcp.types as types
-    from mcp.server import Server, NotificationOptions
-    from mcp.server.models import InitializationOptions
-    MCP_AVAILABLE = True
-except ImportError:
-    MCP_AVAILABLE = False
+# Only probed here; the SDK itself is imported when the server is built, so
+# importing this module (and process start-up) stays cheap.
+MCP_AVAILABLE = importlib.util.find_spec("mcp") is not None
 
 # AURELION Memory library
-try:
-    from aurelion_memory_lite import LibrarySystem
-    MEMORY_AVAILABLE = True
-except ImportError:
-    MEMORY_AVAILABLE = False
+MEMORY_AVAILABLE = importlib.util.find_spec("aurelion_memory_lite") is not None
 
 
-# ─── Constants ────────────────────────────────────────────────────────────────
+# ─── Memory Store ─────────────────────────────────────────────────────────────
 
-FLOOR_NAMES = {
-    1: "Foundation",
-    2: "Systems",
-    3: "Networks",
-    4: "Action",
-    5: "Vision",
-}
+# Most paths or queries accepted by one memory_read_many / memory_search_many call
+MAX_BATCH = 50
 
-FLOOR_DIRS = {
-    1: "Floor_01_Foundation",
-    2: "Floor_02_Systems",
-    3: "Floor_03_Networks",
-    4: "Floor_04_Action",
-    5: "Floor_05_Vision",
-}
+def get_memory_path(store: str | None = None) -> Path:
+    """Resolve a memory store root from environment (the default store for ``None``).
 
+    Stores are parsed from AURELION_MEMORY_PATH / AURELION_STORES once per
+    configuration; later calls are a dictionary lookup.
+    """
+    return get_registry().resolve(store)
 
-# ─── Memory Store ─────────────────────────────────────────────────────────────
 
-def get_memory_path() -> Path:
-    """Resolve the memory store root from environment."""
-    raw = os.environ.get("AURELION_MEMORY_PATH", "")
-    if not raw:
-        raise EnvironmentError(
-            "AURELION_MEMORY_PATH is not set. "
-            "Set it to the root of your AURELION memory store directory."
-        )
-    p = Path(raw).expanduser().resolve()
-    if not p.exists():
-        raise FileNotFoundError(f"AURELION_MEMORY_PATH does not exist: {p}")
-    return p
+_prewarm_lock = threading.Lock()
+_prewarmed: set[Path] = set()
 
 
-def search_files(memory_path: Path, query: str, floor: int | None = None) -> list[dict]:
-    """Full-text search across markdown files in the memory store."""
-    results = []
-    query_lower = query.lower()
-
-    search_dirs = []
-    if floor is not None:
-        dir_name = FLOOR_DIRS.get(floor)
-        if dir_name:
-            d = memory_path / dir_name
-            if d.exists():
-                search_dirs.append((floor, d))
-    else:
-        for f_num, dir_name in FLOOR_DIRS.items():
-            d = memory_path / dir_name
-            if d.exists():
-                search_dirs.append((f_num, d))
+def prewarm(memory_path: Path) -> threading.Thread | None:
+    """Open the search index and warm floor listings on a background thread.
+
+    Runs at most once per store. Tool calls that arrive first simply share
+    the index once it is ready (``get_index`` serialises the open).
+    """
+    with _prewarm_lock:
+        if memory_path in _prewarmed:
+            return None
+        _prewarmed.add(memory_path)
 
-    for f_num, d in search_dirs:
-        for md_file in d.rglob("*.md"):
+    def warm() -> None:
+        with metrics.timer("startup.prewarm"):
             try:
-                content = md_file.read_text(encoding="utf-8", errors="ignore")
-                if query_lower in content.lower():
-                    # Extract first matching line as snippet
-                    snippet = ""
-                    for line in content.splitlines():
-                        if query_lower in line.lower():
-                            snippet = line.strip()[:200]
-                            break
-                    results.append({
-                        "path": str(md_file.relative_to(memory_path)),
-                        "floor": f_num,
-                        "floor_name": FLOOR_NAMES[f_num],
-                        "snippet": snippet,
-                    })
-            except Exception:
+                get_index(memory_path)
+                for f_num in FLOOR_DIRS:
+                    list_floor(memory_path, f_num)
+            except Exception as e:
+                print(f"aurelion-memory: prewarm failed: {e}", file=sys.stderr)
+
+    thread = threading.Thread(target=warm, name="aurelion-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def _prewarm_from_env() -> None:
+    try:
+        prewarm(get_memory_path())
+    except (EnvironmentError, FileNotFoundError, ValueError):
+        pass
+
+
+def sync_store(memory_path: Path) -> None:
+    """Commit queued writes and pick up outside edits before reading the store.
+
+    Changes reported by the store catalog's journal (inotify where available,
+    otherwise a rate-limited stat diff) are published like committed writes,
+    so the cache and the search index stay current without rescans.
+    """
+    flush_writes(memory_path)
+    catalog = get_catalog(memory_path)
+    found = catalog.refresh()
+    if catalog.dirty:
+        saver.schedule(catalog)
+    if found:
+        changes.publish([
+            ChangeEvent(memory_path, c.path, memory_path / c.path, c.kind) for c in found
+        ])
+
+
+def _catalog_on_changes(events: list[ChangeEvent]) -> None:
+    """Record committed writes in the catalog (and its journal baseline) right away."""
+    by_store: dict[Path, list[str]] = {}
+    for event in events:
+        by_store.setdefault(event.memory_path, []).append(event.doc_path)
+    for memory_path, paths in by_store.items():
+        catalog = get_catalog(memory_path)
+        if catalog.check(paths):
+            saver.schedule(catalog)
+
+
+changes.subscribe(_catalog_on_changes)
+
+
+def _semantic_on_changes(events: list[ChangeEvent]) -> None:
+    """Re-embed changed documents in already-open semantic indexes."""
+    touched = set()
+    for event in events:
+        index = loaded_semantic_index(event.memory_path)
+        if index is None:
+            continue
+        if event.kind == "deleted":
+            index.remove_document(event.doc_path)
+        else:
+            floor = floor_of(event.doc_path)
+            if floor is None:
                 continue
+            index.update_document(event.doc_path, floor)
+        touched.add(index)
+    for index in touched:
+        saver.schedule(index)
+
+
+changes.subscribe(_semantic_on_changes)
+
+
+def iter_search(
+    memory_path: Path,
+    query: str,
+    floor: int | None = None,
+    cancel: threading.Event | None = None,
+    skip: int = 0,
+    mode: str = "substring",
+) -> Iterator[dict]:
+    """Lazily yield search matches in (floor, path) order, skipping the first ``skip``.
 
+    Answered from the persistent inverted index; queries it cannot resolve
+    (no word characters, or spanning lines) fall back to a full scan. With
+    ``mode="query"`` the query is compiled as a boolean query (see ``query``);
+    malformed ones raise QuerySyntaxError.
+    """
+    sync_store(memory_path)
+    if mode == "query":
+        plan = compile_query(query)
+        catalog = get_catalog(memory_path)
+        plan.resolve_tags(lambda tag: _tag_paths(catalog, tag))
+        return get_index(memory_path).iter_plan(plan, floor, cancel, skip)
+    matches = get_index(memory_path).iter_matches(query, floor, cancel, skip)
+    if matches is None:
+        matches = islice(iter_scan(memory_path, query, floor, cancel), skip, None)
+    return matches
+
+
+def _tag_paths(catalog, tag: str) -> set[str]:
+    """Paths of documents with a front-matter tag containing ``tag``."""
+    return {
+        entry.path
+        for key in catalog.tags()
+        if tag in key
+        for entry in catalog.files_with_tag(key)
+    }
+
+
+def encode_cursor(query: str, floor: int | None, offset: int, mode: str = "substring") -> str:
+    """Opaque continuation token for the page starting at ``offset``."""
+    data = {"q": query, "f": floor, "o": offset}
+    if mode != "substring":
+        data["m"] = mode
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, query: str, floor: int | None, mode: str = "substring") -> int:
+    """Offset stored in a continuation token; raises ValueError if it is not for this query."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset = int(data["o"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if (
+        data.get("q") != query
+        or data.get("f") != floor
+        or data.get("m", "substring") != mode
+        or offset < 0
+    ):
+        raise ValueError("Cursor does not belong to this query")
+    return offset
+
+
+def search_page(
+    memory_path: Path,
+    query: str,
+    floor: int | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    cursor: str | None = None,
+    max_bytes: int | None = None,
+    cancel: threading.Event | None = None,
+    mode: str = "substring",
+) -> dict:
+    """One page of search results plus a continuation token for the next page.
+
+    The search stops as soon as the page is full: at most ``limit`` results,
+    and no more than ``max_bytes`` of encoded results (at least one result is
+    always returned so paging makes progress).
+    """
+    if cursor:
+        try:
+            offset = decode_cursor(cursor, query, floor, mode)
+        except ValueError as e:
+            return {"error": str(e)}
+
+    results = []
+    used = 0
+    more = False
+    for item in iter_search(memory_path, query, floor, cancel, skip=offset, mode=mode):
+        size = len(result_encoder.dumps(item))
+        if (limit is not None and len(results) >= limit) or (
+            max_bytes is not None and results and used + size > max_bytes
+        ):
+            more = True
+            break
+        results.append(item)
+        used += size
+
+    next_offset = offset + len(results)
+    return {
+        "results": results,
+        "offset": offset,
+        "next_cursor": encode_cursor(query, floor, next_offset, mode) if more else None,
+    }
+
+
+def search_files(
+    memory_path: Path,
+    query: str,
+    floor: int | None = None,
+    cancel: threading.Event | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    max_bytes: int | None = None,
+    mode: str = "substring",
+) -> list[dict]:
+    """Full-text search across markdown files in the memory store.
+
+    With no ``limit``/``max_bytes`` every match is returned; otherwise only
+    the requested page is computed (see ``search_page``).
+    Setting ``cancel`` stops the search early with partial results.
+    """
+    if limit is None and max_bytes is None:
+        return list(iter_search(memory_path, query, floor, cancel, skip=offset, mode=mode))
+    return search_page(
+        memory_path, query, floor, limit=limit, offset=offset,
+        max_bytes=max_bytes, cancel=cancel, mode=mode,
+    )["results"]
+
+
+def rank_search(
+    memory_path: Path,
+    query: str,
+    floor: int | None = None,
+    limit: int = 10,
+) -> list[dict]:
+    """Top ``limit`` documents for the query's terms ranked by BM25, best first."""
+    sync_store(memory_path)
+    return get_index(memory_path).rank(query, floor, limit)
+
+
+def semantic_search(
+    memory_path: Path,
+    query: str,
+    floor: int | None = None,
+    limit: int = 10,
+) -> list[dict]:
+    """Top ``limit`` documents closest in meaning to the query, best first.
+
+    Answered from the store's local vector index, which needs no network and
+    matches paraphrases that substring search misses. Each hit names its
+    best-matching section.
+    """
+    sync_store(memory_path)
+    index = get_semantic_index(memory_path)
+    with metrics.timer("phase.semantic_sync"):
+        if index.sync(get_catalog(memory_path).stamps()):
+            saver.schedule(index)
+    with metrics.timer("phase.match"):
+        hits = index.search(query, limit, floor)
+    results = []
+    for hit in hits:
+        try:
+            snippet = _section_snippet(memory_path / hit["path"], hit["line"])
+        except OSError:
+            continue
+        results.append({
+            "path": hit["path"],
+            "floor": hit["floor"],
+            "floor_name": FLOOR_NAMES[hit["floor"]],
+            "score": hit["score"],
+            "section": hit["section"],
+            "snippet": snippet,
+        })
     return results
 
 
-def read_document(memory_path: Path, doc_path: str) -> dict:
-    """Read a specific document from the memory store."""
+def _section_snippet(full_path: Path, line: int) -> str:
+    """First body line of the section starting at 0-based ``line``."""
+    lines = read_lines(full_path, line + 1, line + 8)["content"].splitlines()
+    for text in lines:
+        text = text.strip()
+        if text and not text.startswith("#"):
+            return text[:200]
+    return lines[0].strip()[:200] if lines else ""
+
+
+def federated_search(
+    stores: dict[str, Path],
+    query: str,
+    floor: int | None = None,
+    limit: int = 10,
+    mode: str = "ranked",
+) -> dict:
+    """Search several stores concurrently and merge their top hits by score.
+
+    Each store answers from its own index (BM25 for ``ranked``, cosine
+    similarity for ``semantic``); every hit keeps its store's score and
+    name. A store that fails reports an error instead of sinking the query.
+    """
+    search = semantic_search if mode == "semantic" else rank_search
+
+    def one(item: tuple[str, Path]) -> tuple[str, list[dict] | str]:
+        name, memory_path = item
+        try:
+            with metrics.timer(f"store.{name}"):
+                return name, search(memory_path, query, floor, limit)
+        except Exception as e:
+            return name, str(e)
+
+    merged = []
+    errors = {}
+    for order, (name, hits) in enumerate(map_batch(one, stores.items())):
+        if isinstance(hits, str):
+            errors[name] = hits
+            continue
+        for rank, hit in enumerate(hits):
+            merged.append((-hit["score"], order, rank, {"store": name, **hit}))
+    merged.sort(key=lambda item: item[:3])
+    result: dict = {"results": [hit for *_, hit in merged[:limit]]}
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def search_many(
+    memory_path: Path,
+    queries: list[str],
+    floor: int | None = None,
+    limit: int | None = None,
+    cancel: threading.Event | None = None,
+) -> list[dict]:
+    """Run several searches at once; one ``{query, results}`` entry per query, in order.
+
+    Index-answerable queries run concurrently against the shared index and
+    document cache. The rest share a single scan that reads each document once.
+    """
+    sync_store(memory_path)
+    index = get_index(memory_path)
+    unique = list(dict.fromkeys(queries))
+
+    def lookup(query: str) -> list[dict] | None:
+        matches = index.iter_matches(query, floor, cancel)
+        return None if matches is None else list(islice(matches, limit))
+
+    found: dict[str, list[dict]] = {}
+    to_scan = []
+    for query, results in zip(unique, map_batch(lookup, unique)):
+        if results is None:
+            to_scan.append(query)
+        else:
+            found[query] = results
+    if to_scan:
+        found.update(zip(to_scan, scan_many(memory_path, to_scan, floor, cancel, limit)))
+    return [{"query": query, "results": found[query]} for query in queries]
+
+
+def read_document(
+    memory_path: Path,
+    doc_path: str,
+    offset: int | None = None,
+    length: int | None = None,
+    start_line: int | None = None,
+    end_line: int | None = None,
+) -> dict:
+    """Read a specific document from the memory store.
+
+    ``offset``/``length`` select a byte range and ``start_line``/``end_line``
+    a 1-based inclusive line range; either way only that slice is read.
+    """
+    sync_store(memory_path)
     full_path = memory_path / doc_path
     if not full_path.exists():
         return {"error": f"Document not found: {doc_path}"}
     try:
-        content = full_path.read_text(encoding="utf-8", errors="ignore")
+        if offset is not None or length is not None:
+            return {"path": doc_path, **read_range(full_path, offset or 0, length)}
+        if start_line is not None or end_line is not None:
+            return {"path": doc_path, **read_lines(full_path, start_line or 1, end_line)}
+        content = document_cache.read_text(full_path)
         return {
             "path": doc_path,
             "content": content,
@@ -134,8 +449,24 @@ def read_document(memory_path: Path, doc_path: str) -> dict:
         return {"error": str(e)}
 
 
+def read_many(memory_path: Path, doc_paths: list[str]) -> list[dict]:
+    """Read several documents concurrently; one result (or error) per path, in order."""
+    def read(doc_path: str) -> dict:
+        result = read_document(memory_path, doc_path)
+        return {"path": doc_path, **result} if "error" in result else result
+
+    return map_batch(read, doc_paths)
+
+
 def write_document(memory_path: Path, doc_path: str, content: str, floor: int) -> dict:
-    """Write or update a document in the memory store."""
+    """Write or update a document in the memory store.
+
+    The write is queued on the store's write pipeline and committed
+    atomically within a few milliseconds; the read functions below flush
+    it first, so they always see the new content. Content and target are
+    checked before queueing, so anything that would fail to commit is
+    reported here rather than only in the pipeline's error counters.
+    """
     dir_name = FLOOR_DIRS.get(floor)
     if not dir_name:
         return {"error": f"Invalid floor number: {floor}. Use 1–5."}
@@ -145,10 +476,15 @@ def write_document(memory_path: Path, doc_path: str, content: str, floor: int) -
         doc_path = f"{dir_name}/{doc_path.lstrip('/')}"
 
     full_path = memory_path / doc_path
-    full_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        full_path.write_text(content, encoding="utf-8")
+        content.encode("utf-8")
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        if full_path.is_dir():
+            return {"error": f"Cannot write {doc_path}: it is a directory"}
+        if not os.access(full_path.parent, os.W_OK):
+            return {"error": f"Cannot write {doc_path}: directory is not writable"}
+        get_writer(memory_path).submit(doc_path, content)
         return {
             "written": doc_path,
             "floor": floor,
@@ -160,67 +496,214 @@ def write_document(memory_path: Path, doc_path: str, content: str, floor: int) -
 
 
 def list_floor(memory_path: Path, floor: int) -> dict:
-    """List all documents on a given floor."""
+    """List all documents on a given floor, from the store catalog."""
+    sync_store(memory_path)
     dir_name = FLOOR_DIRS.get(floor)
     if not dir_name:
         return {"error": f"Invalid floor: {floor}"}
     d = memory_path / dir_name
     if not d.exists():
         return {"floor": floor, "floor_name": FLOOR_NAMES[floor], "documents": [], "note": "Floor directory does not exist yet"}
-    docs = [str(f.relative_to(memory_path)) for f in d.rglob("*.md")]
+    entries = get_catalog(memory_path).files_on_floor(floor)
     return {
         "floor": floor,
         "floor_name": FLOOR_NAMES[floor],
-        "document_count": len(docs),
-        "documents": sorted(docs),
+        "document_count": len(entries),
+        "documents": [e.path for e in entries],
+        "tags": sorted({tag for e in entries for tag in e.tags}),
     }
 
 
 def load_session_context(memory_path: Path) -> dict:
-    """Load active session context: handoff note + current Floor 5 goals."""
-    context = {"handoff": None, "goals": [], "active_projects": []}
-
-    # Load latest handoff from Floor 4
-    f4 = memory_path / FLOOR_DIRS[4]
-    if f4.exists():
-        handoffs = sorted(f4.glob("*handoff*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
-        sessions = sorted(f4.glob("*session*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
-        candidates = handoffs or sessions
-        if candidates:
-            try:
-                content = candidates[0].read_text(encoding="utf-8", errors="ignore")
-                context["handoff"] = {
-                    "path": str(candidates[0].relative_to(memory_path)),
-                    "preview": content[:800],
-                }
-            except Exception:
-                pass
+    """Load active session context: handoff note + current Floor 5 goals.
+
+    Served from the store's session index: the newest Floor 4 handoff (or
+    session) note comes off a recency heap and the rendered previews are
+    reused until a relevant document changes.
+    """
+    sync_store(memory_path)
+    return get_session_index(memory_path).context()
+
+
+# ─── Tool Dispatch ────────────────────────────────────────────────────────────
+
+def encode_result(result: Any) -> str:
+    """JSON-encode a tool result (compact, size-capped), timing the encode phase."""
+    with metrics.timer("phase.json_encode"):
+        text = result_encoder.encode(result)
+    metrics.add("responses.chars", len(text))
+    return text
 
-    # Load goal files from Floor 5
-    f5 = memory_path / FLOOR_DIRS[5]
-    if f5.exists():
-        for goal_file in sorted(f5.glob("*.md"))[:5]:
-            try:
-                content = goal_file.read_text(encoding="utf-8", errors="ignore")
-                first_lines = "\n".join(content.splitlines()[:6])
-                context["goals"].append({
-                    "path": str(goal_file.relative_to(memory_path)),
-                    "preview": first_lines,
-                })
-            except Exception:
-                continue
 
-    return context
+def server_stats(memory_path: Path) -> dict:
+    """Latency histograms, counters and cache/index occupancy for memory_stats."""
+    snapshot = metrics.snapshot()
+    snapshot["document_cache"] = document_cache.stats(memory_path)
+    snapshot["index"] = {"documents": len(get_index(memory_path))}
+    snapshot["writes"] = get_writer(memory_path).stats()
+    snapshot["session"] = get_session_index(memory_path).stats()
+    snapshot["encoding"] = result_encoder.stats()
+    snapshot["result_cache"] = result_cache.stats()
+    registry = get_registry()
+    if registry.federated:
+        snapshot["stores"] = registry.describe()
+    return snapshot
+
+
+def call_tool(
+    memory_path: Path,
+    name: str,
+    arguments: dict[str, Any],
+    cancel: threading.Event | None = None,
+) -> str:
+    """Run a tool synchronously and return its text response. Called on a worker thread.
+
+    Search and listing tools are answered from the result cache while the
+    stores they read are unchanged.
+    """
+    if name not in CACHED_TOOLS or not result_cache.max_bytes:
+        return _run_tool(memory_path, name, arguments, cancel)
+    roots = [memory_path]
+    if name == "memory_federated_search":
+        registry = get_registry()
+        try:
+            roots = [registry.resolve(n) for n in dict.fromkeys(arguments.get("stores") or registry.names())]
+        except (ValueError, FileNotFoundError):
+            return _run_tool(memory_path, name, arguments, cancel)
+    for root in roots:
+        sync_store(root)
+    return cached_response(
+        name, arguments, roots, lambda: _run_tool(memory_path, name, arguments, cancel), cancel
+    )
+
+
+def _run_tool(
+    memory_path: Path,
+    name: str,
+    arguments: dict[str, Any],
+    cancel: threading.Event | None = None,
+) -> str:
+    if name == "memory_search":
+        query = arguments["query"]
+        floor = arguments.get("floor")
+        mode = arguments.get("mode") or "substring"
+        if mode == "ranked":
+            results = rank_search(memory_path, query, floor, arguments.get("limit") or 10)
+            metrics.add("results.memory_search", len(results))
+            return encode_result(results) if results else f'No documents found matching "{query}".'
+        paging = ("limit", "offset", "cursor", "max_bytes")
+        try:
+            if any(arguments.get(k) is not None for k in paging):
+                page = search_page(
+                    memory_path,
+                    query,
+                    floor,
+                    limit=arguments.get("limit"),
+                    offset=arguments.get("offset") or 0,
+                    cursor=arguments.get("cursor"),
+                    max_bytes=arguments.get("max_bytes"),
+                    cancel=cancel,
+                    mode=mode,
+                )
+                metrics.add("results.memory_search", len(page.get("results", ())))
+                return encode_result(page)
+            results = search_files(memory_path, query, floor, cancel=cancel, mode=mode)
+        except QuerySyntaxError as e:
+            return encode_result({"error": str(e)})
+        metrics.add("results.memory_search", len(results))
+        return encode_result(results) if results else f'No documents found matching "{query}".'
+
+    elif name == "memory_semantic_search":
+        query = arguments["query"]
+        results = semantic_search(
+            memory_path, query, arguments.get("floor"), arguments.get("limit") or 10
+        )
+        metrics.add("results.memory_semantic_search", len(results))
+        return encode_result(results) if results else f'No documents found related to "{query}".'
+
+    elif name == "memory_federated_search":
+        registry = get_registry()
+        names = arguments.get("stores") or registry.names()
+        try:
+            stores = {n: registry.resolve(n) for n in dict.fromkeys(names)}
+        except (ValueError, FileNotFoundError) as e:
+            return encode_result({"error": str(e)})
+        result = federated_search(
+            stores,
+            arguments["query"],
+            arguments.get("floor"),
+            arguments.get("limit") or 10,
+            arguments.get("mode") or "ranked",
+        )
+        metrics.add("results.memory_federated_search", len(result["results"]))
+        return encode_result(result)
+
+    elif name == "memory_read":
+        result = read_document(
+            memory_path,
+            arguments["path"],
+            offset=arguments.get("offset"),
+            length=arguments.get("length"),
+            start_line=arguments.get("start_line"),
+            end_line=arguments.get("end_line"),
+        )
+        return encode_result(result)
+
+    elif name == "memory_search_many":
+        queries = arguments["queries"]
+        if len(queries) > MAX_BATCH:
+            return encode_result({"error": f"At most {MAX_BATCH} queries per call."})
+        results = search_many(
+            memory_path, queries, arguments.get("floor"), arguments.get("limit"), cancel=cancel
+        )
+        metrics.add("results.memory_search_many", sum(len(r["results"]) for r in results))
+        return encode_result(results)
+
+    elif name == "memory_read_many":
+        paths = arguments["paths"]
+        if len(paths) > MAX_BATCH:
+            return encode_result({"error": f"At most {MAX_BATCH} paths per call."})
+        return encode_result(read_many(memory_path, paths))
+
+    elif name == "memory_write":
+        result = write_document(
+            memory_path,
+            arguments["path"],
+            arguments["content"],
+            arguments["floor"],
+        )
+        return encode_result(result)
+
+    elif name == "memory_floor":
+        result = list_floor(memory_path, arguments["floor"])
+        metrics.add("results.memory_floor", result.get("document_count", 0))
+        return encode_result(result)
+
+    elif name == "memory_session":
+        result = load_session_context(memory_path)
+        return encode_result(result)
+
+    elif name == "memory_stats":
+        return encode_result(server_stats(memory_path))
+
+    else:
+        return f"Unknown tool: {name}"
 
 
 # ─── MCP Server Definition ────────────────────────────────────────────────────
 
 def build_server() -> "Server":
+    import mcp.types as types
+    from mcp.server import Server
+
     server = Server("aurelion-memory")
 
     @server.list_tools()
     async def handle_list_tools() -> list[types.Tool]:
-        return [
+        # tools/list follows the initialize handshake, so warm up now rather
+        # than delaying the server's first response
+        _prewarm_from_env()
+        tools = [
             types.Tool(
                 name="memory_search",
                 description=(
@@ -238,24 +721,154 @@ def build_server() -> "Server":
                             "minimum": 1,
                             "maximum": 5,
                         },
+                        "mode": {
+                            "type": "string",
+                            "enum": ["substring", "ranked", "query"],
+                            "description": (
+                                "substring (default): every document containing the exact text, in floor order. "
+                                "ranked: best matches for the query's words by BM25 relevance. "
+                                'query: boolean query, e.g. career AND (promotion OR raise) NOT draft, '
+                                '"exact phrase", /^## regex$/, floor:4, tag:strategy; in floor order.'
+                            ),
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": (
+                                "Maximum results to return. Enables paged output with a next_cursor "
+                                "in substring mode; defaults to 10 in ranked mode."
+                            ),
+                            "minimum": 1,
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Number of matches to skip.",
+                            "minimum": 0,
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor from a previous page of the same query.",
+                        },
+                        "max_bytes": {
+                            "type": "integer",
+                            "description": "Stop adding results once the page reaches this many bytes.",
+                            "minimum": 1,
+                        },
                     },
                     "required": ["query"],
                 },
             ),
             types.Tool(
                 name="memory_read",
-                description="Read the full content of a specific document in the memory store.",
+                description=(
+                    "Read a document from the memory store: the full content, "
+                    "a byte range (offset/length) or a line range (start_line/end_line)."
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "path": {
                             "type": "string",
                             "description": "Relative path to the document, e.g. Floor_01_Foundation/career-master.md",
-                        }
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Byte offset to start reading at; page with the returned next_offset",
+                        },
+                        "length": {
+                            "type": "integer",
+                            "description": "Maximum number of bytes to read (default: to end of file)",
+                        },
+                        "start_line": {
+                            "type": "integer",
+                            "description": "First line to read (1-based)",
+                        },
+                        "end_line": {
+                            "type": "integer",
+                            "description": "Last line to read, inclusive (default: end of file)",
+                        },
                     },
                     "required": ["path"],
                 },
             ),
+            types.Tool(
+                name="memory_semantic_search",
+                description=(
+                    "Search the memory store by meaning rather than exact wording. "
+                    "Finds documents that paraphrase the query; runs locally, no network. "
+                    "Returns documents best first with a score and their best-matching section."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": "Free-text description of what you are looking for",
+                        },
+                        "floor": {
+                            "type": "integer",
+                            "description": "Floor 1–5 to scope search. Omit for all floors.",
+                            "minimum": 1,
+                            "maximum": 5,
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Number of documents to return (default 10)",
+                            "minimum": 1,
+                            "maximum": MAX_BATCH,
+                        },
+                    },
+                    "required": ["query"],
+                },
+            ),
+            types.Tool(
+                name="memory_search_many",
+                description=(
+                    "Run several substring searches in one call. Returns one "
+                    "{query, results} entry per query, in order."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "queries": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "maxItems": MAX_BATCH,
+                            "description": "Search terms or phrases",
+                        },
+                        "floor": {
+                            "type": "integer",
+                            "description": "Floor 1–5 to scope every search. Omit for all floors.",
+                            "minimum": 1,
+                            "maximum": 5,
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum results per query",
+                            "minimum": 1,
+                        },
+                    },
+                    "required": ["queries"],
+                },
+            ),
+            types.Tool(
+                name="memory_read_many",
+                description=(
+                    "Read several documents in one call. Returns one result per "
+                    "path, in order; missing documents get an error entry."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "paths": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "maxItems": MAX_BATCH,
+                            "description": "Relative paths to the documents",
+                        },
+                    },
+                    "required": ["paths"],
+                },
+            ),
             types.Tool(
                 name="memory_write",
                 description=(
@@ -305,44 +918,80 @@ def build_server() -> "Server":
                     "required": [],
                 },
             ),
+            types.Tool(
+                name="memory_stats",
+                description=(
+                    "Server performance statistics: per-tool and per-phase latency "
+                    "percentiles, bytes read, result counts and cache hit rates."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                    "required": [],
+                },
+            ),
         ]
+        registry = get_registry()
+        if registry.federated:
+            store_names = registry.names()
+            for tool in tools:
+                tool.inputSchema["properties"]["store"] = {
+                    "type": "string",
+                    "enum": store_names,
+                    "description": f"Memory store to use (default: {registry.default})",
+                }
+            tools.append(types.Tool(
+                name="memory_federated_search",
+                description=(
+                    "Search several memory stores at once. Returns the best hits "
+                    "across stores, each tagged with its store and that store's score."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "Search query"},
+                        "stores": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": store_names},
+                            "description": "Stores to search (default: all mounted stores)",
+                        },
+                        "floor": {
+                            "type": "integer",
+                            "description": "Floor 1–5 to scope search. Omit for all floors.",
+                            "minimum": 1,
+                            "maximum": 5,
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Number of merged results (default 10)",
+                            "minimum": 1,
+                            "maximum": MAX_BATCH,
+                        },
+                        "mode": {
+                            "type": "string",
+                            "enum": ["ranked", "semantic"],
+                            "description": "ranked: BM25 over query terms (default); semantic: by meaning",
+                        },
+                    },
+                    "required": ["query"],
+                },
+            ))
+        return tools
+
+    runner = ToolRunner()
 
     @server.call_tool()
     async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
-        memory_path = get_memory_path()
-
-        if name == "memory_search":
-            query = arguments["query"]
-            floor = arguments.get("floor")
-            results = search_files(memory_path, query, floor)
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(results, indent=2) if results else f'No documents found matching "{query}".',
-            )]
-
-        elif name == "memory_read":
-            result = read_document(memory_path, arguments["path"])
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-        elif name == "memory_write":
-            result = write_document(
-                memory_path,
-                arguments["path"],
-                arguments["content"],
-                arguments["floor"],
-            )
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-        elif name == "memory_floor":
-            result = list_floor(memory_path, arguments["floor"])
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-        elif name == "memory_session":
-            result = load_session_context(memory_path)
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-        else:
-            return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
+        store = arguments.pop("store", None)
+        memory_path = get_memory_path(store)
+        prewarm(memory_path)
+        # Per-store limits only matter once several stores share the pool
+        limit_key = None
+        if get_registry().federated and name != "memory_federated_search":
+            limit_key = store or get_registry().default
+        with metrics.timer(f"tool.{name}"):
+            text = await runner.run(name, call_tool, memory_path, name, arguments, store=limit_key)
+        return [types.TextContent(type="text", text=text)]
 
     return server
 
@@ -350,13 +999,18 @@ def build_server() -> "Server":
 # ─── Entry Point ──────────────────────────────────────────────────────────────
 
 async def main() -> None:
-    if not MCP_AVAILABLE:
+    try:
+        import mcp.server.stdio
+        from mcp.server import NotificationOptions
+        from mcp.server.models import InitializationOptions
+    except ImportError:
         print(
             "ERROR: MCP SDK not installed. Run: pip install mcp",
             file=sys.stderr,
         )
         sys.exit(1)
 
+    start_stats_dump()
     server = build_server()
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
         await server.run(
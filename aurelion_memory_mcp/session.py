@@ -0,0 +1,222 @@
+"""
+Constant-time session context for memory_session.
+
+Handoff and session notes at the top of Floor 4 are kept in recency heaps
+ordered by mtime, and Floor 5 goal files in a sorted list, all seeded once
+from the store catalog. Change events only mark paths dirty; a load re-stats
+those paths and nothing else, so restoring a session does not slow down as
+the handoff history grows. The rendered context is cached and rebuilt only
+when the selection changes or a document it shows is modified.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import os
+import threading
+from pathlib import Path
+
+from aurelion_memory_lite.catalog import get_catalog
+
+from .cache import document_cache
+from .floors import FLOOR_DIRS
+from .stats import metrics
+from .writes import ChangeEvent, changes
+
+HANDOFF_FLOOR = 4
+GOALS_FLOOR = 5
+HANDOFF_PREVIEW_CHARS = 800
+GOAL_PREVIEW_LINES = 6
+MAX_GOALS = 5
+
+
+class RecencyHeap:
+    """Newest-first set of paths keyed by mtime, with lazy deletion."""
+
+    def __init__(self):
+        self._mtimes: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._mtimes)
+
+    def set(self, path: str, mtime_ns: int) -> None:
+        if self._mtimes.get(path) == mtime_ns:
+            return
+        self._mtimes[path] = mtime_ns
+        heapq.heappush(self._heap, (-mtime_ns, path))
+        if len(self._heap) > 2 * len(self._mtimes) + 64:
+            # Superseded entries outnumber live ones; rebuild to bound memory
+            self._heap = [(-m, p) for p, m in self._mtimes.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, path: str) -> None:
+        self._mtimes.pop(path, None)
+
+    def newest(self) -> str | None:
+        heap = self._heap
+        while heap:
+            neg_mtime, path = heap[0]
+            if self._mtimes.get(path) == -neg_mtime:
+                return path
+            heapq.heappop(heap)
+        return None
+
+
+def _top_level_name(doc_path: str, floor: int) -> str | None:
+    """File name of a document directly inside a floor directory, else None."""
+    folder, _, name = doc_path.partition("/")
+    if folder != FLOOR_DIRS[floor] or not name.endswith(".md") or "/" in name:
+        return None
+    return name
+
+
+class SessionIndex:
+    """Recency-ordered Floor 4 notes, sorted Floor 5 goals and the rendered context."""
+
+    def __init__(self, memory_path: Path):
+        self.memory_path = memory_path
+        self._handoffs = RecencyHeap()
+        self._sessions = RecencyHeap()
+        self._goals: list[str] = []
+        self._dirty: set[str] = set()
+        self._seeded = False
+        self._context: dict | None = None
+        self._lock = threading.Lock()
+
+    def mark_dirty(self, doc_paths: list[str]) -> None:
+        """Note changed documents; they are re-stat'ed on the next load."""
+        with self._lock:
+            # Before seeding, the catalog already holds everything
+            if self._seeded:
+                self._dirty.update(doc_paths)
+
+    def context(self) -> dict:
+        """Handoff preview and goal previews, rendered at most once per relevant change."""
+        with self._lock:
+            if not self._seeded:
+                self._seed()
+            if self._dirty:
+                self._apply_dirty()
+            if self._context is None:
+                self._context = self._render()
+                metrics.add("session.renders")
+            else:
+                metrics.add("session.hits")
+            context = self._context
+        return {
+            "handoff": dict(context["handoff"]) if context["handoff"] else None,
+            "goals": [dict(g) for g in context["goals"]],
+            "active_projects": list(context["active_projects"]),
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "handoffs": len(self._handoffs),
+                "sessions": len(self._sessions),
+                "goals": len(self._goals),
+                "cached": self._context is not None,
+            }
+
+    # ─── Internals ───────────────────────────────────────────────────────────
+
+    def _selection(self) -> tuple[str | None, list[str]]:
+        return self._handoffs.newest() or self._sessions.newest(), self._goals[:MAX_GOALS]
+
+    def _seed(self) -> None:
+        catalog = get_catalog(self.memory_path)
+        for entry in catalog.files_on_floor(HANDOFF_FLOOR):
+            self._track_note(entry.path, entry.mtime_ns)
+        for entry in catalog.files_on_floor(GOALS_FLOOR):
+            if _top_level_name(entry.path, GOALS_FLOOR):
+                self._goals.append(entry.path)
+        self._goals.sort()
+        self._seeded = True
+
+    def _track_note(self, doc_path: str, mtime_ns: int | None) -> None:
+        """Add, move or (with ``mtime_ns=None``) drop a Floor 4 note."""
+        name = _top_level_name(doc_path, HANDOFF_FLOOR)
+        if name is None:
+            return
+        for marker, heap in (("handoff", self._handoffs), ("session", self._sessions)):
+            if mtime_ns is not None and marker in name:
+                heap.set(doc_path, mtime_ns)
+            else:
+                heap.discard(doc_path)
+
+    def _track_goal(self, doc_path: str, exists: bool) -> None:
+        if _top_level_name(doc_path, GOALS_FLOOR) is None:
+            return
+        i = bisect.bisect_left(self._goals, doc_path)
+        present = i < len(self._goals) and self._goals[i] == doc_path
+        if exists and not present:
+            self._goals.insert(i, doc_path)
+        elif not exists and present:
+            del self._goals[i]
+
+    def _apply_dirty(self) -> None:
+        before = self._selection()
+        shown = {before[0], *before[1]}
+        touched = False
+        for doc_path in self._dirty:
+            try:
+                mtime_ns = os.stat(self.memory_path / doc_path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            self._track_note(doc_path, mtime_ns)
+            self._track_goal(doc_path, mtime_ns is not None)
+            touched = touched or doc_path in shown
+        self._dirty.clear()
+        if touched or self._selection() != before:
+            self._context = None
+
+    def _render(self) -> dict:
+        handoff_path, goal_paths = self._selection()
+        context: dict = {"handoff": None, "goals": [], "active_projects": []}
+        if handoff_path is not None:
+            try:
+                content = document_cache.read_text(self.memory_path / handoff_path)
+                context["handoff"] = {
+                    "path": handoff_path,
+                    "preview": content[:HANDOFF_PREVIEW_CHARS],
+                }
+            except Exception:
+                pass
+        for goal_path in goal_paths:
+            try:
+                content = document_cache.read_text(self.memory_path / goal_path)
+            except Exception:
+                continue
+            context["goals"].append({
+                "path": goal_path,
+                "preview": "\n".join(content.splitlines()[:GOAL_PREVIEW_LINES]),
+            })
+        return context
+
+
+_indexes: dict[Path, SessionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_session_index(memory_path: Path) -> SessionIndex:
+    """Process-wide session index for a memory store, created on first use."""
+    with _indexes_lock:
+        index = _indexes.get(memory_path)
+        if index is None:
+            index = _indexes[memory_path] = SessionIndex(memory_path)
+        return index
+
+
+def _on_changes(events: list[ChangeEvent]) -> None:
+    by_store: dict[Path, list[str]] = {}
+    for event in events:
+        by_store.setdefault(event.memory_path, []).append(event.doc_path)
+    with _indexes_lock:
+        targets = [(_indexes[p], paths) for p, paths in by_store.items() if p in _indexes]
+    for index, paths in targets:
+        index.mark_dirty(paths)
+
+
+changes.subscribe(_on_changes)
@@ -0,0 +1,144 @@
+"""
+Hot-path instrumentation for the MCP server.
+
+Latencies are recorded into HDR-style log-linear histograms (each power of
+two split into 16 sub-buckets, so any percentile is within ~6% of the true
+value) at a fixed memory cost per metric. Counters track bytes read and
+result counts. ``metrics.snapshot()`` backs the ``memory_stats`` tool, and
+AURELION_STATS_INTERVAL=<seconds> dumps it to stderr periodically.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _bucket(value: int) -> int:
+    """Histogram bucket for a non-negative integer value."""
+    if value < SUB_BUCKETS:
+        return value
+    exponent = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (exponent << SUB_BUCKET_BITS) + (value >> exponent)
+
+
+def _bucket_floor(bucket: int) -> int:
+    """Smallest value that falls into ``bucket``."""
+    if bucket < 2 * SUB_BUCKETS:
+        return bucket
+    exponent = (bucket >> SUB_BUCKET_BITS) - 1
+    return (SUB_BUCKETS + (bucket & (SUB_BUCKETS - 1))) << exponent
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations in microseconds."""
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, micros: int) -> None:
+        b = _bucket(micros)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    def percentile(self, pct: float) -> int:
+        if not self.count:
+            return 0
+        target = max(1, round(self.count * pct / 100.0))
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= target:
+                return min(_bucket_floor(b), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        summary = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count / 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max / 1000, 3),
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct:g}_ms"] = round(self.percentile(pct) / 1000, 3)
+        return summary
+
+
+class Metrics:
+    """Thread-safe registry of named latency histograms and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.counters: dict[str, int] = {}
+        self.started = time.time()
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.record(elapsed_ns // 1000)
+
+    def add(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "uptime_s": round(time.time() - self.started, 1),
+                "latency": {name: h.summary() for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+
+metrics = Metrics()
+
+
+def start_stats_dump(interval: float | None = None) -> threading.Thread | None:
+    """Print a metrics snapshot to stderr every ``interval`` seconds (AURELION_STATS_INTERVAL)."""
+    if interval is None:
+        try:
+            interval = float(os.environ.get("AURELION_STATS_INTERVAL", "") or 0)
+        except ValueError:
+            interval = 0
+    if interval <= 0:
+        return None
+
+    def dump() -> None:
+        while True:
+            time.sleep(interval)
+            print(json.dumps({"aurelion_stats": metrics.snapshot()}), file=sys.stderr, flush=True)
+
+    thread = threading.Thread(target=dump, name="aurelion-stats", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,109 @@
+"""
+Named memory stores served by one process.
+
+AURELION_STORES mounts several stores as ``name=path`` entries separated by
+``os.pathsep`` (``team-a=/srv/a:team-b=/srv/b`` on POSIX, ``;`` on Windows).
+AURELION_MEMORY_PATH, if set, is mounted as ``default``; otherwise the first
+listed store is the default. Tools take an optional ``store`` argument.
+
+Everything keyed by store root (search index, catalog, session and semantic
+indexes, pending writes) is already per store. On top of that each store
+gets its own slice of the document cache (AURELION_CACHE_BYTES split evenly,
+or AURELION_CACHE_BYTES_<NAME>) and its own concurrency limit in the tool
+runner, so a busy store cannot starve the others.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+from .cache import _budget_from_env, document_cache
+
+DEFAULT_STORE = "default"
+
+_NAME_RE = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+def _budget_for(name: str, share: int) -> int:
+    raw = os.environ.get("AURELION_CACHE_BYTES_" + re.sub(r"\W", "_", name).upper(), "")
+    try:
+        return max(0, int(raw)) if raw else share
+    except ValueError:
+        return share
+
+
+class StoreRegistry:
+    """Store name -> root path, with each store's cache partition mounted."""
+
+    def __init__(self, stores: dict[str, Path], default: str | None = None):
+        if not stores:
+            raise EnvironmentError(
+                "No memory store configured. Set AURELION_MEMORY_PATH to the root of "
+                "your AURELION memory store, or AURELION_STORES to name=path entries."
+            )
+        self.stores = dict(stores)
+        self.default = default if default in self.stores else next(iter(self.stores))
+        share = _budget_from_env() // len(self.stores)
+        self.budgets = {name: _budget_for(name, share) for name in self.stores}
+        for name, root in self.stores.items():
+            document_cache.mount(root, self.budgets[name])
+
+    @classmethod
+    def from_env(cls, memory_path: str = "", stores: str = "") -> "StoreRegistry":
+        """Parse AURELION_MEMORY_PATH and AURELION_STORES values."""
+        mounted: dict[str, Path] = {}
+        if memory_path:
+            mounted[DEFAULT_STORE] = Path(memory_path).expanduser().resolve()
+        for entry in filter(None, (e.strip() for e in stores.split(os.pathsep))):
+            name, sep, path = entry.partition("=")
+            name = name.strip()
+            if not sep or not path.strip() or not _NAME_RE.fullmatch(name):
+                raise EnvironmentError(f"Invalid AURELION_STORES entry (expected name=path): {entry}")
+            if name in mounted:
+                raise EnvironmentError(f"Store mounted twice: {name}")
+            mounted[name] = Path(path.strip()).expanduser().resolve()
+        return cls(mounted, DEFAULT_STORE if memory_path else None)
+
+    @property
+    def federated(self) -> bool:
+        return len(self.stores) > 1
+
+    def names(self) -> list[str]:
+        return list(self.stores)
+
+    def resolve(self, name: str | None = None) -> Path:
+        """Root of a store (the default one for ``None``); raises if unknown or missing."""
+        name = name or self.default
+        root = self.stores.get(name)
+        if root is None:
+            raise ValueError(f"Unknown store: {name}. Mounted stores: {', '.join(self.stores)}")
+        if not root.exists():
+            raise FileNotFoundError(f"Memory store {name!r} does not exist: {root}")
+        return root
+
+    def describe(self) -> list[dict]:
+        """One entry per mounted store, for memory_stats."""
+        return [
+            {
+                "store": name,
+                "path": str(root),
+                "default": name == self.default,
+                "cache_budget_bytes": self.budgets[name],
+                "cache_bytes": document_cache.stats(root)["bytes"],
+            }
+            for name, root in self.stores.items()
+        ]
+
+
+_registries: dict[tuple[str, str], StoreRegistry] = {}
+
+
+def get_registry() -> StoreRegistry:
+    """Registry for the current environment, parsed once per distinct configuration."""
+    key = (os.environ.get("AURELION_MEMORY_PATH", ""), os.environ.get("AURELION_STORES", ""))
+    registry = _registries.get(key)
+    if registry is None:
+        registry = _registries[key] = StoreRegistry.from_env(*key)
+    return registry
@@ -0,0 +1,146 @@
+"""
+Worker pool for blocking tool calls.
+
+Filesystem work runs on a bounded thread pool so a slow search never blocks
+the stdio event loop. Each tool has its own concurrency limit, and a request
+abandoned by the client sets a cancel event that long-running scans poll.
+When several stores are mounted, each also has a concurrency limit
+(AURELION_STORE_CONCURRENCY) so one store cannot occupy the whole pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Maximum concurrent calls per tool; tools not listed use DEFAULT_TOOL_LIMIT.
+TOOL_CONCURRENCY = {
+    "memory_search": 4,
+    "memory_read": 8,
+    "memory_write": 1,
+    "memory_floor": 4,
+    "memory_session": 2,
+    "memory_read_many": 4,
+    "memory_search_many": 2,
+    "memory_semantic_search": 2,
+}
+DEFAULT_TOOL_LIMIT = 4
+
+
+def _store_limit_from_env(max_workers: int) -> int:
+    # Default: half the pool, so one store's burst always leaves workers for the rest
+    raw = os.environ.get("AURELION_STORE_CONCURRENCY", "")
+    default = max(1, max_workers // 2)
+    try:
+        return max(1, int(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+def _workers_from_env() -> int:
+    raw = os.environ.get("AURELION_WORKERS", "")
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_WORKERS
+    except ValueError:
+        return DEFAULT_WORKERS
+
+
+class ToolRunner:
+    """Runs blocking tool functions on a shared pool under per-tool and per-store limits."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        limits: dict[str, int] | None = None,
+        store_limit: int | None = None,
+    ):
+        self.max_workers = max_workers or _workers_from_env()
+        self.limits = dict(TOOL_CONCURRENCY if limits is None else limits)
+        self.store_limit = store_limit or _store_limit_from_env(self.max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="aurelion-tool"
+        )
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._store_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, tool: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(tool)
+        if sem is None:
+            sem = self._semaphores[tool] = asyncio.Semaphore(
+                self.limits.get(tool, DEFAULT_TOOL_LIMIT)
+            )
+        return sem
+
+    def _store_semaphore(self, store: str) -> asyncio.Semaphore:
+        sem = self._store_semaphores.get(store)
+        if sem is None:
+            sem = self._store_semaphores[store] = asyncio.Semaphore(self.store_limit)
+        return sem
+
+    async def run(
+        self, tool: str, fn: Callable[..., Any], *args: Any, store: str | None = None
+    ) -> Any:
+        """Call ``fn(*args, cancel=event)`` on the pool.
+
+        ``store`` names the memory store the call works on; each store may
+        hold at most ``store_limit`` workers. If the awaiting task is
+        cancelled (the client abandoned the request), ``event`` is set so the
+        worker can stop at its next checkpoint.
+        """
+        cancel = threading.Event()
+        loop = asyncio.get_running_loop()
+        async with contextlib.AsyncExitStack() as limits:
+            if store is not None:
+                await limits.enter_async_context(self._store_semaphore(store))
+            await limits.enter_async_context(self._semaphore(tool))
+            future = loop.run_in_executor(
+                self._executor, functools.partial(fn, *args, cancel=cancel)
+            )
+            try:
+                return await future
+            except asyncio.CancelledError:
+                cancel.set()
+                raise
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Batch tools fan their items out to a separate pool: submitting to the tool
+# pool from one of its own workers could exhaust it and deadlock.
+_batch_pool: ThreadPoolExecutor | None = None
+_batch_pool_lock = threading.Lock()
+
+
+def _get_batch_pool() -> ThreadPoolExecutor:
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            _batch_pool = ThreadPoolExecutor(
+                max_workers=_workers_from_env(), thread_name_prefix="aurelion-batch"
+            )
+        return _batch_pool
+
+
+def map_batch(fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    """``[fn(item) for item in items]``, run concurrently, in input order."""
+    items = list(items)
+    if len(items) < 2:
+        return [fn(item) for item in items]
+    pool = _get_batch_pool()
+    futures = [pool.submit(fn, item) for item in items]
+    try:
+        return [future.result() for future in futures]
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,289 @@
+"""
+Write-behind pipeline for memory_write.
+
+Writes are queued per store and committed by a background flusher after a
+short window (AURELION_WRITE_DELAY_MS, default 25 ms; 0 writes inline). A
+burst of writes to the same document within the window collapses into one
+disk write. Each commit stages the content in a temp file beside the
+target, fsyncs it and renames it into place, so a crash leaves either the
+old or the new document, never a torn one. Directories are fsynced once per
+batch.
+
+Committed writes are published on ``changes``; the document cache and the
+search index subscribe to it to stay current.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from .stats import metrics
+
+DEFAULT_WRITE_DELAY_MS = 25
+
+
+def _delay_from_env() -> float:
+    raw = os.environ.get("AURELION_WRITE_DELAY_MS", "")
+    try:
+        return max(0.0, float(raw)) / 1000 if raw else DEFAULT_WRITE_DELAY_MS / 1000
+    except ValueError:
+        return DEFAULT_WRITE_DELAY_MS / 1000
+
+
+# ─── Change Events ────────────────────────────────────────────────────────────
+
+class ChangeEvent(NamedTuple):
+    """One document changed on disk."""
+    memory_path: Path
+    doc_path: str       # store-relative, forward slashes
+    full_path: Path
+    kind: str           # "added" | "modified" | "deleted"
+
+
+Subscriber = Callable[[list[ChangeEvent]], None]
+
+
+class ChangeBus:
+    """Fan-out of change batches to subscribers, in subscription order."""
+
+    def __init__(self):
+        self._subscribers: list[Subscriber] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, fn: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.append(fn)
+
+    def unsubscribe(self, fn: Subscriber) -> None:
+        with self._lock:
+            if fn in self._subscribers:
+                self._subscribers.remove(fn)
+
+    def publish(self, events: list[ChangeEvent]) -> None:
+        if not events:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for fn in subscribers:
+            try:
+                fn(events)
+            except Exception as e:
+                print(f"aurelion-memory: change subscriber failed: {e}", file=sys.stderr)
+
+
+changes = ChangeBus()
+
+
+# ─── Pipeline ─────────────────────────────────────────────────────────────────
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a rename; not possible (or needed) on every platform."""
+    try:
+        fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _open_temp(target: Path) -> tuple[int, str]:
+    """Create a uniquely named temp file beside ``target``, opened for writing.
+
+    Unlike mkstemp's 0600 it gets 0666 less the current umask, the mode a new
+    document written in place would have.
+    """
+    while True:
+        tmp = str(target.with_name(f".{target.name}.{os.urandom(6).hex()}.tmp"))
+        try:
+            return os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+class WritePipeline:
+    """Coalescing, atomic, batched writer for one memory store."""
+
+    def __init__(self, memory_path: Path, delay: float | None = None):
+        self.memory_path = memory_path
+        self.delay = _delay_from_env() if delay is None else delay
+        self._pending: dict[str, str] = {}
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.submitted = 0
+        self.coalesced = 0
+        self.committed = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error: str | None = None
+
+    def submit(self, doc_path: str, content: str) -> None:
+        """Queue ``content`` for ``doc_path``, replacing any write still pending for it."""
+        doc_path = doc_path.replace("\\", "/")
+        with self._cond:
+            if doc_path in self._pending:
+                self.coalesced += 1
+            self._pending[doc_path] = content
+            self.submitted += 1
+            if self.delay > 0 and not self._closed:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="aurelion-writer", daemon=True
+                    )
+                    self._thread.start()
+                self._cond.notify()
+                return
+        self.flush()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """Commit everything queued so far and wait until it is on disk."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            if batch:
+                self._commit(batch)
+
+    def close(self) -> None:
+        """Flush and stop the background flusher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "committed": self.committed,
+                "batches": self.batches,
+                "errors": self.errors,
+                "last_error": self.last_error,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            # Let the rest of a burst arrive before committing
+            time.sleep(self.delay)
+            try:
+                self.flush()
+            except Exception as e:
+                # _commit reports failures per document; this only keeps the flusher alive
+                print(f"aurelion-memory: write flush failed: {e}", file=sys.stderr)
+
+    def _commit(self, batch: dict[str, str]) -> None:
+        with metrics.timer("phase.write_commit"):
+            staged = []
+            for doc_path, content in batch.items():
+                full_path = self.memory_path / doc_path
+                tmp = None
+                try:
+                    full_path.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        mode = full_path.stat().st_mode & 0o7777
+                    except OSError:
+                        mode = None
+                    fd, tmp = _open_temp(full_path)
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        # A rewritten document keeps its permissions
+                        if mode is not None:
+                            os.chmod(tmp, mode)
+                        f.write(content)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    staged.append((doc_path, full_path, Path(tmp)))
+                except Exception as e:
+                    # e.g. OSError, or UnicodeEncodeError for a lone surrogate
+                    self._failed(doc_path, e)
+                    if tmp is not None:
+                        _unlink(Path(tmp))
+
+            events = []
+            directories = set()
+            for doc_path, full_path, tmp in staged:
+                existed = full_path.exists()
+                try:
+                    os.replace(tmp, full_path)
+                except Exception as e:
+                    self._failed(doc_path, e)
+                    _unlink(tmp)
+                    continue
+                directories.add(full_path.parent)
+                events.append(ChangeEvent(
+                    self.memory_path, doc_path, full_path, "modified" if existed else "added"
+                ))
+            for directory in directories:
+                _fsync_directory(directory)
+
+        with self._cond:
+            self.committed += len(events)
+            self.batches += 1
+        metrics.add("writes.committed", len(events))
+        changes.publish(events)
+
+    def _failed(self, doc_path: str, error: Exception) -> None:
+        with self._cond:
+            self.errors += 1
+            self.last_error = f"{doc_path}: {error}"
+        metrics.add("writes.errors")
+        print(f"aurelion-memory: write failed: {doc_path}: {error}", file=sys.stderr)
+
+
+_writers: dict[Path, WritePipeline] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(memory_path: Path) -> WritePipeline:
+    """Process-wide write pipeline for a memory store, created on first use."""
+    with _writers_lock:
+        writer = _writers.get(memory_path)
+        if writer is None:
+            writer = _writers[memory_path] = WritePipeline(memory_path)
+        return writer
+
+
+def flush_writes(memory_path: Path | None = None) -> None:
+    """Commit pending writes for one store (or all stores) before reading."""
+    with _writers_lock:
+        if memory_path is None:
+            writers = list(_writers.values())
+        else:
+            writers = [_writers[memory_path]] if memory_path in _writers else []
+    for writer in writers:
+        writer.flush()
+
+
+@atexit.register
+def _close_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
@@ -0,0 +1,8 @@
+"""
+AURELION Memory benchmarks.
+Run with: python -m benchmarks --scale 1k
+"""
+from .generators import generate_graph, generate_store
+from .runner import run_benchmarks
+
+__all__ = ["generate_graph", "generate_store", "run_benchmarks"]
@@ -0,0 +1,51 @@
+"""Entry point for python -m benchmarks"""
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from .generators import generate_store, make_vocabulary
+from .runner import SCALES, run_benchmarks
+from .startup import measure_startup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AURELION Memory benchmark suite")
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES),
+                        help="Scale to run (repeatable). Default: 1k")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the data generators")
+    parser.add_argument("--documents", type=int, help="Override the number of store documents")
+    parser.add_argument("--nodes", type=int, help="Override the number of graph nodes")
+    parser.add_argument("--workdir", type=Path, help="Keep generated data here instead of a temp dir")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    parser.add_argument("--startup", action="store_true",
+                        help="Measure MCP server cold start instead of the query suite")
+    args = parser.parse_args()
+
+    if args.startup:
+        with tempfile.TemporaryDirectory(prefix="aurelion-bench-startup-") as tmp:
+            store = args.workdir or Path(tmp) / "store"
+            if not store.exists():
+                generate_store(store, args.documents or SCALES[(args.scale or ["1k"])[0]], seed=args.seed)
+            query = make_vocabulary(20000, args.seed)[0]
+            report = {"startup": measure_startup(store, query, repeats=args.repeats)}
+    else:
+        report = run_benchmarks(
+            args.scale or ["1k"],
+            repeats=args.repeats,
+            seed=args.seed,
+            workdir=args.workdir,
+            documents=args.documents,
+            nodes=args.nodes,
+        )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Synthetic data generators for benchmarks.
+
+Produces deterministic Floor_0X_* memory stores and knowledge_graph.json files
+of any size, so performance can be measured at scales the sample data in this
+repository never reaches.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+from itertools import accumulate
+from pathlib import Path
+
+from aurelion_memory_mcp.floors import FLOOR_DIRS
+
+_SYLLABLES = [
+    "ar", "be", "ca", "do", "el", "fi", "go", "ha", "in", "jo", "ka", "lu", "me",
+    "no", "or", "pa", "qu", "ri", "so", "ta", "un", "ve", "wi", "xe", "yo", "za",
+]
+
+
+def make_vocabulary(size: int, seed: int = 0) -> list[str]:
+    """``size`` distinct pseudo-words, most frequent first."""
+    rng = random.Random(seed)
+    words: list[str] = []
+    seen = set()
+    while len(words) < size:
+        word = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+class ZipfSampler:
+    """Draws words with Zipf-distributed frequencies, like natural text."""
+
+    def __init__(self, vocabulary: list[str], exponent: float = 1.1, seed: int = 0):
+        self.vocabulary = vocabulary
+        self.cum_weights = list(accumulate(1.0 / (rank ** exponent) for rank in range(1, len(vocabulary) + 1)))
+        self.rng = random.Random(seed)
+
+    def words(self, n: int) -> list[str]:
+        return self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=n)
+
+
+def _lognormal_size(rng: random.Random, median_bytes: int, sigma: float, max_bytes: int) -> int:
+    return max(64, min(max_bytes, int(rng.lognormvariate(math.log(median_bytes), sigma))))
+
+
+def generate_store(
+    root: Path,
+    documents: int,
+    median_bytes: int = 2048,
+    size_sigma: float = 1.0,
+    max_bytes: int = 1024 * 1024,
+    vocabulary_size: int = 20000,
+    handoffs: int = 20,
+    seed: int = 0,
+) -> dict:
+    """Write a synthetic memory store under ``root``.
+
+    Documents are spread evenly across the five floors in nested
+    subdirectories; sizes follow a log-normal distribution around
+    ``median_bytes``. Floor 4 also gets ``handoffs`` handoff notes so session
+    loading has realistic work. Returns a summary of what was written.
+    """
+    rng = random.Random(seed)
+    sampler = ZipfSampler(make_vocabulary(vocabulary_size, seed), seed=seed)
+    total_bytes = 0
+
+    for doc in range(documents):
+        floor = doc % len(FLOOR_DIRS) + 1
+        subdir = root / FLOOR_DIRS[floor] / f"group_{(doc // 1000):04d}"
+        subdir.mkdir(parents=True, exist_ok=True)
+        target = _lognormal_size(rng, median_bytes, size_sigma, max_bytes)
+        lines = [f"# Document {doc}", ""]
+        size = 0
+        while size < target:
+            line = " ".join(sampler.words(rng.randint(6, 16)))
+            lines.append(line)
+            size += len(line) + 1
+        text = "\n".join(lines) + "\n"
+        (subdir / f"doc_{doc:07d}.md").write_text(text, encoding="utf-8")
+        total_bytes += len(text)
+
+    floor4 = root / FLOOR_DIRS[4]
+    floor4.mkdir(parents=True, exist_ok=True)
+    for i in range(handoffs):
+        note = f"# Session handoff {i}\n\n" + " ".join(sampler.words(200)) + "\n"
+        (floor4 / f"{i:04d}_session_handoff.md").write_text(note, encoding="utf-8")
+
+    return {
+        "documents": documents,
+        "handoffs": handoffs,
+        "bytes": total_bytes,
+        "vocabulary_size": vocabulary_size,
+        "seed": seed,
+    }
+
+
+def generate_graph(
+    path: Path,
+    nodes: int,
+    mean_degree: float = 4.0,
+    degree_exponent: float = 2.5,
+    vocabulary_size: int = 5000,
+    seed: int = 0,
+) -> dict:
+    """Write a synthetic knowledge_graph.json with a power-law degree distribution.
+
+    Out-degrees are drawn from a Pareto distribution scaled to
+    ``mean_degree``; targets favour low-numbered nodes so a few hubs emerge.
+    Returns a summary of what was written.
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(vocabulary_size, seed)
+    alpha = degree_exponent - 1.0
+    # Mean of a Pareto(alpha) variate is alpha / (alpha - 1) for alpha > 1
+    scale = mean_degree * (alpha - 1.0) / alpha if alpha > 1 else mean_degree
+    node_ids = [f"concept_{i:07d}" for i in range(nodes)]
+
+    graph_nodes = {}
+    edges = 0
+    for i, node_id in enumerate(node_ids):
+        degree = min(nodes - 1, int(scale * rng.paretovariate(alpha))) if nodes > 1 else 0
+        targets = {node_ids[min(nodes - 1, int(nodes * rng.random() ** 2))] for _ in range(degree)}
+        targets.discard(node_id)
+        edges += len(targets)
+        graph_nodes[node_id] = {
+            "label": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))).title(),
+            "properties": [rng.choice(vocabulary) for _ in range(3)],
+            "connects_to": sorted(targets),
+            "floor": i % 5 + 1,
+            "file_locations": [f"doc_{rng.randrange(max(1, nodes)):07d}.md"],
+        }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"knowledge_graph": {"nodes": graph_nodes}}, f)
+    return {"nodes": nodes, "edges": edges, "vocabulary_size": vocabulary_size, "seed": seed}
@@ -0,0 +1,220 @@
+"""
+Timing and memory benchmarks for the memory store and knowledge graph.
+
+Each benchmark is run ``repeats`` times for wall-clock statistics, then once
+more under tracemalloc for peak allocation. Results are plain JSON so runs can
+be stored and compared over time.
+"""
+
+from __future__ import annotations
+
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from aurelion_memory_lite import LibrarySystem
+from aurelion_memory_lite.result_cache import ResultCache
+from aurelion_memory_mcp import index as index_module
+from aurelion_memory_mcp.cache import document_cache
+from aurelion_memory_mcp.index import InvertedIndex
+from aurelion_memory_mcp.scan import scan_files
+from aurelion_memory_mcp.server import (
+    list_floor,
+    load_session_context,
+    read_document,
+    search_files,
+)
+
+from .generators import generate_graph, generate_store, make_vocabulary
+
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+
+def measure(fn: Callable[[int], Any], repeats: int) -> dict:
+    """Wall-clock statistics over ``repeats`` calls plus tracemalloc peak of one more."""
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn(repeats)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times.sort()
+    return {
+        "repeats": repeats,
+        "min_ms": round(times[0] * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "mean_ms": round(statistics.fmean(times) * 1000, 3),
+        "p90_ms": round(times[min(len(times) - 1, int(len(times) * 0.9))] * 1000, 3),
+        "max_ms": round(times[-1] * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, round((time.perf_counter() - start) * 1000, 3)
+
+
+def _reset_server_state() -> None:
+    document_cache.clear()
+    index_module._indexes.clear()
+
+
+def run_scale(workdir: Path, documents: int, nodes: int, repeats: int, seed: int) -> dict:
+    """Generate data at one scale and run every benchmark against it."""
+    store = workdir / "store"
+    graph_path = workdir / "knowledge_graph.json"
+    rng = random.Random(seed)
+
+    store_summary, store_ms = _timed(lambda: generate_store(store, documents, seed=seed))
+    graph_summary, graph_ms = _timed(lambda: generate_graph(graph_path, nodes, seed=seed))
+    store_summary["generate_ms"] = store_ms
+    graph_summary["generate_ms"] = graph_ms
+
+    vocabulary = make_vocabulary(20000, seed)
+    queries = {
+        "common_word": vocabulary[0],
+        "rare_word": vocabulary[-1],
+        "phrase": f"{vocabulary[1]} {vocabulary[2]}",
+        "no_match": "zzzzqqqq",
+    }
+    doc_paths = [
+        p.relative_to(store).as_posix()
+        for p in sorted(store.rglob("*.md"))
+    ]
+    sample_paths = [rng.choice(doc_paths) for _ in range(repeats + 1)]
+
+    results: dict[str, dict] = {}
+
+    def cold_index(_: int) -> None:
+        _reset_server_state()
+        InvertedIndex(store).build()
+
+    results["index_build_cold"] = measure(cold_index, max(1, min(repeats, 3)))
+
+    _reset_server_state()
+    _, open_ms = _timed(lambda: index_module.get_index(store))
+    results["index_open_ms"] = {"ms": open_ms}
+
+    for label, query in queries.items():
+        results[f"search_files.{label}"] = measure(
+            lambda _, q=query: search_files(store, q), repeats
+        )
+        results[f"search_files.{label}.limit10"] = measure(
+            lambda _, q=query: search_files(store, q, limit=10), repeats
+        )
+    results["scan_files.common_word"] = measure(
+        lambda _: scan_files(store, queries["common_word"]), max(1, min(repeats, 3))
+    )
+    results["read_document"] = measure(lambda i: read_document(store, sample_paths[i]), repeats)
+    results["list_floor"] = measure(lambda i: list_floor(store, i % 5 + 1), repeats)
+    results["load_session_context"] = measure(lambda _: load_session_context(store), repeats)
+
+    # Uncached, so repeated concepts measure the search itself
+    library, load_ms = _timed(lambda: LibrarySystem(
+        str(graph_path), "", store_path=str(store), result_cache=ResultCache(max_bytes=0)
+    ))
+    results["library_load_ms"] = {"ms": load_ms}
+    concepts = [vocabulary[rng.randrange(200)][:5] for _ in range(repeats + 1)]
+    node_ids = [f"concept_{rng.randrange(max(1, nodes)):07d}" for _ in range(repeats + 1)]
+    results["search_by_concept"] = measure(lambda i: library.search_by_concept(concepts[i]), repeats)
+    library.result_cache = ResultCache()
+    library.search_by_concept(concepts[0])
+    results["search_by_concept.cached"] = measure(lambda _: library.search_by_concept(concepts[0]), repeats)
+    for hops in (2, 3):
+        results[f"get_related_concepts.hops{hops}"] = measure(
+            lambda i, h=hops: library.get_related_concepts(node_ids[i], max_hops=h), repeats
+        )
+
+    # The same queries against the on-disk SQLite store (first open imports the JSON)
+    sqlite_library, import_ms = _timed(lambda: LibrarySystem(
+        str(graph_path), "", store_path=str(store), result_cache=ResultCache(max_bytes=0),
+        graph_backend="sqlite",
+    ))
+    results["library_import_ms.sqlite"] = {"ms": import_ms}
+    _, open_ms = _timed(lambda: LibrarySystem(
+        str(graph_path), "", store_path=str(store), graph_backend="sqlite"
+    ))
+    results["library_load_ms.sqlite"] = {"ms": open_ms}
+    results["search_by_concept.sqlite"] = measure(
+        lambda i: sqlite_library.search_by_concept(concepts[i]), repeats
+    )
+    for hops in (2, 3):
+        results[f"get_related_concepts.hops{hops}.sqlite"] = measure(
+            lambda i, h=hops: sqlite_library.get_related_concepts(node_ids[i], max_hops=h), repeats
+        )
+
+    _reset_server_state()
+    return {"store": store_summary, "graph": graph_summary, "benchmarks": results}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(
+    scales: list[str],
+    repeats: int = 5,
+    seed: int = 0,
+    workdir: Path | None = None,
+    documents: int | None = None,
+    nodes: int | None = None,
+) -> dict:
+    """Run the suite at each named scale and return a JSON-serialisable report.
+
+    ``documents``/``nodes`` override the scale's size for the store and graph.
+    Generated data lives in a temporary directory unless ``workdir`` is given.
+    """
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": _git_commit(),
+            "repeats": repeats,
+            "seed": seed,
+        },
+        "results": {},
+    }
+    for scale in scales:
+        size = SCALES[scale]
+        base = Path(workdir) / scale if workdir else Path(tempfile.mkdtemp(prefix=f"aurelion-bench-{scale}-"))
+        if base.exists():
+            shutil.rmtree(base)
+        base.mkdir(parents=True)
+        try:
+            report["results"][scale] = run_scale(
+                base, documents or size, nodes or size, repeats, seed
+            )
+        finally:
+            if workdir is None:
+                shutil.rmtree(base, ignore_errors=True)
+    return report
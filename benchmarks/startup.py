@@ -0,0 +1,133 @@
+"""
+Cold-start timings for the MCP server entry point.
+
+Clients spawn ``python -m aurelion_memory_mcp`` on every launch, so what
+matters is how long a fresh process takes to import, answer ``initialize``,
+list its tools and serve a first search. Each run starts a new interpreter
+and speaks newline-delimited JSON-RPC over its stdio.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+_IMPORT_PROBE = (
+    "import time; s = time.perf_counter(); import aurelion_memory_mcp.server; "
+    "print(time.perf_counter() - s)"
+)
+
+
+def _summary(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min_ms": round(samples[0] * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def measure_import(repeats: int) -> dict:
+    """In-process import time of the server module, one fresh interpreter per run."""
+    samples = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE],
+            capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip()))
+    return _summary(samples)
+
+
+class _Client:
+    """Minimal JSON-RPC client over a server subprocess's stdio."""
+
+    def __init__(self, proc: subprocess.Popen):
+        self.proc = proc
+        self.next_id = 0
+
+    def send(self, method: str, params: dict | None = None, notify: bool = False) -> int | None:
+        message: dict = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        request_id = None
+        if not notify:
+            self.next_id += 1
+            request_id = message["id"] = self.next_id
+        self.proc.stdin.write(json.dumps(message) + "\n")
+        self.proc.stdin.flush()
+        return request_id
+
+    def wait(self, request_id: int) -> dict:
+        while True:
+            line = self.proc.stdout.readline()
+            if not line:
+                raise RuntimeError("server exited before responding")
+            message = json.loads(line)
+            if message.get("id") == request_id:
+                if "error" in message:
+                    raise RuntimeError(message["error"])
+                return message
+
+    def call(self, method: str, params: dict | None = None) -> dict:
+        return self.wait(self.send(method, params))
+
+
+def _run_once(store: Path, query: str) -> dict[str, float]:
+    env = dict(os.environ, AURELION_MEMORY_PATH=str(store))
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "aurelion_memory_mcp"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, env=env,
+    )
+    client = _Client(proc)
+    timings = {}
+    try:
+        client.call("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "aurelion-bench", "version": "0"},
+        })
+        timings["initialize"] = time.perf_counter() - start
+        client.send("notifications/initialized", notify=True)
+        client.call("tools/list", {})
+        timings["tools_list"] = time.perf_counter() - start
+        client.call("tools/call", {"name": "memory_search", "arguments": {"query": query}})
+        timings["first_search"] = time.perf_counter() - start
+    finally:
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    return timings
+
+
+def measure_startup(store: Path, query: str, repeats: int = 5) -> dict:
+    """Time-to-response of a freshly spawned server, from process start.
+
+    Returns import time plus ``initialize``, ``tools_list`` and
+    ``first_search`` summaries, or an ``error`` entry when the MCP SDK is not
+    installed.
+    """
+    report: dict = {"import": measure_import(repeats)}
+    probe = subprocess.run(
+        [sys.executable, "-c", "import mcp.server.stdio"],
+        capture_output=True, text=True,
+    )
+    if probe.returncode != 0:
+        report["error"] = "MCP SDK not installed (pip install mcp)"
+        return report
+
+    runs = [_run_once(store, query) for _ in range(repeats)]
+    for phase in ("initialize", "tools_list", "first_search"):
+        report[phase] = _summary([run[phase] for run in runs])
+    return report
@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name="aurelion-memory-lite",
     version="1.0.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[
         "networkx>=3.0",
         "pyyaml>=6.0",
@@ -0,0 +1,91 @@
+"""Store catalog: floors, titles and tags, kept current by the change journal."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from aurelion_memory_lite.catalog import StoreCatalog, parse_header
+
+
+def _write(root: Path, doc_path: str, text: str) -> None:
+    path = root / doc_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _catalog(root: Path) -> StoreCatalog:
+    catalog = StoreCatalog(root, persist=False, use_inotify=False, min_interval=0)
+    catalog.refresh()
+    return catalog
+
+
+def test_parse_header_reads_front_matter_after_a_bom():
+    text = "﻿---\ntitle: Goals\ntags: [Career, Strategy]\n---\n# Heading\n"
+    assert parse_header(text, "fallback") == ("Goals", ["career", "strategy"])
+    assert parse_header("﻿# Career Master\nbody\n", "x") == ("Career Master", [])
+
+
+def test_template_documents_keep_their_built_in_tags(tmp_path):
+    _write(tmp_path, "Floor_01_Foundation/01_Career_Master.md", "﻿# Career Master\n")
+    _write(tmp_path, "Floor_05_Vision/35_Strategic_Plan.md",
+           "---\ntags: [vision]\n---\n# Strategic Plan\n")
+    _write(tmp_path, "Floor_02_Systems/notes.md", "---\ntags: career\n---\n# Notes\n")
+    catalog = _catalog(tmp_path)
+    assert [e.path for e in catalog.files_with_tag("career")] == [
+        "Floor_01_Foundation/01_Career_Master.md",
+        "Floor_02_Systems/notes.md",
+    ]
+    assert catalog.entries["Floor_05_Vision/35_Strategic_Plan.md"].tags == ["vision", "strategy"]
+    assert catalog.tags() == {"career": 2, "strategy": 1, "vision": 1}
+
+
+def test_shipped_templates_are_not_rewritten_with_front_matter():
+    root = Path(__file__).resolve().parent.parent
+    text = (root / "Floor_01_Foundation/01_Career_Master.md").read_text(encoding="utf-8")
+    assert not text.lstrip("﻿").startswith("---")
+    catalog = _catalog(root)
+    assert "Floor_01_Foundation/01_Career_Master.md" in {
+        e.path for e in catalog.files_with_tag("career")
+    }
+
+
+def test_refresh_reports_and_applies_changes(tmp_path):
+    _write(tmp_path, "Floor_04_Action/a.md", "# A\n")
+    catalog = _catalog(tmp_path)
+    _write(tmp_path, "Floor_04_Action/b.md", "---\ntags: [daily]\n---\n# B\n")
+    (tmp_path / "Floor_04_Action/a.md").unlink()
+    changes = sorted((c.path, c.kind) for c in catalog.refresh())
+    assert changes == [("Floor_04_Action/a.md", "deleted"), ("Floor_04_Action/b.md", "added")]
+    assert [e.title for e in catalog.files_on_floor(4)] == ["B"]
+    assert [e.path for e in catalog.files_with_tag("daily")] == ["Floor_04_Action/b.md"]
+
+
+def test_saved_catalog_reloads_and_leaves_no_temp_file(tmp_path):
+    _write(tmp_path, "Floor_02_Systems/notes.md", "---\ntags: [career]\n---\n# Notes\n")
+    catalog = StoreCatalog(tmp_path, use_inotify=False, min_interval=0)
+    catalog.refresh()
+    catalog.save()
+    catalog.close()
+    assert not any(p.name.endswith(".tmp") for p in catalog.catalog_path.parent.iterdir())
+
+    reloaded = StoreCatalog(tmp_path, use_inotify=False, min_interval=0)
+    assert reloaded.entries["Floor_02_Systems/notes.md"].tags == ["career"]
+    reloaded.close()
+
+
+def test_refresh_and_check_leave_saving_to_save(tmp_path):
+    catalog = StoreCatalog(tmp_path, use_inotify=False, min_interval=0)
+    catalog.refresh()
+    assert catalog.dirty and not catalog.catalog_path.exists()
+    catalog.save()
+    assert not catalog.dirty
+    written = catalog.catalog_path.stat().st_mtime_ns
+
+    _write(tmp_path, "Floor_01_Foundation/a.md", "# A\n")
+    assert [c.path for c in catalog.check(["Floor_01_Foundation/a.md"])] == ["Floor_01_Foundation/a.md"]
+    assert catalog.dirty
+    assert catalog.catalog_path.stat().st_mtime_ns == written
+    catalog.save()
+    catalog.save()
+    assert not catalog.dirty
+    catalog.close()
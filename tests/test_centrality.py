@@ -0,0 +1,44 @@
+"""Graph centrality: PageRank and degree over CSR adjacency."""
+
+from __future__ import annotations
+
+import pytest
+
+from aurelion_memory_lite import centrality
+from aurelion_memory_lite.centrality import compute_centrality
+
+# 0 -> 1, 0 -> 2 (twice), 1 -> 2, 2 -> 0, 3 dangling
+OFFSETS = [0, 3, 4, 5, 5]
+TARGETS = [1, 2, 2, 2, 0]
+
+
+def test_pagerank_is_a_distribution_ordered_by_links():
+    pagerank, degree = compute_centrality(OFFSETS, TARGETS)
+    assert sum(pagerank) == pytest.approx(1.0)
+    assert pagerank[2] > pagerank[0] > pagerank[1] > pagerank[3]
+    assert list(degree) == pytest.approx([3 / 3, 2 / 3, 3 / 3, 0.0])
+
+
+def test_a_warm_start_reaches_the_same_scores():
+    cold, _ = compute_centrality(OFFSETS, TARGETS)
+    warm, _ = compute_centrality(OFFSETS, TARGETS, initial=[0.1, 0.2, 0.3, 0.4])
+    assert list(warm) == pytest.approx(list(cold), abs=1e-9)
+
+
+def test_networkx_is_only_used_when_it_can_run_and_converge(monkeypatch):
+    calls = []
+
+    def networkx(rows, start, *args):
+        calls.append(len(rows))
+        return list(start)
+
+    monkeypatch.setattr(centrality, "_pagerank_networkx", networkx)
+    monkeypatch.setattr(centrality, "NETWORKX_PAGERANK_AVAILABLE", False)
+    compute_centrality(OFFSETS, TARGETS)
+    assert calls == []
+
+    monkeypatch.setattr(centrality, "NETWORKX_PAGERANK_AVAILABLE", True)
+    compute_centrality(OFFSETS, TARGETS, max_iterations=5)
+    assert calls == []
+    compute_centrality(OFFSETS, TARGETS)
+    assert calls == [4]
@@ -0,0 +1,81 @@
+"""Tool result encoding: compact JSON and the response-size cap."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from aurelion_memory_mcp.encoding import ResultEncoder
+
+BACKENDS = ["json", "auto"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_small_results_are_compact_and_untouched(backend):
+    encoder = ResultEncoder(max_chars=10_000, backend=backend)
+    result = {"path": "Floor_01_Foundation/a.md", "snippet": "naïve café", "n": [1, 2]}
+    text = encoder.encode(result)
+    assert json.loads(text) == result
+    assert ": " not in text and "café" in text
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("max_chars", [600, 2000, 10_000])
+def test_large_dicts_stay_within_the_cap(backend, max_chars):
+    encoder = ResultEncoder(max_chars=max_chars, backend=backend)
+    wide = {f"key_{i:05d}": f"value {i}" for i in range(5000)}
+    for result in (
+        wide,
+        {"results": wide, "total": 5000},
+        {"nested": {"deeper": wide}},
+        [wide, wide],
+        {f"{'k' * 300}{i}": {f"{'j' * 300}{i}": "x" * 500} for i in range(50)},
+    ):
+        text = encoder.encode(result)
+        assert len(text) <= max_chars
+        decoded = json.loads(text)
+        marker = decoded["truncated"] if isinstance(decoded, dict) else decoded[-1]["truncated"]
+        assert marker["max_chars"] == max_chars
+
+
+def test_cut_keys_are_counted_not_listed():
+    encoder = ResultEncoder(max_chars=2000, backend="json")
+    result = {f"key_{i:05d}": i for i in range(5000)}
+    decoded = json.loads(encoder.encode(result))
+    marker = decoded.pop("truncated")
+    [entry] = marker["omitted"]
+    assert entry["at"] == "/"
+    assert entry["keys"] == 5000 - len(decoded)
+
+
+def test_long_strings_are_cut_before_encoding():
+    encoder = ResultEncoder(max_chars=1000, backend="json")
+    decoded = json.loads(encoder.encode({"path": "a.md", "content": "\"quoted\" " * 10_000}))
+    assert decoded["path"] == "a.md"
+    [entry] = decoded["truncated"]["omitted"]
+    assert entry["at"] == "/content"
+    assert entry["chars"] == 90_000 - len(decoded["content"])
+
+
+def test_list_results_get_a_trailing_marker():
+    encoder = ResultEncoder(max_chars=1000, backend="json")
+    result = [{"path": f"doc_{i}.md"} for i in range(500)]
+    decoded = json.loads(encoder.encode(result))
+    kept = decoded[:-1]
+    # Whole elements first; the element that straddles the cap is cut inside
+    assert kept[:-1] == result[:len(kept) - 1]
+    last = len(kept) - 1
+    assert result[last]["path"].startswith(kept[-1]["path"])
+    assert decoded[-1]["truncated"]["omitted"] == [
+        {"at": f"/{last}/path", "chars": len(result[last]["path"]) - len(kept[-1]["path"])},
+        {"at": "/", "items": 500 - len(kept)},
+    ]
+
+
+def test_no_cap_and_indent():
+    encoder = ResultEncoder(indent=2, max_chars=0, backend="json")
+    result = {f"k{i}": i for i in range(3000)}
+    text = encoder.encode(result)
+    assert json.loads(text) == result
+    assert "\n  " in text
@@ -0,0 +1,69 @@
+"""Knowledge graph backends: the SQLite store answers like the in-memory graph."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from aurelion_memory_lite import LibrarySystem
+from aurelion_memory_lite.graph_store import SQLiteGraph, import_graph
+
+
+def _knowledge_graph() -> dict:
+    nodes = {}
+    for i in range(30):
+        nodes[f"concept_{i:02d}"] = {
+            "label": f"Career topic {i}" if i % 3 == 0 else f"Strategy note {i}",
+            "floor": i % 5 + 1,
+            "file_locations": [f"Floor_0{i % 5 + 1}_x/doc_{i}.md"],
+            "connects_to": [f"concept_{(i * 7 + 1) % 30:02d}", f"concept_{(i + 2) % 30:02d}"],
+            "properties": ["tagged"] if i % 4 == 0 else [],
+        }
+    return {"knowledge_graph": {"nodes": nodes}}
+
+
+@pytest.fixture
+def graph_json(tmp_path) -> Path:
+    path = tmp_path / "knowledge_graph.json"
+    path.write_text(json.dumps(_knowledge_graph()), encoding="utf-8")
+    return path
+
+
+def _library(path: Path, backend: str) -> LibrarySystem:
+    return LibrarySystem(str(path), "", store_path=str(path.parent), graph_backend=backend)
+
+
+@pytest.mark.parametrize("concept", ["career", "strategy note 1", "topic 2", "missing"])
+def test_sqlite_backend_matches_the_in_memory_graph(graph_json, concept):
+    memory = _library(graph_json, "memory")
+    sqlite = _library(graph_json, "sqlite")
+    assert sqlite.search_by_concept(concept) == memory.search_by_concept(concept)
+
+
+def test_sqlite_backend_matches_related_concepts(graph_json):
+    memory = _library(graph_json, "memory")
+    sqlite = _library(graph_json, "sqlite")
+    for hops in (1, 2, 3):
+        assert (sqlite.get_related_concepts("concept_04", max_hops=hops)
+                == memory.get_related_concepts("concept_04", max_hops=hops))
+
+
+def test_failed_import_keeps_the_old_store_and_no_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "knowledge_graph.sqlite"
+    import_graph(_knowledge_graph(), path)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        import_graph({"knowledge_graph": {"nodes": {}}}, path)
+    monkeypatch.undo()
+
+    assert os.listdir(tmp_path) == ["knowledge_graph.sqlite"]
+    store = SQLiteGraph(path)
+    assert len(store) == 30
+    store.close()
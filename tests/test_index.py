@@ -0,0 +1,164 @@
+"""Persistent inverted index: incremental updates, persistence and BM25 ranking."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from aurelion_memory_mcp.index import InvertedIndex
+
+
+def _write(root: Path, doc_path: str, text: str, mtime_ns: int | None = None) -> None:
+    path = root / doc_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _store(root: Path) -> Path:
+    _write(root, "Floor_01_Foundation/values.md", "# Values\nhonesty and craft\n")
+    _write(root, "Floor_02_Systems/habits.md", "morning routine\ncraft practice daily\n")
+    _write(root, "Floor_04_Action/plan.md", "quarterly plan\nship the craft project\n")
+    return root
+
+
+def _paths(results) -> list[str]:
+    return [r["path"] for r in results]
+
+
+def test_search_finds_substrings_in_floor_path_order(tmp_path):
+    index = InvertedIndex.open(_store(tmp_path))
+    assert _paths(index.search("craft")) == [
+        "Floor_01_Foundation/values.md",
+        "Floor_02_Systems/habits.md",
+        "Floor_04_Action/plan.md",
+    ]
+    assert _paths(index.search("raf", floor=2)) == ["Floor_02_Systems/habits.md"]
+    assert index.search("routine daily") == []
+
+
+def test_rewriting_a_document_reuses_its_doc_id(tmp_path):
+    index = InvertedIndex.open(_store(tmp_path))
+    base = 1_700_000_000_000_000_000
+    for i in range(200):
+        _write(tmp_path, "Floor_05_Vision/note.md", f"draft {i}\nvision statement\n", base + i)
+        index.update_document("Floor_05_Vision/note.md")
+    assert len(index) == 4
+    assert len(index._docs) == 4
+    assert len(index.bm25.doc_len) == 4
+    assert index.bm25.n_docs == 4
+    assert _paths(index.search("draft 199")) == ["Floor_05_Vision/note.md"]
+    assert index.search("draft 198") == []
+
+
+def test_removed_ids_are_reused_and_ranking_matches_a_fresh_build(tmp_path):
+    index = InvertedIndex.open(_store(tmp_path))
+    (tmp_path / "Floor_01_Foundation/values.md").unlink()
+    index.remove_document("Floor_01_Foundation/values.md")
+    _write(tmp_path, "Floor_03_Networks/mentors.md", "craft mentors and craft peers\n")
+    index.update_document("Floor_03_Networks/mentors.md")
+    assert len(index._docs) == 3
+
+    fresh = InvertedIndex(tmp_path)
+    fresh.build()
+    assert index.rank("craft") == fresh.rank("craft")
+    assert _paths(index.search("craft")) == _paths(fresh.search("craft"))
+
+
+def test_persisted_tombstones_are_compacted_on_load(tmp_path):
+    _store(tmp_path)
+    index = InvertedIndex.open(tmp_path)
+    expected = index.rank("craft")
+    data = json.loads(index.index_path.read_text(encoding="utf-8"))
+
+    # An index file written before doc ids were reused: removed docs left holes
+    shift = 5
+    data["docs"] = [None] * shift + data["docs"]
+    data["postings"] = {
+        term: [[doc_id + shift, lines] for doc_id, lines in plist]
+        for term, plist in data["postings"].items()
+    }
+    bm25 = data["bm25"]
+    bm25["doc_len"] = [0] * shift + bm25["doc_len"]
+    bm25["terms"] = {t: [[d + shift for d in docs], tfs] for t, (docs, tfs) in bm25["terms"].items()}
+    index.index_path.write_text(json.dumps(data), encoding="utf-8")
+
+    reloaded = InvertedIndex.open(tmp_path)
+    assert len(reloaded._docs) == 3
+    assert reloaded.rank("craft") == expected
+    saved = json.loads(reloaded.index_path.read_text(encoding="utf-8"))
+    assert None not in saved["docs"]
+
+
+def test_failed_save_leaves_no_temp_file_and_retries(tmp_path, monkeypatch):
+    _store(tmp_path)
+    index = InvertedIndex.open(tmp_path)
+    _write(tmp_path, "Floor_03_Networks/people.md", "craft guild\n")
+    index.update_document("Floor_03_Networks/people.md")
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    index.save()
+    monkeypatch.undo()
+    assert index._dirty
+    assert [p.name for p in index.index_path.parent.iterdir()] == [index.index_path.name]
+
+    index.save()
+    assert not index._dirty
+    saved = json.loads(index.index_path.read_text(encoding="utf-8"))
+    assert "Floor_03_Networks/people.md" in [doc[0] for doc in saved["docs"]]
+
+
+def test_refresh_picks_up_outside_edits(tmp_path):
+    _store(tmp_path)
+    InvertedIndex.open(tmp_path)
+    _write(tmp_path, "Floor_02_Systems/habits.md", "evening review\n", 1_700_000_000_000_000_000)
+    (tmp_path / "Floor_04_Action/plan.md").unlink()
+    reopened = InvertedIndex.open(tmp_path)
+    assert _paths(reopened.search("craft")) == ["Floor_01_Foundation/values.md"]
+    assert _paths(reopened.search("evening")) == ["Floor_02_Systems/habits.md"]
+
+
+def test_a_cold_build_only_blocks_its_own_store(tmp_path, monkeypatch):
+    import threading
+
+    from aurelion_memory_mcp import index as index_module
+    from aurelion_memory_mcp.writes import ChangeEvent
+
+    slow, fast = _store(tmp_path / "slow"), _store(tmp_path / "fast")
+    building, release = threading.Event(), threading.Event()
+    real_open = InvertedIndex.open.__func__
+
+    def open_index(cls, memory_path):
+        index = real_open(cls, memory_path)
+        if memory_path == slow:
+            # Built, but not yet published to other callers
+            building.set()
+            assert release.wait(5)
+        return index
+
+    monkeypatch.setattr(InvertedIndex, "open", classmethod(open_index))
+    monkeypatch.setattr(index_module, "_indexes", {})
+    monkeypatch.setattr(index_module, "_opening", {})
+
+    opened = {}
+    worker = threading.Thread(target=lambda: opened.update(slow=index_module.get_index(slow)))
+    worker.start()
+    assert building.wait(5)
+
+    # Another store opens while the slow build is still running
+    assert _paths(index_module.get_index(fast).search("routine")) == ["Floor_02_Systems/habits.md"]
+
+    # A write committed to the slow store mid-build is applied once it opens
+    _write(slow, "Floor_05_Vision/late.md", "late arrival\n")
+    index_module._on_changes([
+        ChangeEvent(slow, "Floor_05_Vision/late.md", slow / "Floor_05_Vision/late.md", "added")
+    ])
+    release.set()
+    worker.join(5)
+    assert _paths(opened["slow"].search("late arrival")) == ["Floor_05_Vision/late.md"]
+    assert index_module.get_index(slow) is opened["slow"]
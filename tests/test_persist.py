@@ -0,0 +1,115 @@
+"""Deferred index saves: one save per burst of changes, nothing lost at flush."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from aurelion_memory_mcp.persist import DeferredSaver
+
+
+class _Target:
+    def __init__(self):
+        self.saves = 0
+        self.saved = threading.Event()
+
+    def save(self) -> None:
+        self.saves += 1
+        self.saved.set()
+
+
+def test_a_burst_of_schedules_saves_once_after_the_delay():
+    saver = DeferredSaver(delay=0.05)
+    target = _Target()
+    for _ in range(100):
+        saver.schedule(target)
+    assert target.saves == 0
+    assert target.saved.wait(2.0)
+    time.sleep(0.1)
+    assert target.saves == 1
+    assert saver.pending() == 0
+
+
+def test_flush_saves_pending_targets_immediately():
+    saver = DeferredSaver(delay=60)
+    first, second = _Target(), _Target()
+    saver.schedule(first)
+    saver.schedule(second)
+    saver.flush()
+    assert (first.saves, second.saves) == (1, 1)
+    saver.flush()
+    assert (first.saves, second.saves) == (1, 1)
+
+
+def test_zero_delay_saves_inline():
+    saver = DeferredSaver(delay=0)
+    target = _Target()
+    saver.schedule(target)
+    assert target.saves == 1
+
+
+def test_committed_writes_schedule_one_index_save(tmp_path, monkeypatch):
+    from aurelion_memory_mcp import index as index_module
+    from aurelion_memory_mcp.writes import WritePipeline
+
+    saver = DeferredSaver(delay=60)
+    monkeypatch.setattr(index_module, "saver", saver)
+    index = index_module.get_index(tmp_path)
+    saves = []
+    monkeypatch.setattr(index, "save", lambda: saves.append(1))
+
+    writer = WritePipeline(tmp_path, delay=0)
+    for i in range(5):
+        writer.submit("Floor_01_Foundation/a.md", f"revision {i}")
+    assert saves == []
+    assert [r["path"] for r in index.search("revision 4")] == ["Floor_01_Foundation/a.md"]
+    saver.flush()
+    assert saves == [1]
+
+
+def test_committed_writes_defer_the_catalog_save(tmp_path, monkeypatch):
+    from aurelion_memory_lite.catalog import get_catalog
+    from aurelion_memory_mcp import server
+    from aurelion_memory_mcp.writes import WritePipeline
+
+    saver = DeferredSaver(delay=60)
+    monkeypatch.setattr(server, "saver", saver)
+    catalog = get_catalog(tmp_path)
+    server.sync_store(tmp_path)
+    saver.flush()
+    written = catalog.catalog_path.stat().st_mtime_ns
+
+    writer = WritePipeline(tmp_path, delay=0)
+    for i in range(5):
+        writer.submit(f"Floor_01_Foundation/note_{i}.md", f"# Note {i}\n")
+    assert len(catalog.files_on_floor(1)) == 5
+    assert catalog.dirty
+    assert catalog.catalog_path.stat().st_mtime_ns == written
+
+    saver.flush()
+    assert not catalog.dirty
+    assert len(json.loads(catalog.catalog_path.read_text(encoding="utf-8"))["docs"]) == 5
+
+
+def test_semantic_search_after_a_write_does_not_save_inline(tmp_path, monkeypatch):
+    from aurelion_memory_lite.semantic import get_semantic_index
+    from aurelion_memory_mcp import server
+    from aurelion_memory_mcp.writes import WritePipeline
+
+    saver = DeferredSaver(delay=60)
+    monkeypatch.setattr(server, "saver", saver)
+    writer = WritePipeline(tmp_path, delay=0)
+    writer.submit("Floor_01_Foundation/hiring.md", "# Hiring\nRecruit two engineers.\n")
+    server.semantic_search(tmp_path, "recruiting")
+    saver.flush()
+
+    index = get_semantic_index(tmp_path)
+    saves = []
+    monkeypatch.setattr(index, "save", lambda: saves.append(1))
+    writer.submit("Floor_02_Systems/budget.md", "# Budget\nQuarterly spending plan.\n")
+    hits = server.semantic_search(tmp_path, "spending budget")
+    assert hits[0]["path"] == "Floor_02_Systems/budget.md"
+    assert saves == []
+    saver.flush()
+    assert saves == [1]
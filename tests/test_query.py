@@ -0,0 +1,75 @@
+"""Query language: parsing, index-backed evaluation and snippets."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from aurelion_memory_mcp.query import QuerySyntaxError, compile_query
+from aurelion_memory_mcp.server import search_files
+
+
+def _write(root: Path, doc_path: str, text: str) -> None:
+    path = root / doc_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _paths(root: Path, query: str, floor: int | None = None) -> list[str]:
+    return [r["path"] for r in search_files(root, query, floor, mode="query")]
+
+
+@pytest.fixture
+def store(tmp_path):
+    _write(tmp_path, "Floor_01_Foundation/career.md",
+           "---\ntags: [career]\n---\n# Career\nAsked for a promotion.\n")
+    _write(tmp_path, "Floor_01_Foundation/draft.md", "# Draft\npromotion draft\n")
+    _write(tmp_path, "Floor_04_Action/review.md",
+           "# Review\nThe quarterly review went well.\n## Goals\nA raise.\n")
+    return tmp_path
+
+
+def test_describe_shows_the_parsed_plan():
+    assert compile_query("career AND (promotion OR raise) NOT draft").describe() == (
+        '("career" AND ("promotion" OR "raise") AND NOT "draft")'
+    )
+    assert compile_query('"quarterly review" floor:4 -tag:archive').describe() == (
+        '("quarterly review" AND floor:4 AND NOT tag:archive)'
+    )
+
+
+@pytest.mark.parametrize("query", [
+    "", "(career", "career)", "AND", "floor:9", "/[/", "tag:", "career floor:", "(tag:)",
+])
+def test_malformed_queries_raise(query):
+    with pytest.raises(QuerySyntaxError):
+        compile_query(query)
+
+
+def test_boolean_phrase_regex_and_floor_operands(store):
+    assert _paths(store, "promotion NOT draft") == ["Floor_01_Foundation/career.md"]
+    assert _paths(store, "raise OR promotion") == [
+        "Floor_01_Foundation/career.md",
+        "Floor_01_Foundation/draft.md",
+        "Floor_04_Action/review.md",
+    ]
+    assert _paths(store, '"quarterly review"') == ["Floor_04_Action/review.md"]
+    assert _paths(store, '"review quarterly"') == []
+    assert _paths(store, "/^## goals?$/") == ["Floor_04_Action/review.md"]
+    assert _paths(store, "promotion floor:4") == []
+
+
+def test_tag_snippet_skips_front_matter_after_a_bom(store):
+    _write(store, "Floor_02_Systems/plan.md",
+           "﻿---\ntags: [career]\n---\n\n# Plan\nNext steps.\n")
+    results = search_files(store, "tag:career", mode="query")
+    assert [(r["path"], r["snippet"]) for r in results] == [
+        ("Floor_01_Foundation/career.md", "# Career"),
+        ("Floor_02_Systems/plan.md", "# Plan"),
+    ]
+
+
+def test_a_filter_without_a_value_names_the_filter():
+    with pytest.raises(QuerySyntaxError, match="tag: needs a value"):
+        compile_query("career tag: goals")
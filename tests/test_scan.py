@@ -0,0 +1,53 @@
+"""Full-text scans, single and batched."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from aurelion_memory_mcp import scan
+from aurelion_memory_mcp.scan import scan_files, scan_many
+from aurelion_memory_mcp.stats import metrics
+
+
+def _write(root: Path, doc_path: str, text: str) -> None:
+    path = root / doc_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _paths(results) -> list[str]:
+    return [r["path"] for r in results]
+
+
+def _store(root: Path) -> Path:
+    _write(root, "Floor_01_Foundation/a.md", "alpha line\nbeta line\n")
+    _write(root, "Floor_02_Systems/b.md", "Beta only\n")
+    _write(root, "Floor_03_Networks/c.md", "alpha, then nothing\n")
+    return root
+
+
+def test_scan_many_matches_one_scan_per_query(tmp_path):
+    _store(tmp_path)
+    queries = ["alpha", "BETA", "missing", "a line"]
+    batched = scan_many(tmp_path, queries)
+    assert batched == [scan_files(tmp_path, q) for q in queries]
+    assert _paths(scan_many(tmp_path, ["alpha", "beta"], limit=1)[1]) == ["Floor_01_Foundation/a.md"]
+
+
+def test_an_unreadable_document_only_costs_the_failing_query(tmp_path, monkeypatch):
+    _store(tmp_path)
+    real_read = scan.document_cache.read_text
+    failed = []
+
+    def read_text(path: Path) -> str:
+        if path.name == "a.md" and not failed:
+            failed.append(path)
+            raise OSError("gone")
+        return real_read(path)
+
+    monkeypatch.setattr(scan.document_cache, "read_text", read_text)
+    errors = metrics.counters.get("scan.errors", 0)
+    alpha, beta = scan_many(tmp_path, ["alpha", "beta"])
+    assert _paths(alpha) == ["Floor_03_Networks/c.md"]
+    assert _paths(beta) == ["Floor_01_Foundation/a.md", "Floor_02_Systems/b.md"]
+    assert metrics.counters["scan.errors"] == errors + 1
@@ -0,0 +1,49 @@
+"""Semantic index: persistence of rows and vectors."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from aurelion_memory_lite.semantic import SemanticIndex
+
+
+def _write(root: Path, doc_path: str, text: str) -> None:
+    path = root / doc_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _index(root: Path) -> SemanticIndex:
+    _write(root, "Floor_01_Foundation/values.md", "# Values\nHonesty and craft.\n")
+    _write(root, "Floor_04_Action/plan.md", "# Plan\n## Hiring\nRecruit two engineers.\n")
+    index = SemanticIndex(root)
+    index.update_document("Floor_01_Foundation/values.md", 1)
+    index.update_document("Floor_04_Action/plan.md", 4)
+    return index
+
+
+def test_saved_index_reloads_with_the_same_results(tmp_path):
+    index = _index(tmp_path)
+    expected = index.search("recruiting engineers")
+    index.save()
+    assert sorted(os.listdir(index.meta_path.parent)) == sorted(
+        [index.meta_path.name, index.matrix_path.name]
+    )
+    assert SemanticIndex(tmp_path).search("recruiting engineers") == expected
+
+
+def test_failed_save_leaves_no_temp_file(tmp_path, monkeypatch):
+    index = _index(tmp_path)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    index.save()
+    monkeypatch.undo()
+
+    assert index._dirty
+    assert os.listdir(index.meta_path.parent) == []
+    index.save()
+    assert len(SemanticIndex(tmp_path)) == 2
@@ -0,0 +1,61 @@
+"""Graph snapshots: written atomically through unique temp files."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import pytest
+
+from aurelion_memory_lite.graph_index import GraphIndex
+from aurelion_memory_lite.snapshot import GraphSnapshot, write_snapshot
+
+
+def _graph(count: int) -> GraphIndex:
+    nodes = {
+        f"n{i}": {"label": f"Concept {i}", "connects_to": [f"n{(i + 1) % count}"]}
+        for i in range(count)
+    }
+    return GraphIndex({"knowledge_graph": {"nodes": nodes}})
+
+
+def test_concurrent_writers_do_not_share_a_temp_file(tmp_path):
+    path = tmp_path / "graph.snapshot"
+    errors = []
+
+    def write(count: int) -> None:
+        try:
+            for _ in range(20):
+                write_snapshot(_graph(count), path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(count,)) for count in (50, 80)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == ["graph.snapshot"]
+    snapshot = GraphSnapshot(path)
+    assert len(snapshot) in (50, 80)
+    snapshot.close()
+
+
+def test_failed_write_keeps_the_old_snapshot_and_no_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "graph.snapshot"
+    write_snapshot(_graph(3), path)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_snapshot(_graph(5), path)
+    monkeypatch.undo()
+
+    assert os.listdir(tmp_path) == ["graph.snapshot"]
+    snapshot = GraphSnapshot(path)
+    assert len(snapshot) == 3
+    snapshot.close()
@@ -0,0 +1,108 @@
+"""Write-behind pipeline: atomic commits, coalescing and failure handling."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from aurelion_memory_mcp.writes import WritePipeline, changes
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def _temp_files(root: Path) -> list[Path]:
+    return [p for p in root.rglob("*.tmp")]
+
+
+def test_inline_write_is_committed_and_published(tmp_path):
+    seen = []
+    changes.subscribe(seen.extend)
+    try:
+        writer = WritePipeline(tmp_path, delay=0)
+        writer.submit("Floor_01_Foundation/a.md", "hello")
+    finally:
+        changes.unsubscribe(seen.extend)
+    assert (tmp_path / "Floor_01_Foundation/a.md").read_text(encoding="utf-8") == "hello"
+    assert [(e.doc_path, e.kind) for e in seen] == [("Floor_01_Foundation/a.md", "added")]
+
+
+def test_burst_to_one_document_coalesces(tmp_path):
+    writer = WritePipeline(tmp_path, delay=0.05)
+    for i in range(20):
+        writer.submit("Floor_02_Systems/note.md", f"version {i}")
+    writer.flush()
+    assert (tmp_path / "Floor_02_Systems/note.md").read_text(encoding="utf-8") == "version 19"
+    stats = writer.stats()
+    assert stats["coalesced"] == 19
+    assert stats["committed"] == 1
+    writer.close()
+
+
+def test_lone_surrogate_does_not_kill_the_flusher(tmp_path):
+    writer = WritePipeline(tmp_path, delay=0.01)
+    writer.submit("Floor_01_Foundation/bad.md", "x\ud800y")
+    assert _wait_for(lambda: writer.stats()["errors"] == 1)
+
+    # The background flusher is still alive and commits later writes on its own
+    writer.submit("Floor_01_Foundation/good.md", "fine")
+    good = tmp_path / "Floor_01_Foundation/good.md"
+    assert _wait_for(good.exists)
+    assert writer._thread is not None and writer._thread.is_alive()
+
+    assert not (tmp_path / "Floor_01_Foundation/bad.md").exists()
+    assert _temp_files(tmp_path) == []
+    assert "bad.md" in writer.stats()["last_error"]
+    writer.close()
+
+
+def test_failed_document_does_not_block_the_rest_of_its_batch(tmp_path):
+    writer = WritePipeline(tmp_path, delay=0.05)
+    writer.submit("Floor_03_Networks/bad.md", "\udcff")
+    writer.submit("Floor_03_Networks/ok.md", "ok")
+    writer.flush()
+    assert (tmp_path / "Floor_03_Networks/ok.md").read_text(encoding="utf-8") == "ok"
+    assert writer.stats()["errors"] == 1
+    assert _temp_files(tmp_path) == []
+    writer.close()
+
+
+def test_write_document_reports_content_that_cannot_be_committed(tmp_path):
+    from aurelion_memory_mcp.server import write_document
+    from aurelion_memory_mcp.writes import get_writer
+
+    result = write_document(tmp_path, "bad.md", "x\ud800y", 1)
+    assert "error" in result
+    assert get_writer(tmp_path).pending() == 0
+
+    (tmp_path / "Floor_01_Foundation" / "taken.md").mkdir(parents=True)
+    assert "error" in write_document(tmp_path, "taken.md", "text", 1)
+
+    result = write_document(tmp_path, "good.md", "text", 1)
+    assert result["written"] == "Floor_01_Foundation/good.md"
+    get_writer(tmp_path).flush()
+    assert (tmp_path / "Floor_01_Foundation/good.md").read_text(encoding="utf-8") == "text"
+
+
+def test_new_documents_follow_the_current_umask_and_rewrites_keep_their_mode(tmp_path):
+    writer = WritePipeline(tmp_path, delay=0)
+    previous = os.umask(0o027)
+    try:
+        writer.submit("Floor_01_Foundation/new.md", "new")
+    finally:
+        os.umask(previous)
+    assert (tmp_path / "Floor_01_Foundation/new.md").stat().st_mode & 0o777 == 0o640
+
+    kept = tmp_path / "Floor_01_Foundation/kept.md"
+    kept.write_text("old", encoding="utf-8")
+    kept.chmod(0o600)
+    writer.submit("Floor_01_Foundation/kept.md", "rewritten")
+    assert kept.stat().st_mode & 0o777 == 0o600
+    assert kept.read_text(encoding="utf-8") == "rewritten"